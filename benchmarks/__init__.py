@@ -0,0 +1 @@
+"""Losos benchmarks (run as `python -m benchmarks.<name>`)"""
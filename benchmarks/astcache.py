@@ -0,0 +1,52 @@
+"""Compare cold (scan + parse) and warm (cached syntax tree) `run_file`"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.generators import flat
+from losos.losos import Losos
+
+
+def run(path: str, cache_dir: str, repeat: int) -> float:
+    best: float = float("inf")
+    for _ in range(repeat):
+        losos: Losos = Losos(ast_cache=True, cache_dir=cache_dir)
+        start: float = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            losos.run_file(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10], help="MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for megabytes in args.sizes:
+            path: str = os.path.join(directory, f"script{megabytes}.lox")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(flat(megabytes * 1024 * 1024))
+
+            cache_dir: str = os.path.join(directory, "cache")
+            cold: float = float("inf")
+            for _ in range(args.repeat):
+                for name in os.listdir(cache_dir) if os.path.isdir(cache_dir) else []:
+                    os.remove(os.path.join(cache_dir, name))
+                cold = min(cold, run(path, cache_dir, 1))
+            warm: float = run(path, cache_dir, args.repeat)
+
+            print(
+                f"{megabytes:>4} MB   cold {cold:7.3f} s   warm {warm:7.3f} s"
+                f"   speedup {cold / warm:4.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
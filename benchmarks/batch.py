@@ -0,0 +1,67 @@
+"""Compare per-row `Interpreter` evaluation with `BatchEvaluator`"""
+
+import argparse
+import random
+import time
+from typing import Any
+
+from losos.batch import BatchEvaluator, BatchResult
+from losos.environment import Environment
+from losos.expr import Expr
+from losos.interpreter import Interpreter
+from losos.losos import Losos
+from losos.reporter import Reporter
+from losos.runtimeerror import LososRuntimeError
+
+_RULE: str = "(price * quantity - discount) / quantity > limit == flagged"
+
+
+def columns(rows: int, seed: int = 0) -> dict[str, list[Any]]:
+    rng: random.Random = random.Random(seed)
+    return {
+        "price": [rng.uniform(1, 100) for _ in range(rows)],
+        "quantity": [float(rng.randint(1, 10)) for _ in range(rows)],
+        # Some rows fail with runtime error.
+        "discount": [
+            rng.uniform(0, 5) if rng.random() > 0.01 else "x" for _ in range(rows)
+        ],
+        "limit": [50.0] * rows,
+        "flagged": [rng.random() < 0.5 for _ in range(rows)],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    expr: Expr | None = Losos().parse(_RULE)
+    assert expr is not None
+    data: dict[str, list[Any]] = columns(args.rows)
+
+    environment: Environment = Environment()
+    interpreter: Interpreter = Interpreter(reporter=Reporter(), environment=environment)
+    start: float = time.perf_counter()
+    expected: list[Any] = []
+    for row in range(args.rows):
+        for name, column in data.items():
+            environment.define(name, column[row])
+        try:
+            expected.append(interpreter._evaluate(expr))
+        except LososRuntimeError:
+            expected.append(None)
+    tree: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result: BatchResult = BatchEvaluator(expr).evaluate(data)
+    batch: float = time.perf_counter() - start
+
+    assert result.values == expected
+    print(f"rows:      {args.rows} ({len(result.errors)} failed)")
+    print(f"per-row:   {tree:.3f} s ({args.rows / tree:,.0f} rows/s)")
+    print(f"batch:     {batch:.3f} s ({args.rows / batch:,.0f} rows/s)")
+    print(f"speedup:   {tree / batch:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
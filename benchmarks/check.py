@@ -0,0 +1,51 @@
+"""Validate a big script with malformed lines in a single pass"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.generators import statements
+from losos.diagnostics import MemorySink
+from losos.fastscanner import FastScanner
+from losos.iterativeparser import IterativeParser
+from losos.losos import Losos
+from losos.reporter import Reporter
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=10, help="MB")
+    parser.add_argument("--bad", type=float, default=0.01, help="part of bad lines")
+    args = parser.parse_args()
+
+    source, bad_lines = statements(args.size * 1_000_000, args.bad)
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, "script.lox")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source)
+
+        sink: MemorySink = MemorySink()
+        start: float = time.perf_counter()
+        exit_code: int = Losos(diagnostics=sink).check_file(path)
+        single: float = time.perf_counter() - start
+        assert exit_code == 65
+        assert len(sink.diagnostics) == bad_lines
+
+    # Without recovery every cycle scans everything, but stops parsing at
+    # the first error, so each of `bad_lines` fixes costs about this much.
+    reporter: Reporter = Reporter(sink=MemorySink())
+    start = time.perf_counter()
+    IterativeParser(
+        FastScanner(source, reporter=reporter).scan_tokens(), reporter=reporter
+    ).parse()
+    cycle: float = time.perf_counter() - start
+
+    print(f"script:       {args.size} MB, {bad_lines} bad lines")
+    print(f"single pass:  {single:.2f} s, {len(sink.diagnostics)} errors reported")
+    print(f"per error:    {cycle:.2f} s per scan + parse cycle")
+    print(f"              ~{cycle * bad_lines:.0f} s to find all errors one by one")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare repeated evaluation with `Interpreter` and `ClosureCompiler`"""
+
+import argparse
+import random
+import time
+
+from losos.closures import ClosureCompiler
+from losos.expr import Expr
+from losos.fastscanner import FastScanner
+from losos.interpreter import Interpreter
+from losos.parser import Parser
+from losos.reporter import Reporter
+
+_OPERATORS: list[str] = ["+", "-", "*", "<", "==", "!="]
+
+
+def generate(terms: int, seed: int = 0) -> str:
+    rng: random.Random = random.Random(seed)
+    parts: list[str] = [str(rng.randint(1, 9))]
+    for _ in range(terms - 1):
+        operator: str = rng.choice(_OPERATORS[:3])
+        parts.append(f"{operator} ({rng.randint(1, 9)} * -{rng.randint(1, 9)})")
+    return " ".join(parts)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--terms", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    reporter: Reporter = Reporter()
+    source: str = generate(args.terms)
+    expr = Parser(
+        FastScanner(source, reporter=reporter).scan_tokens(), reporter=reporter
+    ).parse()
+    assert isinstance(expr, Expr)
+
+    interpreter: Interpreter = Interpreter(reporter=reporter)
+    start: float = time.perf_counter()
+    for _ in range(args.repeat):
+        expected = interpreter._evaluate(expr)
+    tree: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    closure = ClosureCompiler().compile(expr)
+    compile_time: float = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        result = closure()
+    closures: float = time.perf_counter() - start
+
+    assert result == expected
+    print(f"tree-walk: {tree:.3f} s")
+    print(f"closures:  {closures:.3f} s (+ {compile_time * 1000:.2f} ms compile)")
+    print(f"speedup:   {tree / closures:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Compare cost of reporting many errors with different diagnostic sinks"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+from losos.diagnostics import DiagnosticSink, MemorySink, TextSink
+from losos.fastscanner import FastScanner
+from losos.reporter import Reporter
+
+
+def run(source: str, sink: DiagnosticSink, max_errors: int | None = None) -> float:
+    reporter: Reporter = Reporter(sink=sink, max_errors=max_errors)
+    start: float = time.perf_counter()
+    FastScanner(source, reporter=reporter).scan_tokens()
+    reporter.flush()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--errors", type=int, default=100_000)
+    args = parser.parse_args()
+
+    # Every line has two unexpected characters.
+    source: str = "1 + @ 2 # 3\n" * (args.errors // 2)
+
+    # Line buffered, like stderr of a terminal.
+    with open(os.devnull, "w", buffering=1) as devnull:
+        with contextlib.redirect_stderr(devnull):
+            results: dict[str, float] = {
+                # Like the old `eprint` for every error.
+                "unbuffered text": run(source, TextSink(buffer_size=0)),
+                "buffered text": run(source, TextSink()),
+                "memory": run(source, MemorySink()),
+                "text, max 100": run(source, TextSink(), max_errors=100),
+            }
+
+    for name, elapsed in results.items():
+        print(f"{name:16} {elapsed:7.3f} s {args.errors / elapsed:12,.0f} errors/s")
+
+
+if __name__ == "__main__":
+    main()
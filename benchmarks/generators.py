@@ -0,0 +1,225 @@
+"""Deterministic generators of Lox sources for benchmarks.
+
+Every generator returns the same source for the same arguments (and seed),
+so results of different runs and revisions are comparable. Unless noted,
+source is one expression which runs without error.
+"""
+
+import random
+
+_WORDS: list[str] = [
+    "alpha", "beta", "gamma", "delta", "counter", "value", "x", "y",
+    "and", "or", "nil", "true", "false", "var", "print", "return",
+]  # fmt: skip
+_OPERATORS: list[str] = [
+    "+", "-", "*", "/", "==", "!=", "<", "<=", ">", ">=", "!", "=",
+    "(", ")", "{", "}", ",", ".", ";",
+]  # fmt: skip
+_KEYWORDS: list[str] = ["and", "or", "nil", "true", "false", "print", "var"]
+_COMPARISONS: list[str] = ["+", "-", "*", "/", "==", "!=", "<=", ">=", "<", ">"]
+_MISTAKES: list[str] = ["1 +", "(2 * 3", "4 5"]
+
+
+def flat(size: int, seed: int = 0) -> str:
+    """Long flat (left-deep) arithmetic chain of roughly `size` characters."""
+    rng: random.Random = random.Random(seed)
+    parts: list[str] = ["0"]
+    total: int = 1
+    while total < size:
+        part: str = f" + ({rng.randint(0, 999)} * -{rng.randint(1, 9)}.5)"
+        if rng.random() < 0.1:
+            part += "\n"
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+def repetitive(size: int, variables: float = 0.0, seed: int = 0) -> str:
+    """One-line arithmetic chain of roughly `size` characters made of a few
+    distinct terms, `variables` of them using variables `x` and `y`.
+    """
+
+    rng: random.Random = random.Random(seed)
+    terms: list[str] = [
+        f"({rng.randint(0, 99)} * -{rng.randint(1, 9)}.5 + {rng.randint(0, 9)})"
+        for _ in range(16)
+    ]
+    terms += [
+        f"({rng.choice('xy')} * {rng.randint(1, 9)} - {rng.randint(0, 9)})"
+        for _ in range(16)
+    ]
+    parts: list[str] = ["0"]
+    total: int = 1
+    while total < size:
+        part: str = " + " + terms[rng.randrange(16) + 16 * (rng.random() < variables)]
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+def records(size: int, length: int = 1 << 16, seed: int = 0) -> str:
+    """Chain of `==` comparisons of string literals of roughly `length`
+    characters (multi-line text with some non-ASCII letters), roughly `size`
+    characters in total, like data embedded in a generated script.
+    """
+
+    rng: random.Random = random.Random(seed)
+    pool: list[str] = []
+    for _ in range(16):
+        words: list[str] = []
+        total: int = 0
+        while total < length:
+            words.append(rng.choice(_WORDS + ["żółw", "naïve", "straße"]))
+            total += len(words[-1]) + 1
+            if rng.random() < 0.05:
+                words.append("\n")
+        pool.append('"' + " ".join(words) + '"')
+
+    parts: list[str] = []
+    total = 0
+    while total < size:
+        part: str = f"// record {len(parts)}\n" + rng.choice(pool) + "\n"
+        parts.append(part)
+        total += len(part) + 4
+    return " == ".join(parts)
+
+
+def nested(depth: int) -> str:
+    """Groupings nested `depth` levels deep: (((1 + 2) + 2) + 2)..."""
+    return "(" * depth + "1" + " + 2)" * depth
+
+
+def negations(depth: int) -> str:
+    """Chain of `depth` unary minuses."""
+    return "- " * depth + "1"
+
+
+def strings(size: int, seed: int = 0) -> str:
+    """Concatenation of string literals of roughly `size` characters."""
+    rng: random.Random = random.Random(seed)
+    parts: list[str] = []
+    total: int = 0
+    while total < size:
+        part: str = '"' + " ".join(rng.choices(_WORDS, k=rng.randint(1, 6))) + '"'
+        parts.append(part)
+        total += len(part) + 3
+    return " + ".join(parts)
+
+
+def commented(size: int, seed: int = 0) -> str:
+    """Arithmetic chain of roughly `size` characters, mostly comments,
+    blank lines and indentation.
+    """
+    rng: random.Random = random.Random(seed)
+    parts: list[str] = ["1"]
+    total: int = 1
+    while total < size:
+        comment: str = " ".join(rng.choices(_WORDS, k=rng.randint(3, 12)))
+        indent: str = rng.choice([" ", "\t"]) * rng.randint(1, 12)
+        part: str = (
+            f"  // {comment}\n"
+            + "\n" * rng.randint(0, 2)
+            + f"{indent}+ {rng.randint(0, 9)}"
+        )
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+def error_dense(size: int, seed: int = 0) -> str:
+    """Arithmetic chain of roughly `size` characters full of unexpected
+    characters, so scanner reports an error for almost every token (the
+    rest still parses).
+    """
+    rng: random.Random = random.Random(seed)
+    parts: list[str] = ["1"]
+    total: int = 1
+    while total < size:
+        part: str = f" {rng.choice('@#$&|^~`')} + {rng.randint(0, 99)}"
+        if rng.random() < 0.1:
+            part += "\n"
+        parts.append(part)
+        total += len(part)
+    return "".join(parts)
+
+
+def mixed(size: int, seed: int = 0) -> str:
+    """Lox-like token soup of roughly `size` characters (not a valid
+    expression): words, operators, numbers, strings and comments.
+    """
+    rng: random.Random = random.Random(seed)
+    parts: list[str] = []
+    total: int = 0
+
+    while total < size:
+        roll: float = rng.random()
+        if roll < 0.30:
+            part = rng.choice(_WORDS)
+        elif roll < 0.55:
+            part = rng.choice(_OPERATORS)
+        elif roll < 0.75:
+            part = str(rng.randint(0, 100000))
+            if rng.random() < 0.3:
+                part += "." + str(rng.randint(0, 999))
+        elif roll < 0.80:
+            part = '"' + "".join(rng.choices(_WORDS, k=3)) + '"'
+        elif roll < 0.83:
+            part = "// " + " ".join(rng.choices(_WORDS, k=6)) + "\n"
+        elif roll < 0.93:
+            part = " "
+        else:
+            part = "\n"
+        parts.append(part)
+        parts.append(" ")
+        total += len(part) + 1
+
+    return "".join(parts)
+
+
+def identifiers(size: int, names: int = 1000, seed: int = 0) -> str:
+    """Semicolon-terminated expressions of roughly `size` characters made
+    mostly of identifiers (from a vocabulary of `names`), keywords and
+    small numbers.
+    """
+
+    rng: random.Random = random.Random(seed)
+    vocabulary: list[str] = [
+        rng.choice(["count", "total", "value", "item", "x", "y"]) + str(i)
+        for i in range(names)
+    ]
+    lines: list[str] = []
+    total: int = 0
+
+    while total < size:
+        words: list[str] = []
+        for _ in range(rng.randint(2, 8)):
+            roll: float = rng.random()
+            if roll < 0.65:
+                words.append(rng.choice(vocabulary))
+            elif roll < 0.85:
+                words.append(rng.choice(_KEYWORDS))
+            else:
+                words.append(str(rng.randint(0, 99)))
+        line: str = " " + rng.choice(_COMPARISONS) + " "
+        lines.append(line.join(words) + ";")
+        total += len(lines[-1]) + 1
+
+    return "\n".join(lines)
+
+
+def statements(size: int, bad: float, seed: int = 0) -> tuple[str, int]:
+    """Return semicolon-terminated expressions of `size` characters where
+    `bad` part of lines has a syntax error, and number of such lines.
+    """
+    rng: random.Random = random.Random(seed)
+    lines: list[str] = []
+    total: int = 0
+    errors: int = 0
+    while total < size:
+        line: str = f"({rng.randint(0, 999)} + x) * -{rng.randint(1, 9)}.5 >= y == true"
+        if rng.random() < bad:
+            line = f"{line} + {rng.choice(_MISTAKES)}"
+            errors += 1
+        lines.append(line + ";")
+        total += len(line) + 2
+    return "\n".join(lines), errors
@@ -0,0 +1,132 @@
+"""Measure nodes and memory saved by `HashConser` on parsed trees, and speed
+of repeated evaluation with `MemoizingInterpreter` (and its hit rate)
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.generators import flat, repetitive
+from losos.environment import Environment
+from losos.expr import *
+from losos.fastscanner import FastScanner
+from losos.hashcons import HashConser, MemoizingInterpreter
+from losos.interpreter import Interpreter
+from losos.iterativeinterpreter import IterativeInterpreter
+from losos.iterativeparser import IterativeParser
+from losos.output import MemoryOutput
+from losos.profiling import count_nodes
+from losos.reporter import Reporter
+
+
+def parse(source: str) -> Expr:
+    tree: Expr | None = IterativeParser(
+        FastScanner(source, reporter=Reporter()).scan_tokens(), reporter=Reporter()
+    ).parse()
+    if tree is None:
+        raise ValueError("Syntax error")
+    return tree
+
+
+def unique_nodes(expr: Expr) -> int:
+    seen: set[int] = set()
+    work: list[Expr] = [expr]
+    while work:
+        node: Expr = work.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        if type(node) is BinaryExpr:
+            work.append(node.left)
+            work.append(node.right)
+        elif type(node) is GroupingExpr:
+            work.append(node.expression)
+        elif type(node) is UnaryExpr:
+            work.append(node.right)
+    return len(seen)
+
+
+def traced(source: str, conser: HashConser | None) -> tuple[int, int]:
+    """Return memory of the parsed tree (interned, if `conser` is given)
+    with and without the table of `conser`.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    base: int = tracemalloc.get_traced_memory()[0]
+    tree: Expr = parse(source)
+    if conser is not None:
+        tree = conser.intern(tree)
+    gc.collect()
+    with_table: int = tracemalloc.get_traced_memory()[0] - base
+    if conser is not None:
+        conser.clear()
+    gc.collect()
+    alone: int = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del tree
+    return alone, with_table
+
+
+def evaluate(interpreter: Interpreter, tree: Expr, runs: int) -> float:
+    start: float = time.perf_counter()
+    for _ in range(runs):
+        interpreter.interpret(tree)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000, help="characters")
+    parser.add_argument("--runs", type=int, default=20, help="evaluations of a tree")
+    args = parser.parse_args()
+
+    inputs: dict[str, str] = {
+        "flat": flat(args.size),
+        "repetitive": repetitive(args.size),
+        "repetitive, 50% vars": repetitive(args.size, 0.5),
+    }
+    environment: Environment = Environment({"x": 2.0, "y": 3.0})
+
+    for name, source in inputs.items():
+        tree: Expr = parse(source)
+        conser: HashConser = HashConser(maxsize=1 << 20)
+        start: float = time.perf_counter()
+        dag: Expr = conser.intern(tree)
+        interned: float = time.perf_counter() - start
+        nodes: int = count_nodes(tree)
+        print(
+            f"{name}: {nodes:,} nodes -> {unique_nodes(dag):,}"
+            f" ({unique_nodes(dag) / nodes:.0%}), interned in {interned:.2f} s"
+        )
+
+        tree_memory, _ = traced(source, None)
+        dag_memory, with_table = traced(source, HashConser(maxsize=1 << 20))
+        print(
+            f"  memory: tree {tree_memory / 2**20:.1f} MiB,"
+            f" DAG {dag_memory / 2**20:.1f} MiB"
+            f" (+ table {(with_table - dag_memory) / 2**20:.1f} MiB)"
+        )
+
+        plain: IterativeInterpreter = IterativeInterpreter(
+            reporter=Reporter(), environment=environment, output=MemoryOutput()
+        )
+        memoizing: MemoizingInterpreter = MemoizingInterpreter(
+            reporter=Reporter(),
+            environment=environment,
+            output=MemoryOutput(),
+            conser=conser,
+        )
+        old: float = evaluate(plain, tree, args.runs)
+        new: float = evaluate(memoizing, dag, args.runs)
+        lookups: int = conser.memo_hits + conser.memo_misses
+        print(
+            f"  {args.runs} evaluations: tree {old:.2f} s, memoized DAG {new:.2f} s"
+            f" ({old / new:.2f}x), memo hit rate"
+            f" {conser.memo_hits / lookups if lookups else 0:.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Compare single character edits of `IncrementalDocument` with full re-run"""
+
+import argparse
+import random
+import time
+
+from benchmarks.generators import statements
+from losos.diagnostics import MemorySink
+from losos.fastscanner import FastScanner
+from losos.incremental import IncrementalDocument
+from losos.iterativeparser import IterativeParser
+from losos.reporter import Reporter
+
+
+def full(source: str) -> float:
+    start: float = time.perf_counter()
+    reporter: Reporter = Reporter(sink=MemorySink())
+    tokens = FastScanner(source, reporter=reporter).scan_tokens()
+    IterativeParser(tokens, reporter=reporter).parse_statements()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1, help="MB")
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--full-runs", type=int, default=3)
+    args = parser.parse_args()
+
+    source, _ = statements(args.size * 1_000_000, 0.01)
+    start: float = time.perf_counter()
+    document: IncrementalDocument = IncrementalDocument(source)
+    initial: float = time.perf_counter() - start
+
+    rng: random.Random = random.Random(0)
+    kinds: dict[str, list[float]] = {"insert": [], "delete": [], "newline": []}
+    for _ in range(args.edits):
+        offset: int = rng.randrange(len(document.source()))
+        kind: str = rng.choice(list(kinds))
+        start = time.perf_counter()
+        if kind == "insert":
+            document.edit(offset, 0, rng.choice("1+x(;"))
+        elif kind == "delete":
+            document.edit(offset, 1, "")
+        else:
+            document.edit(offset, 0, "\n")
+        kinds[kind].append(time.perf_counter() - start)
+
+    rerun: float = min(full(document.source()) for _ in range(args.full_runs))
+
+    print(f"source:          {args.size} MB, {len(document.tokens())} tokens")
+    print(f"initial build:   {initial * 1000:9.1f} ms")
+    print(f"full re-run:     {rerun * 1000:9.1f} ms")
+    for kind, times in kinds.items():
+        times.sort()
+        median: float = times[len(times) // 2]
+        print(
+            f"{kind + ' edit:':16} {median * 1000:9.2f} ms median,"
+            f" {times[-1] * 1000:.1f} ms max ({rerun / median:.0f}x faster)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Measure memory and speed of scanning identifier-heavy source into tokens"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.generators import identifiers
+from losos.fastscanner import FastScanner
+from losos.reporter import Reporter
+from losos.scanner import Scanner
+from losos.token import Token
+
+
+def measure(engine: type[Scanner], source: str) -> tuple[int, float, list[Token]]:
+    """Return memory retained by tokens and scanning time (untraced)."""
+
+    start: float = time.perf_counter()
+    engine(source, reporter=Reporter()).scan_tokens()
+    elapsed: float = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    tokens: list[Token] = engine(source, reporter=Reporter()).scan_tokens()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, elapsed, tokens
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=10, help="size in MB")
+    parser.add_argument("--names", type=int, default=1000, help="distinct names")
+    args = parser.parse_args()
+
+    source: str = identifiers(args.size * 1_000_000, args.names)
+    print(f"source: {len(source):,} characters")
+
+    for engine in (Scanner, FastScanner):
+        retained, elapsed, tokens = measure(engine, source)
+        lexemes: int = len({id(token.lexeme) for token in tokens})
+        literals: int = len(
+            {id(token.literal) for token in tokens if token.literal is not None}
+        )
+        print(
+            f"{engine.__name__:<12} {len(tokens):>10,} tokens"
+            f"  {retained / 2**20:8.1f} MiB retained"
+            f"  {len(tokens) / elapsed:>10,.0f} tokens/s"
+            f"  {lexemes:>10,} lexeme objects  {literals:>10,} float objects"
+        )
+        del tokens
+
+
+if __name__ == "__main__":
+    main()
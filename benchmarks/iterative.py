@@ -0,0 +1,80 @@
+"""Compare recursive and iterative parser, interpreter and AST printer"""
+
+import argparse
+import time
+from typing import Any, Callable
+
+from benchmarks.generators import negations, nested
+from losos.astprinter import AstPrinter, IterativeAstPrinter
+from losos.expr import Expr
+from losos.fastscanner import FastScanner
+from losos.interpreter import Interpreter
+from losos.iterativeinterpreter import IterativeInterpreter
+from losos.iterativeparser import IterativeParser
+from losos.parser import Parser
+from losos.reporter import Reporter
+from losos.token import Token
+
+
+def flat(terms: int) -> str:
+    return " + ".join(f"{i % 10} * {i % 7} - -{i % 3}" for i in range(terms))
+
+
+def timed(function: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    """Return best time of `repeat` runs and result (or raised exception)."""
+    best: float = float("inf")
+    result: Any = None
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        try:
+            result = function()
+        except RecursionError as e:
+            return float("nan"), e
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _failed(result: Any) -> str:
+    return "(RecursionError)" if isinstance(result, RecursionError) else ""
+
+
+def main() -> None:
+    argparser = argparse.ArgumentParser(description=__doc__)
+    argparser.add_argument("--repeat", type=int, default=20)
+    args = argparser.parse_args()
+
+    reporter: Reporter = Reporter()
+    for name, source in (
+        # Recursive implementations handle these...
+        ("nested 90", nested(90)),
+        ("flat 100", flat(100)),
+        # ...but not these.
+        ("nested 5000", nested(5000)),
+        ("negations 5000", negations(5000)),
+        ("flat 20000", flat(20000)),
+    ):
+        tokens: list[Token] = FastScanner(source, reporter=reporter).scan_tokens()
+        print(f"{name} ({len(tokens)} tokens)")
+
+        trees: dict[str, Expr] = {}
+        for parser in (Parser, IterativeParser):
+            elapsed, tree = timed(
+                lambda: parser(tokens, reporter=reporter).parse(), args.repeat
+            )
+            print(f"  {parser.__name__:<22} {elapsed:9.4f} s {_failed(tree)}")
+            if isinstance(tree, Expr):
+                trees[parser.__name__] = tree
+
+        tree = trees["IterativeParser"]
+        for interpreter in (Interpreter, IterativeInterpreter):
+            instance = interpreter(reporter=reporter)
+            elapsed, value = timed(lambda: instance._evaluate(tree), args.repeat)
+            print(f"  {interpreter.__name__:<22} {elapsed:9.4f} s {_failed(value)}")
+
+        for printer in (AstPrinter, IterativeAstPrinter):
+            elapsed, text = timed(lambda: printer().print(tree), args.repeat)
+            print(f"  {printer.__name__:<22} {elapsed:9.4f} s {_failed(text)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Compare peak RSS and time of running a large script read as text (in
+chunks) and memory-mapped (`--mmap`), each in its own process
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.generators import flat, records
+
+_RUN: str = """
+import resource, sys, time
+from losos.__main__ import main
+start = time.perf_counter()
+code = main(["losos", "--no-cache", *sys.argv[2:], sys.argv[1]])
+elapsed = time.perf_counter() - start
+try:
+    # `ru_maxrss` survives exec, so it may be the peak of the parent.
+    with open("/proc/self/status") as f:
+        rss = next(int(l.split()[1]) for l in f if l.startswith("VmHWM:"))
+except OSError:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(code, elapsed, rss, file=sys.stderr)
+"""
+
+
+def run(path: str, flags: list[str]) -> tuple[bytes, int, float, int]:
+    """Return output, exit code, time and peak RSS (KiB) of the script."""
+
+    process: subprocess.CompletedProcess[bytes] = subprocess.run(
+        [sys.executable, "-c", _RUN, path, *flags], capture_output=True
+    )
+    code, elapsed, rss = process.stderr.split()[-3:]
+    return process.stdout, int(code), float(elapsed), int(rss)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--size", type=int, default=500_000_000, help="characters of string script"
+    )
+    parser.add_argument(
+        "--tokens", type=int, default=20_000_000, help="characters of token script"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        scripts: dict[str, str] = {
+            "strings": os.path.join(directory, "strings.lox"),
+            "tokens": os.path.join(directory, "tokens.lox"),
+        }
+        with open(scripts["strings"], "w", encoding="utf-8") as f:
+            f.write(records(args.size))
+        with open(scripts["tokens"], "w", encoding="utf-8") as f:
+            f.write(flat(args.tokens))
+
+        for name, path in scripts.items():
+            print(f"{name}: {os.path.getsize(path) / 2**20:,.0f} MiB")
+            outputs: set[tuple[bytes, int]] = set()
+            for mode, flags in (("text", []), ("mmap", ["--mmap"])):
+                output, code, elapsed, rss = run(path, flags)
+                outputs.add((output, code))
+                print(f"  {mode:<5} {elapsed:6.2f} s   peak RSS {rss / 1024:8,.0f} MiB")
+            if len(outputs) != 1:
+                print("  outputs differ!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Compare throughput of `run_files` with 1 and N worker processes"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from benchmarks.generators import flat
+from losos.multirun import run_files
+
+
+def corpus(directory: str, files: int, size: int) -> list[str]:
+    """Write `files` scripts of roughly `size` characters each."""
+    paths: list[str] = []
+    for i in range(files):
+        path: str = os.path.join(directory, f"script{i:05}.lox")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(flat(size, seed=i))
+        paths.append(path)
+    return paths
+
+
+def run(paths: list[str], jobs: int) -> float:
+    start: float = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        exit_code, _ = run_files(paths, jobs=jobs, options={"ast_cache": False})
+    elapsed: float = time.perf_counter() - start
+    assert exit_code == 0
+    assert output.getvalue().count("\n") == len(paths)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=5000, help="characters per file")
+    parser.add_argument(
+        "--jobs", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths: list[str] = corpus(directory, args.files, args.size)
+        print(
+            f"{args.files} files, {args.size} characters each, {os.cpu_count()} CPU(s)"
+        )
+        baseline: float = 0.0
+        for jobs in sorted(set(args.jobs)):
+            elapsed: float = run(paths, jobs)
+            baseline = baseline or elapsed
+            print(
+                f"jobs={jobs:<3} {elapsed:7.3f} s {args.files / elapsed:9.1f} files/s"
+                f" {baseline / elapsed:5.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
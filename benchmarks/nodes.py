@@ -0,0 +1,113 @@
+"""Compare memory and speed of syntax tree nodes with `__slots__` and with
+per-instance `__dict__` (as they were before), on a balanced tree of about
+a million nodes.
+"""
+
+import argparse
+import contextlib
+from dataclasses import dataclass
+import gc
+import io
+import sys  # version_info
+import time
+import tracemalloc
+from typing import Any, Callable
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.astprinter import AstPrinter
+from losos.expr import *
+from losos.interpreter import Interpreter
+from losos.reporter import Reporter
+from losos.token import Token
+from losos.tokentype import TokenType
+
+
+# Subclasses of `Expr` without `__slots__` get `__dict__`.
+@dataclass
+class DictBinaryExpr(Expr):
+    left: Expr
+    operator: Token
+    right: Expr
+
+    @override
+    def accept(self, visitor: ExprVisitor[R]) -> R:
+        return visitor.visit_binary_expr(self)  # type: ignore[arg-type]
+
+
+@dataclass
+class DictLiteralExpr(Expr):
+    value: Any
+
+    @override
+    def accept(self, visitor: ExprVisitor[R]) -> R:
+        return visitor.visit_literal_expr(self)  # type: ignore[arg-type]
+
+
+_OPERATORS: list[Token] = [
+    Token(TokenType.PLUS, "+", None, 1),
+    Token(TokenType.MINUS, "-", None, 1),
+]
+
+
+def build(
+    binary: Callable[..., Expr], literal: Callable[..., Expr], depth: int
+) -> Expr:
+    """Return complete binary tree of `depth` levels (2**depth - 1 nodes)."""
+
+    # Level by level from leaves, so there's no recursion.
+    level: list[Expr] = [literal(float(i % 10)) for i in range(2 ** (depth - 1))]
+    while len(level) > 1:
+        operator: Token = _OPERATORS[len(level) % 2]
+        level = [
+            binary(level[i], operator, level[i + 1]) for i in range(0, len(level), 2)
+        ]
+    return level[0]
+
+
+def measure(run: Callable[[], object]) -> float:
+    best: float = float("inf")
+    for _ in range(3):
+        start: float = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=20, help="levels of tree")
+    args = parser.parse_args()
+    nodes: int = 2**args.depth - 1
+    print(f"tree: {nodes:,} nodes")
+
+    for name, binary, literal in (
+        ("__dict__", DictBinaryExpr, DictLiteralExpr),
+        ("__slots__", BinaryExpr, LiteralExpr),
+    ):
+        built: float = measure(lambda: build(binary, literal, args.depth))
+
+        gc.collect()
+        tracemalloc.start()
+        tree: Expr = build(binary, literal, args.depth)
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        interpreter: Interpreter = Interpreter(reporter=Reporter())
+        with contextlib.redirect_stdout(io.StringIO()):
+            interpreted: float = measure(lambda: interpreter.interpret(tree))
+        printed: float = measure(lambda: AstPrinter().print(tree))
+        print(
+            f"{name:<10} {retained / nodes:6.1f} B/node ({retained / 2**20:6.1f} MiB)"
+            f"   build {built:6.3f} s   interpret {interpreted:6.3f} s"
+            f"   print {printed:6.3f} s"
+        )
+        del tree
+
+
+if __name__ == "__main__":
+    main()
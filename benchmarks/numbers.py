@@ -0,0 +1,134 @@
+"""Check number formatting and literal conversion against their previous
+versions on a large random corpus, and compare their speed
+"""
+
+import argparse
+import math
+import random
+import struct
+import time
+from typing import Any, Callable
+
+from losos.helpers import to_float
+from losos.interpreter import Interpreter
+from losos.reporter import Reporter
+
+
+def old_stringify(obj: Any) -> str:
+    """`Interpreter._stringify` as it was before."""
+
+    if obj is None:
+        return "nil"
+
+    if type(obj) is float:
+        text: str = str(obj)
+        if text.endswith(".0"):
+            text = text[:-2]
+        return text
+
+    return str(obj)
+
+
+def old_to_float(s: str) -> float:
+    """`helpers.to_float` as it was before."""
+    try:
+        return float(s)
+    except ValueError as e:
+        raise
+    except OverflowError as e:
+        raise
+
+
+def corpus(size: int, seed: int = 0) -> dict[str, list[float]]:
+    """Return floats of several kinds, `size` of each."""
+
+    rng: random.Random = random.Random(seed)
+    special: list[float] = [0.0, -0.0, math.inf, -math.inf, math.nan, -math.nan]
+    for base in (1e15, 1e16, 1e17, 2.0**53, 2.0**63, 1e22, 1e308):
+        for value in (base, -base):
+            special += [
+                value,
+                math.nextafter(value, 0),
+                math.nextafter(value, math.inf),
+            ]
+    special += [5e-324, -5e-324, 2.2250738585072014e-308, 0.1, 0.5, 1 / 3]
+
+    return {
+        "small integral": [float(rng.randint(0, 100)) for _ in range(size)],
+        "integral": [float(rng.randint(-(10**9), 10**9)) for _ in range(size)],
+        "huge integral": [
+            float(rng.randint(1, 9)) * 10.0 ** rng.randint(15, 308) for _ in range(size)
+        ],
+        "fraction": [rng.uniform(-1e6, 1e6) for _ in range(size)],
+        # Any bit pattern: subnormals, huge exponents, infinities, NaNs.
+        "random bits": [
+            struct.unpack("<d", rng.getrandbits(64).to_bytes(8, "little"))[0]
+            for _ in range(size)
+        ],
+        "special": special * (size // len(special) + 1),
+    }
+
+
+def literals(size: int, seed: int = 0) -> list[str]:
+    """Return number literals, some too long to fit in a float."""
+
+    rng: random.Random = random.Random(seed)
+    result: list[str] = []
+    for _ in range(size):
+        text: str = str(rng.randint(0, 10 ** rng.randint(1, 20)))
+        if rng.random() < 0.5:
+            text += "." + str(rng.randint(0, 10 ** rng.randint(1, 20)))
+        if rng.random() < 0.01:
+            text = "9" * rng.randint(300, 400) + text
+        result.append(text)
+    return result
+
+
+def timed(function: Callable[[Any], Any], values: list[Any]) -> float:
+    best: float = math.inf
+    for _ in range(3):
+        start: float = time.perf_counter()
+        for value in values:
+            function(value)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000, help="values of a kind")
+    args = parser.parse_args()
+
+    stringify: Callable[[Any], str] = Interpreter(reporter=Reporter())._stringify
+    mismatches: int = 0
+    for kind, values in corpus(args.size).items():
+        for value in values:
+            if stringify(value) != old_stringify(value):
+                mismatches += 1
+                print(f"mismatch: {value!r} {stringify(value)!r}")
+        old: float = timed(old_stringify, values)
+        new: float = timed(stringify, values)
+        print(
+            f"_stringify  {kind:<16} {old * 1e9 / len(values):6.0f} ->"
+            f" {new * 1e9 / len(values):4.0f} ns  ({old / new:.2f}x)"
+        )
+
+    texts: list[str] = literals(args.size)
+    for text in texts:
+        a: float = to_float(text)
+        b: float = old_to_float(text)
+        if a != b and not (math.isnan(a) and math.isnan(b)):
+            mismatches += 1
+            print(f"mismatch: {text!r}")
+    old = timed(old_to_float, texts)
+    new = timed(to_float, texts)
+    print(
+        f"to_float    {'literals':<16} {old * 1e9 / len(texts):6.0f} ->"
+        f" {new * 1e9 / len(texts):4.0f} ns  ({old / new:.2f}x)"
+    )
+
+    print(f"{mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Measure throughput of a million small results through every output sink,
+with and without evaluating them
+"""
+
+import argparse
+import os
+import sys  # version_info
+import tempfile
+import time
+from typing import Callable, TextIO
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.expr import Expr
+from losos.iterativeinterpreter import IterativeInterpreter
+from losos.iterativeparser import IterativeParser
+from losos.fastscanner import FastScanner
+from losos.output import FramedOutput, MemoryOutput, OutputSink, TextOutput
+from losos.reporter import Reporter
+
+
+class PrintOutput(OutputSink):
+    """`print` for every result, as `Interpreter` did before."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self._stream: TextIO = stream
+
+    @override
+    def write(self, text: str) -> None:
+        print(text, file=self._stream)
+
+
+def trees(count: int) -> list[Expr]:
+    result: list[Expr] = []
+    for i in range(count):
+        source: str = f"{i} * 2 + {i % 7}" if i % 3 else f'"item" + "{i}"'
+        tree: Expr | None = IterativeParser(
+            FastScanner(source, reporter=Reporter()).scan_tokens(),
+            reporter=Reporter(),
+        ).parse()
+        if tree is None:
+            raise ValueError(source)
+        result.append(tree)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=int, default=1_000_000)
+    parser.add_argument(
+        "--file", action="store_true", help="write to a file instead of devnull"
+    )
+    args = parser.parse_args()
+
+    expressions: list[Expr] = trees(100)
+    texts: list[str] = [f"{i * 2 + i % 7}" for i in range(100)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, "out") if args.file else os.devnull
+        with open(path, "w") as text, open(path, "wb") as binary:
+            sinks: list[tuple[str, Callable[[], OutputSink]]] = [
+                ("print", lambda: PrintOutput(text)),
+                ("TextOutput", lambda: TextOutput(text)),
+                ("MemoryOutput", MemoryOutput),
+                ("FramedOutput", lambda: FramedOutput(binary)),
+            ]
+            print(f"{args.results:,} results to {path}")
+            for name, sink in sinks:
+                output: OutputSink = sink()
+                start: float = time.perf_counter()
+                for i in range(args.results):
+                    output.write(texts[i % 100])
+                output.flush()
+                written: float = time.perf_counter() - start
+
+                output = sink()
+                interpreter: IterativeInterpreter = IterativeInterpreter(
+                    reporter=Reporter(), output=output
+                )
+                start = time.perf_counter()
+                for i in range(args.results):
+                    interpreter.interpret(expressions[i % 100])
+                output.flush()
+                interpreted: float = time.perf_counter() - start
+
+                print(
+                    f"{name:<14} output only {args.results / written:>12,.0f} results/s"
+                    f"   interpret + output {args.results / interpreted:>12,.0f}"
+                    " results/s"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Measure how scanning of a large source scales with the number of
+processes of `ParallelScanner`, compared with `FastScanner`.
+
+CPU time of the parent process (splitting and joining parts) is the part
+which does not scale, it limits the speedup on any number of CPUs.
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.generators import identifiers
+from losos.fastscanner import FastScanner
+from losos.parallelscanner import ParallelScanner
+from losos.reporter import Reporter
+from losos.tokenbuffer import TokenBuffer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000_000, help="characters")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        nargs="+",
+        help="numbers of processes (default: powers of two up to CPU count)",
+    )
+    args = parser.parse_args()
+
+    cpus: int = os.cpu_count() or 1
+    jobs: list[int] = args.jobs or [
+        2**i for i in range(cpus.bit_length()) if 2**i <= cpus
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Read back from a file, like a script would be.
+        path: str = os.path.join(directory, "source.lox")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(identifiers(args.size))
+        with open(path, encoding="utf-8") as f:
+            source: str = f.read()
+    print(f"{len(source) / 2**20:,.0f} MiB, {cpus} CPU(s)")
+
+    start: float = time.perf_counter()
+    expected: TokenBuffer = FastScanner(source, reporter=Reporter()).scan_buffer()
+    sequential: float = time.perf_counter() - start
+    print(
+        f"FastScanner         {sequential:7.2f} s"
+        f"  {len(expected) / sequential:12,.0f} tokens/s"
+    )
+
+    samples: list[int] = random.Random(0).sample(range(len(expected)), 10_000)
+    for count in jobs:
+        start = time.perf_counter()
+        cpu: float = time.process_time()
+        buffer: TokenBuffer = ParallelScanner(
+            source, reporter=Reporter(), jobs=count
+        ).scan_buffer()
+        elapsed: float = time.perf_counter() - start
+        cpu = time.process_time() - cpu
+        same: bool = len(buffer) == len(expected) and all(
+            buffer[i] == expected[i] for i in samples
+        )
+        print(
+            f"ParallelScanner x{count:<3} {elapsed:7.2f} s"
+            f"  {len(buffer) / elapsed:12,.0f} tokens/s"
+            f"  {sequential / elapsed:5.2f}x   parent CPU {cpu:6.2f} s"
+            f" (max {sequential / cpu:5.1f}x){'' if same else '  tokens differ!'}"
+        )
+        del buffer
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Compare tokens/second of `Scanner` (reference) and `FastScanner`"""
+
+import argparse
+import time
+
+from benchmarks.generators import mixed
+from losos.fastscanner import FastScanner
+from losos.reporter import Reporter
+from losos.scanner import Scanner
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1, 10, 50], help="sizes in MB"
+    )
+    args = parser.parse_args()
+
+    for megabytes in args.sizes:
+        source: str = mixed(megabytes * 1024 * 1024)
+        results: dict[str, list[object]] = {}
+
+        for engine in (Scanner, FastScanner):
+            start: float = time.perf_counter()
+            tokens = engine(source, reporter=Reporter()).scan_tokens()
+            elapsed: float = time.perf_counter() - start
+            results[engine.__name__] = [
+                (t.type, t.lexeme, t.literal, t.line) for t in tokens
+            ]
+            print(
+                f"{megabytes:>4} MB  {engine.__name__:<12}"
+                f"{len(tokens):>12} tokens  {elapsed:8.2f} s"
+                f"{len(tokens) / elapsed:>14,.0f} tokens/s"
+            )
+            del tokens
+
+        identical: bool = results["Scanner"] == results["FastScanner"]
+        print(f"{megabytes:>4} MB  identical token streams: {identical}")
+
+
+if __name__ == "__main__":
+    main()
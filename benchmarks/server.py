@@ -0,0 +1,118 @@
+"""Load `Server` with many concurrent clients and measure requests per second
+and latency of small and heavy (long) snippets.
+
+Server is started twice: with long snippets offloaded to worker processes
+(default) and with everything evaluated in the event loop.
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.generators import flat
+
+_SERVER: str = """
+import asyncio, sys
+from losos.server import Server
+server = Server(workers=int(sys.argv[2]), inline_limit=int(sys.argv[3]))
+asyncio.run(server.serve(sys.argv[1]))
+"""
+
+
+def percentile(samples: list[float], p: float) -> float:
+    ordered: list[float] = sorted(samples)
+    return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+async def client(
+    path: str,
+    requests: int,
+    heavy: float,
+    heavy_source: bytes,
+    seed: int,
+    latencies: tuple[list[float], list[float]],
+) -> None:
+    rng: random.Random = random.Random(seed)
+    reader, writer = await asyncio.open_unix_connection(path, limit=1 << 24)
+    for _ in range(requests):
+        is_heavy: bool = rng.random() < heavy
+        source: bytes = (
+            heavy_source
+            if is_heavy
+            else f"({rng.randint(0, 999)} + {rng.randint(0, 9)}) * -2.5 >= 3".encode()
+        )
+        start: float = time.perf_counter()
+        writer.write(source + b"\n")
+        await writer.drain()
+        if not await reader.readline():
+            raise ConnectionError("Server closed connection")
+        latencies[is_heavy].append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def load(args: argparse.Namespace, path: str) -> None:
+    heavy_source: bytes = flat(args.heavy_size).replace("\n", " ").encode()
+    latencies: tuple[list[float], list[float]] = ([], [])
+    start: float = time.perf_counter()
+    await asyncio.gather(
+        *(
+            client(path, args.requests, args.heavy, heavy_source, seed, latencies)
+            for seed in range(args.clients)
+        )
+    )
+    elapsed: float = time.perf_counter() - start
+
+    light, heavy = latencies
+    print(f"  {(len(light) + len(heavy)) / elapsed:10,.0f} requests/s", end="")
+    for name, samples in (("small", light), ("heavy", heavy)):
+        if samples:
+            print(
+                f"   {name}: p50 {percentile(samples, 50) * 1000:7.2f} ms"
+                f" p99 {percentile(samples, 99) * 1000:8.2f} ms",
+                end="",
+            )
+    print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200, help="per client")
+    parser.add_argument("--heavy", type=float, default=0.01, help="part of requests")
+    parser.add_argument("--heavy-size", type=int, default=50_000, help="characters")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(
+        f"{args.clients} clients x {args.requests} requests,"
+        f" {args.heavy:.0%} of {args.heavy_size:,} characters"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, "losos.sock")
+        for name, inline_limit in (("workers", 2048), ("event loop", sys.maxsize)):
+            server: subprocess.Popen[bytes] = subprocess.Popen(
+                [sys.executable, "-c", _SERVER, path]
+                + [str(args.workers), str(inline_limit)],
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                while not os.path.exists(path):
+                    time.sleep(0.05)
+                print(f"{name}:")
+                asyncio.run(load(args, path))
+            finally:
+                # Like Ctrl-C, so it stops its workers and removes socket.
+                server.send_signal(signal.SIGINT)
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
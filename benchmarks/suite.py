@@ -0,0 +1,367 @@
+"""Run timed scenarios for the whole pipeline and compare results.
+
+    python -m benchmarks.suite run [--json results.json]
+    python -m benchmarks.suite compare OLD NEW [--threshold 0.1]
+
+Every scenario (scan, parse, interpret, print and end-to-end run_file of
+inputs from `benchmarks.generators`) reports latency percentiles,
+throughput and peak traced memory. OLD and NEW are result files, git
+revisions or "." (working tree); revisions are run in a temporary git
+worktree with this suite copied in, so both sides run the same scenarios
+with engines Losos of that revision uses by default.
+"""
+
+import argparse
+from collections.abc import Callable
+import contextlib
+from dataclasses import asdict, dataclass
+import gc
+import inspect
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+from benchmarks import generators
+from losos.astprinter import AstPrinter
+from losos.expr import Expr
+from losos.losos import Losos
+from losos.reporter import Reporter
+
+_BENCHMARKS: str = os.path.dirname(os.path.abspath(__file__))
+
+# Input name: source for the given scale.
+_INPUTS: dict[str, Callable[[float], str]] = {
+    "flat": lambda scale: generators.flat(int(200_000 * scale)),
+    "nested": lambda scale: generators.nested(int(2_000 * scale)),
+    "strings": lambda scale: generators.strings(int(100_000 * scale)),
+    "comments": lambda scale: generators.commented(int(200_000 * scale)),
+    "errors": lambda scale: generators.error_dense(int(100_000 * scale)),
+}
+
+
+@dataclass
+class Result:
+    unit: str
+    units: int  # Processed in one run
+    samples: list[float]  # Seconds
+    peak: int  # Bytes of traced memory
+    error: str = ""  # Why the scenario could not run
+
+    def percentile(self, p: float) -> float:
+        """Nearest-rank percentile of samples."""
+        ordered: list[float] = sorted(self.samples)
+        return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+    def throughput(self) -> float:
+        return self.units / self.percentile(50)
+
+
+def _default(name: str, fallback: type) -> type:
+    """Return engine `Losos` uses by default (older revisions may not have
+    the option).
+    """
+    parameter = inspect.signature(Losos.__init__).parameters.get(name)
+    if parameter is None or not isinstance(parameter.default, type):
+        return fallback
+    return parameter.default
+
+
+def _count_nodes(expr: Expr) -> int:
+    count: int = 0
+    work: list[Any] = [expr]
+    while work:
+        node: Any = work.pop()
+        count += 1
+        for child in ("left", "right", "expression"):
+            if hasattr(node, child):
+                work.append(getattr(node, child))
+    return count
+
+
+def scenarios(scale: float, directory: str) -> dict[str, Callable[[], Result]]:
+    """Return scenarios by name. Each one prepares its input and measures
+    a callable (see `measure`).
+    """
+
+    from losos.interpreter import Interpreter
+    from losos.parser import Parser
+    from losos.scanner import Scanner
+
+    scanner: type = _default("scanner", Scanner)
+    parser: type = _default("parser", Parser)
+    interpreter: type = _default("interpreter", Interpreter)
+    printer: type = AstPrinter
+    with contextlib.suppress(ImportError):
+        # Recursive `AstPrinter` can't print deep trees.
+        from losos.astprinter import IterativeAstPrinter
+
+        printer = IterativeAstPrinter
+
+    def scan(source: str) -> Callable[[], Result]:
+        return lambda: measure(
+            lambda: scanner(source, reporter=Reporter()).scan_tokens(),
+            "chars",
+            len(source),
+        )
+
+    def parse(source: str) -> Callable[[], Result]:
+        def prepare() -> Result:
+            tokens = scanner(source, reporter=Reporter()).scan_tokens()
+            return measure(
+                lambda: parser(tokens, reporter=Reporter()).parse(),
+                "tokens",
+                len(tokens),
+            )
+
+        return prepare
+
+    def tree(source: str) -> Expr:
+        reporter: Reporter = Reporter()
+        tokens = scanner(source, reporter=reporter).scan_tokens()
+        expr: Expr | None = parser(tokens, reporter=reporter).parse()
+        if expr is None:
+            raise ValueError("Source does not parse")
+        return expr
+
+    def interpret(source: str) -> Callable[[], Result]:
+        def prepare() -> Result:
+            expr: Expr = tree(source)
+            instance = interpreter(reporter=Reporter())
+            return measure(
+                lambda: instance.interpret(expr), "nodes", _count_nodes(expr)
+            )
+
+        return prepare
+
+    def print_tree(source: str) -> Callable[[], Result]:
+        def prepare() -> Result:
+            expr: Expr = tree(source)
+            return measure(lambda: printer().print(expr), "nodes", _count_nodes(expr))
+
+        return prepare
+
+    def run_file(name: str, source: str) -> Callable[[], Result]:
+        def prepare() -> Result:
+            path: str = os.path.join(directory, name + ".lox")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(source)
+            return measure(lambda: Losos().run_file(path), "chars", len(source))
+
+        return prepare
+
+    result: dict[str, Callable[[], Result]] = {}
+    for name, generate in _INPUTS.items():
+        source: str = generate(scale)
+        result[f"scan/{name}"] = scan(source)
+        result[f"parse/{name}"] = parse(source)
+        result[f"interpret/{name}"] = interpret(source)
+        result[f"print/{name}"] = print_tree(source)
+        result[f"run_file/{name}"] = run_file(name, source)
+    return result
+
+
+# Set by `main` from command line.
+_REPEAT: int = 5
+
+
+def measure(run: Callable[[], object], unit: str, units: int) -> Result:
+    """Time `run` (after a warm-up run), then measure its peak memory in an
+    extra traced run (tracing slows it down, so it is not timed).
+    """
+
+    run()
+    samples: list[float] = []
+    for _ in range(_REPEAT):
+        gc.collect()
+        start: float = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return Result(unit, units, samples, peak)
+
+
+def run(args: argparse.Namespace) -> int:
+    global _REPEAT
+    _REPEAT = args.repeat
+
+    results: dict[str, Result] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, scenario in scenarios(args.scale, directory).items():
+            if args.filter and not any(part in name for part in args.filter):
+                continue
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(
+                devnull
+            ), contextlib.redirect_stderr(devnull):
+                try:
+                    results[name] = scenario()
+                except (Exception, RecursionError) as e:
+                    results[name] = Result("", 0, [], 0, f"{type(e).__name__}: {e}")
+            _print_result(name, results[name])
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "revision": _revision(),
+                    "python": platform.python_version(),
+                    "scale": args.scale,
+                    "results": {name: asdict(r) for name, r in results.items()},
+                },
+                f,
+                indent=1,
+            )
+    return 0
+
+
+def _print_result(name: str, result: Result) -> None:
+    if result.error:
+        print(f"{name:<22} failed: {result.error[:60]}", flush=True)
+        return
+    print(
+        f"{name:<22} {result.percentile(50) * 1000:10.2f}"
+        f" {result.percentile(90) * 1000:10.2f}"
+        f" {result.percentile(99) * 1000:10.2f} ms (p50/p90/p99)"
+        f" {result.throughput():>13,.0f} {result.unit}/s"
+        f" {result.peak / 2**20:8.1f} MiB peak",
+        flush=True,
+    )
+
+
+def _revision() -> str:
+    completed = subprocess.run(
+        ["git", "describe", "--always", "--dirty"],
+        cwd=os.path.dirname(inspect.getfile(Losos)),
+        capture_output=True,
+        text=True,
+    )
+    return completed.stdout.strip() or "unknown"
+
+
+def _load(target: str, args: argparse.Namespace) -> dict[str, Any]:
+    """Return results from file, or of running the suite on revision."""
+
+    if os.path.isfile(target):
+        with open(target, encoding="utf-8") as f:
+            loaded: dict[str, Any] = json.load(f)
+            return loaded
+
+    options: list[str] = ["--scale", str(args.scale), "--repeat", str(args.repeat)]
+    for part in args.filter or []:
+        options += ["--filter", part]
+
+    with tempfile.TemporaryDirectory() as directory:
+        output: str = os.path.join(directory, "results.json")
+        root: str = os.path.dirname(_BENCHMARKS)
+        tree: str = root
+        if target != ".":
+            tree = os.path.join(directory, "tree")
+            subprocess.run(
+                ["git", "worktree", "add", "--detach", tree, target],
+                cwd=root,
+                check=True,
+                capture_output=True,
+            )
+        try:
+            if tree != root:
+                shutil.copytree(
+                    _BENCHMARKS,
+                    os.path.join(tree, "benchmarks"),
+                    dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns("__pycache__"),
+                )
+            print(f"== {target}", flush=True)
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.suite", "run", "--json", output]
+                + options,
+                cwd=tree,
+                check=True,
+            )
+        finally:
+            if tree != root:
+                subprocess.run(
+                    ["git", "worktree", "remove", "--force", tree],
+                    cwd=root,
+                    capture_output=True,
+                )
+        with open(output, encoding="utf-8") as f:
+            results: dict[str, Any] = json.load(f)
+            return results
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Compare median latencies, return 1 if any scenario got slower by
+    more than the threshold.
+    """
+
+    old: dict[str, Any] = _load(args.old, args)
+    new: dict[str, Any] = _load(args.new, args)
+    print(f"\n{old['revision']} -> {new['revision']}")
+
+    regressions: int = 0
+    for name, old_result in old["results"].items():
+        new_result: dict[str, Any] | None = new["results"].get(name)
+        if new_result is None or old_result["error"] or new_result["error"]:
+            print(f"{name:<22} {'skipped (missing or failed)':>40}")
+            continue
+        before: float = Result(**old_result).percentile(50)
+        after: float = Result(**new_result).percentile(50)
+        change: float = after / before - 1
+        flag: str = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            f"{name:<22} {before * 1000:10.2f} -> {after * 1000:10.2f} ms"
+            f" {change:+8.1%}{flag}"
+        )
+
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run scenarios")
+    run_parser.add_argument("--json", metavar="FILE", help="save results to FILE")
+    compare_parser = commands.add_parser("compare", help="compare two results")
+    compare_parser.add_argument("old", help="result file, git revision or .")
+    compare_parser.add_argument("new", help="result file, git revision or .")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="flag scenarios with median slower by more than this (0.1 = 10%%)",
+    )
+    for subparser in (run_parser, compare_parser):
+        subparser.add_argument("--scale", type=float, default=1.0, help="input size")
+        subparser.add_argument("--repeat", type=int, default=5, help="timed runs")
+        subparser.add_argument(
+            "--filter",
+            action="append",
+            metavar="TEXT",
+            help="only scenarios with TEXT in name (can be repeated)",
+        )
+    args = parser.parse_args()
+
+    if args.command == "run":
+        return run(args)
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
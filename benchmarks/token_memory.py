@@ -0,0 +1,75 @@
+"""Compare memory used by list of tokens and by `TokenBuffer`"""
+
+import argparse
+from dataclasses import dataclass
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from benchmarks.generators import mixed
+from losos.fastscanner import FastScanner
+from losos.reporter import Reporter
+from losos.tokentype import TokenType
+
+
+@dataclass
+class DictToken:
+    """`Token` as it was before (dataclass with per-instance `__dict__`)."""
+
+    type: TokenType
+    lexeme: str
+    literal: Any | None
+    line: int
+
+
+def as_dict_tokens(source: str) -> object:
+    tokens = FastScanner(source, reporter=Reporter()).scan_tokens()
+    return [DictToken(t.type, t.lexeme, t.literal, t.line) for t in tokens]
+
+
+def as_tokens(source: str) -> object:
+    return FastScanner(source, reporter=Reporter()).scan_tokens()
+
+
+def as_buffer(source: str) -> object:
+    return FastScanner(source, reporter=Reporter()).scan_buffer()
+
+
+def measure(build: Callable[[str], object], source: str) -> tuple[int, int, float]:
+    """Return retained and peak traced memory and build time."""
+
+    gc.collect()
+    tracemalloc.start()
+    start: float = time.perf_counter()
+    result: object = build(source)
+    elapsed: float = time.perf_counter() - start
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained, peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=10, help="size in MB")
+    args = parser.parse_args()
+
+    source: str = mixed(args.size * 1024 * 1024)
+    print(f"source: {len(source):,} characters")
+
+    for name, build in (
+        ("list[DictToken]", as_dict_tokens),
+        ("list[Token]", as_tokens),
+        ("TokenBuffer", as_buffer),
+    ):
+        retained, peak, elapsed = measure(build, source)
+        print(
+            f"{name:<16} retained {retained / 2**20:9.1f} MiB"
+            f"   peak {peak / 2**20:9.1f} MiB   ({elapsed:.2f} s traced)"
+        )
+
+
+if __name__ == "__main__":
+    main()
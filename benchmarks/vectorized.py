@@ -0,0 +1,82 @@
+"""Compare `BatchEvaluator` (scalar) with `VectorEvaluator` (NumPy)"""
+
+import argparse
+import sys
+import time
+from typing import Any
+
+from losos.batch import BatchEvaluator, BatchResult
+from losos.expr import Expr
+from losos.losos import Losos
+from losos.vectorized import NUMPY, VectorEvaluator
+
+_RULE: str = "(price * quantity - discount) / quantity > limit == !flagged"
+
+
+def columns(rows: int, seed: int = 0) -> dict[str, Any]:
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    return {
+        "price": rng.uniform(1, 100, rows),
+        "quantity": rng.integers(1, 10, rows).astype(np.float64),
+        "discount": rng.uniform(0, 5, rows),
+        "limit": np.full(rows, 50.0),
+        "flagged": rng.random(rows) < 0.5,
+    }
+
+
+def check_numpy_columns(expr: Expr, rows: int) -> None:
+    """Both evaluators must give the same results for NumPy float, int and
+    bool columns (not only for lists).
+    """
+
+    import numpy as np
+
+    data: dict[str, Any] = columns(rows)
+    data["quantity"] = data["quantity"].astype(np.int64)
+    expected: BatchResult = BatchEvaluator(expr).evaluate(data)
+    result: BatchResult = VectorEvaluator(expr).evaluate(data)
+    assert not expected.errors and not result.errors
+    assert result.values == expected.values
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000]
+    )
+    args = parser.parse_args()
+
+    if not NUMPY:
+        sys.exit("NumPy is not installed")
+
+    expr: Expr | None = Losos().parse(_RULE)
+    assert expr is not None
+    check_numpy_columns(expr, 10_000)
+
+    print(f"{'rows':>10} {'scalar':>10} {'vectorized':>11} {'speedup':>8}")
+    for rows in args.sizes:
+        data: dict[str, Any] = columns(rows)
+        # Scalar path gets plain lists, as it would in practice.
+        lists: dict[str, list[Any]] = {name: data[name].tolist() for name in data}
+
+        start: float = time.perf_counter()
+        expected: BatchResult = BatchEvaluator(expr).evaluate(lists)
+        scalar: float = time.perf_counter() - start
+
+        evaluator: VectorEvaluator = VectorEvaluator(expr)
+        start = time.perf_counter()
+        result: BatchResult = evaluator.evaluate(data)
+        vectorized: float = time.perf_counter() - start
+
+        assert result.values == expected.values
+        assert evaluator.fallback_rows == 0
+        print(
+            f"{rows:>10} {scalar:>9.3f}s {vectorized:>10.3f}s"
+            f" {scalar / vectorized:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
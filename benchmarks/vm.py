@@ -0,0 +1,81 @@
+"""Compare tree-walk `IterativeInterpreter` and bytecode `VM`"""
+
+import argparse
+import time
+
+from losos.bytecode import BytecodeCompiler
+from losos.expr import Expr
+from losos.fastscanner import FastScanner
+from losos.interpreter import Interpreter
+from losos.iterativeinterpreter import IterativeInterpreter
+from losos.iterativeparser import IterativeParser
+from losos.reporter import Reporter
+from losos.vm import VM
+
+
+def deep(depth: int) -> str:
+    """Nested groupings and unary operators: (-(1 + (-(2 + ...))))"""
+    return "(-(1 + " * depth + "1" + "))" * depth
+
+
+def wide(levels: int, leaf: int = 0) -> str:
+    """Balanced tree with 2**levels leaves."""
+    if levels == 0:
+        return str(leaf % 7 + 1)
+    operator: str = "+-*"[levels % 3]
+    half: int = 2 ** (levels - 1)
+    return f"({wide(levels - 1, leaf)} {operator} {wide(levels - 1, leaf + half)})"
+
+
+def chain(terms: int) -> str:
+    """Long flat (left-deep) arithmetic chain."""
+    return " + ".join(f"{i % 10} * 2" for i in range(terms))
+
+
+def parse(source: str) -> Expr:
+    reporter: Reporter = Reporter()
+    tokens = FastScanner(source, reporter=reporter).scan_tokens()
+    expr = IterativeParser(tokens, reporter=reporter).parse()
+    assert isinstance(expr, Expr)
+    return expr
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # Recursive `Parser` and `Interpreter` would not get through deep trees.
+    interpreter: Interpreter = IterativeInterpreter(reporter=Reporter())
+    vm: VM = VM()
+
+    for name, source in (
+        ("deep (depth 300)", deep(300)),
+        ("wide (2**14 leaves)", wide(14)),
+        ("chain (5000 terms)", chain(5000)),
+    ):
+        expr: Expr = parse(source)
+
+        start: float = time.perf_counter()
+        for _ in range(args.repeat):
+            expected = interpreter._evaluate(expr)
+        tree: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        chunk = BytecodeCompiler().compile(expr)
+        compile_time: float = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            result = vm.run(chunk)
+        bytecode: float = time.perf_counter() - start
+
+        assert result == expected
+        print(
+            f"{name:<22} tree {tree:7.3f} s   vm {bytecode:7.3f} s"
+            f" (+ {compile_time:.3f} s compile, {len(chunk.code)} bytes)"
+            f"   speedup {tree / bytecode:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
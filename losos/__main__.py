@@ -1,29 +1,218 @@
-import sys
+import argparse
+import asyncio
+import os  # cpu_count
+import sys  # version_info
+from typing import Any, NoReturn
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.diagnostics import JsonLinesSink, TextSink
+from losos.helpers import eprint
 from losos.losos import Losos
+from losos.multirun import expand_paths, run_files
+from losos.output import FramedOutput, TextOutput
+from losos.profiling import Profile
+from losos.server import Server
+
+
+class _UsageError(Exception):
+    pass
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    # Do not exit with argparse's status code 2, `main` returns 64 instead.
+    @override
+    def error(self, message: str) -> NoReturn:
+        raise _UsageError(message)
+
+
+def _non_negative(value: str) -> int:
+    number: int = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError("must not be negative")
+    return number
+
+
+def _argument_parser() -> argparse.ArgumentParser:
+    parser: argparse.ArgumentParser = _ArgumentParser(prog="losos")
+    parser.add_argument(
+        "scripts",
+        nargs="*",
+        metavar="script",
+        help="run script(s) instead of REPL, directory runs all .lox files in it",
+    )
+    parser.add_argument(
+        "-O",
+        "--optimize",
+        action="store_true",
+        help="fold constant expressions before running them",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["tree", "closure", "vm"],
+        default="tree",
+        help="tree-walk interpreter (default), compiled closures or bytecode VM",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="do not read or write cached syntax tree of the script",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="store cache in DIR instead of __lososcache__ next to the script",
+    )
+    parser.add_argument(
+        "--mmap",
+        action="store_true",
+        help="scan memory-mapped script, keep strings in the map until they are"
+        " evaluated (implies --no-cache)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=_non_negative,
+        default=1,
+        metavar="N",
+        help="run scripts in N processes (0 means number of CPUs)",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only report syntax errors of semicolon-terminated expressions",
+    )
+    parser.add_argument(
+        "--diagnostics",
+        choices=["text", "json"],
+        default="text",
+        help="report errors as text (default) or JSON lines to stderr",
+    )
+    parser.add_argument(
+        "--output",
+        choices=["text", "framed"],
+        default="text",
+        help="print results as lines of text (default) or length-prefixed"
+        " binary frames to stdout",
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=_non_negative,
+        metavar="N",
+        help="report at most N errors per script",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print time spent in each phase and other stats to stderr",
+    )
+    parser.add_argument(
+        "--profile-format",
+        choices=["table", "json"],
+        default="table",
+        help="print profile as a table (default) or JSON",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="ADDRESS",
+        help="serve evaluation of snippets on ADDRESS (host:port or Unix socket"
+        " path) instead of REPL, long ones run in N processes (see --jobs)",
+    )
+    return parser
 
 
 def main(args: list[str]) -> int:
     """Return system exit code. `args` is list of cli arguments."""
 
-    if len(args) > 2:
-        print("Usage: losos [script]")
+    parser: argparse.ArgumentParser = _argument_parser()
+    try:
+        options: argparse.Namespace = parser.parse_args(args[1:])
+    except _UsageError as e:
+        print(parser.format_usage(), end="")
+        print("losos: error:", e)
         return 64
 
-    losos: Losos = Losos()
-    if len(args) == 2:
+    losos_options: dict[str, Any] = {
+        "optimize": options.optimize,
+        "backend": options.backend,
+        "ast_cache": not options.no_cache and not options.mmap,
+        "mmap": options.mmap,
+        "cache_dir": options.cache_dir,
+        "diagnostics": JsonLinesSink() if options.diagnostics == "json" else TextSink(),
+        "max_errors": options.max_errors,
+        "output": FramedOutput() if options.output == "framed" else TextOutput(),
+        "profile": options.profile,
+    }
+    if options.serve is not None:
+        if options.scripts or options.profile or options.check:
+            print(parser.format_usage(), end="")
+            print("losos: error: --serve can't run scripts")
+            return 64
+        # Sessions report errors in responses and don't run files.
+        server: Server = Server(
+            options={"optimize": options.optimize, "backend": options.backend},
+            workers=options.jobs or os.cpu_count() or 1,
+        )
+        try:
+            asyncio.run(server.serve(options.serve))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    scripts: list[str] = expand_paths(options.scripts)
+    if options.scripts and (
+        len(scripts) != 1 or scripts != options.scripts or options.jobs != 1
+    ):
+        if options.profile or options.output == "framed":
+            print(parser.format_usage(), end="")
+            print("losos: error: --profile and --output framed need a single script")
+            return 64
+
+        # Many scripts, each run by its own `Losos` (see `run_files`).
+        jobs: int = options.jobs or os.cpu_count() or 1
+        ec, eliminated = run_files(
+            scripts,
+            jobs=min(jobs, len(scripts)),
+            options=losos_options,
+            check=options.check,
+        )
+        if options.optimize:
+            eprint("Optimizer eliminated", eliminated, "node(s).")
+        return ec
+
+    losos: Losos = Losos(**losos_options)
+    if scripts:
         # In book `runFile` will terminate program on error, but here it
         # will return system status code (or 0 on success).
-        ec: int = losos.run_file(args[1])
-        if ec != 0:
-            return ec
+        ec = (
+            losos.check_file(scripts[0])
+            if options.check
+            else losos.run_file(scripts[0])
+        )
+        if options.optimize:
+            eprint("Optimizer eliminated", losos.eliminated_nodes(), "node(s).")
     else:
+        ec = 0
         losos.run_prompt()
 
-    return 0
+    profile: Profile | None = losos.profile()
+    if profile is not None:
+        eprint(
+            profile.to_json()
+            if options.profile_format == "json"
+            else profile.format_table()
+        )
+
+    return ec
 
 
-try:
-    sys.exit(main(sys.argv))
+# Guarded, as worker processes of `run_files` may import this module.
+if __name__ == "__main__":
+    try:
+        sys.exit(main(sys.argv))
 
-except Exception as e:
-    raise
+    except Exception as e:
+        raise
@@ -0,0 +1,180 @@
+from hashlib import blake2b
+import marshal
+import mmap
+import os
+import struct
+import sys  # implementation
+from typing import Any, Final
+
+from losos.expr import *
+from losos.token import Token
+from losos.tokentype import TokenType
+from losos.version import __version__
+
+# Node tags in serialized form.
+_BINARY: Final[int] = 0
+_GROUPING: Final[int] = 1
+_LITERAL: Final[int] = 2
+_UNARY: Final[int] = 3
+_VARIABLE: Final[int] = 4
+
+_TOKEN_TYPES: Final[dict[int, TokenType]] = {type.value: type for type in TokenType}
+
+_MAGIC: Final[bytes] = b"LOSC"
+# Cache is valid only for the same Losos version and Python's marshal format.
+_TAG: Final[bytes] = f"{__version__}/{sys.implementation.cache_tag}".encode()
+# magic, tag, source mtime (ns), source size, source hash
+_HEADER: Final[struct.Struct] = struct.Struct("<4s32sqq16s")
+
+
+def dump_expr(expr: Expr) -> bytes:
+    """Serialize expression tree (without recursion, so depth is unlimited)."""
+
+    # Nodes are emitted in reversed postorder (node, right, left), so after
+    # reversing them every node follows its operands.
+    nodes: list[tuple[Any, ...]] = []
+    work: list[Expr] = [expr]
+
+    while work:
+        node: Expr = work.pop()
+        if type(node) is BinaryExpr:
+            operator: Token = node.operator
+            nodes.append((_BINARY, operator.type.value, operator.lexeme, operator.line))
+            work.append(node.left)
+            work.append(node.right)
+        elif type(node) is GroupingExpr:
+            nodes.append((_GROUPING,))
+            work.append(node.expression)
+        elif type(node) is LiteralExpr:
+            nodes.append((_LITERAL, node.value))
+        elif type(node) is UnaryExpr:
+            operator = node.operator
+            nodes.append((_UNARY, operator.type.value, operator.lexeme, operator.line))
+            work.append(node.right)
+        elif type(node) is VariableExpr:
+            nodes.append((_VARIABLE, node.name.lexeme, node.name.line))
+        else:
+            raise TypeError(f"Cannot serialize {type(node).__name__}")
+
+    nodes.reverse()
+    return marshal.dumps(nodes)
+
+
+def load_expr(data: bytes | memoryview) -> Expr:
+    """Deserialize expression tree created by `dump_expr`."""
+
+    stack: list[Expr] = []
+    types: dict[int, TokenType] = _TOKEN_TYPES
+
+    for node in marshal.loads(data):
+        tag: int = node[0]
+        if tag == _LITERAL:
+            stack.append(LiteralExpr(node[1]))
+        elif tag == _BINARY:
+            right: Expr = stack.pop()
+            operator: Token = Token(types[node[1]], node[2], None, node[3])
+            stack[-1] = BinaryExpr(stack[-1], operator, right)
+        elif tag == _UNARY:
+            operator = Token(types[node[1]], node[2], None, node[3])
+            stack[-1] = UnaryExpr(operator, stack[-1])
+        elif tag == _VARIABLE:
+            stack.append(
+                VariableExpr(Token(TokenType.IDENTIFIER, node[1], None, node[2]))
+            )
+        elif tag == _GROUPING:
+            stack[-1] = GroupingExpr(stack[-1])
+        else:
+            raise ValueError(f"Unknown node tag: {tag}")
+
+    if len(stack) != 1:
+        raise ValueError("Malformed expression data")
+
+    return stack[0]
+
+
+class AstCache:
+    """Persistent cache of parsed scripts (like Python's `__pycache__`).
+
+    Cache file holds serialized syntax tree and is valid only if source file
+    still has the same modification time, size and content hash, and it was
+    written by the same Losos version. Stale or broken cache files are simply
+    ignored (and overwritten by `store`).
+    """
+
+    def __init__(self, directory: str | None = None) -> None:
+        # None: `__lososcache__` directory next to the script
+        self._directory: Final[str | None] = directory
+
+    def path(self, source_path: str) -> str:
+        """Return path of cache file for script at `source_path`."""
+
+        source_path = os.path.abspath(source_path)
+        name: str = os.path.basename(source_path)
+        if self._directory is None:
+            directory: str = os.path.join(
+                os.path.dirname(source_path), "__lososcache__"
+            )
+            return os.path.join(directory, name + ".losc")
+
+        # Scripts from different directories share the cache directory.
+        digest: str = blake2b(source_path.encode(), digest_size=8).hexdigest()
+        return os.path.join(self._directory, f"{name}-{digest}.losc")
+
+    def load(self, source_path: str) -> Expr | None:
+        """Return cached tree of the script, or None if cache is not valid."""
+
+        try:
+            stat: os.stat_result = os.stat(source_path)
+            with open(self.path(source_path), "rb") as f:
+                if os.fstat(f.fileno()).st_size <= _HEADER.size:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    magic, tag, mtime, size, digest = _HEADER.unpack_from(data)
+                    if (
+                        magic != _MAGIC
+                        or tag.rstrip(b"\0") != _TAG
+                        or mtime != stat.st_mtime_ns
+                        or size != stat.st_size
+                        or digest != _hash_file(source_path)
+                    ):
+                        return None
+                    with memoryview(data)[_HEADER.size :] as payload:
+                        return load_expr(payload)
+        except (OSError, ValueError, EOFError, TypeError, LookupError) as e:
+            # Missing, unreadable or corrupted cache file.
+            return None
+
+    def store(self, source_path: str, stat: os.stat_result, expr: Expr) -> None:
+        """Write cache of the script, `stat` is taken before it was read."""
+
+        try:
+            digest: bytes = _hash_file(source_path)
+            # Do not cache if the script changed while it was being parsed.
+            current: os.stat_result = os.stat(source_path)
+            if (current.st_mtime_ns, current.st_size) != (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                return
+
+            header: bytes = _HEADER.pack(
+                _MAGIC, _TAG, stat.st_mtime_ns, stat.st_size, digest
+            )
+            path: str = self.path(source_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary: str = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as f:
+                f.write(header)
+                f.write(dump_expr(expr))
+            os.replace(temporary, path)
+        except OSError as e:
+            # Cache is optional (e.g. read-only directory).
+            pass
+
+
+def _hash_file(path: str) -> bytes:
+    hash = blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            hash.update(chunk)
+    return hash.digest()
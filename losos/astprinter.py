@@ -30,6 +30,10 @@ class AstPrinter(ExprVisitor[str]):
     def visit_unary_expr(self, expr: UnaryExpr) -> str:
         return self._parenthesize(expr.operator.lexeme, expr.right)
 
+    @override
+    def visit_variable_expr(self, expr: VariableExpr) -> str:
+        return expr.name.lexeme
+
     def _parenthesize(self, name: str, *exprs: Expr) -> str:
         parts: list[str] = []
         parts.append("(")
@@ -42,3 +46,41 @@ class AstPrinter(ExprVisitor[str]):
         parts.append(")")
 
         return "".join(parts)
+
+
+class IterativeAstPrinter(AstPrinter):
+    """AstPrinter which does not recurse, so it can print very deep trees."""
+
+    @override
+    def print(self, expr: Expr) -> str:
+        parts: list[str] = []
+        # Expression to print or already printed text (closing parenthesis).
+        work: list[Expr | str] = [expr]
+
+        while work:
+            node: Expr | str = work.pop()
+
+            if type(node) is str:
+                parts.append(node)
+
+            elif type(node) is BinaryExpr:
+                parts.append("(" + node.operator.lexeme + " ")
+                work.append(")")
+                work.append(node.right)
+                work.append(" ")
+                work.append(node.left)
+
+            elif type(node) is GroupingExpr:
+                parts.append("(group ")
+                work.append(")")
+                work.append(node.expression)
+
+            elif type(node) is UnaryExpr:
+                parts.append("(" + node.operator.lexeme + " ")
+                work.append(")")
+                work.append(node.right)
+
+            elif isinstance(node, Expr):
+                parts.append(node.accept(self))
+
+        return "".join(parts)
@@ -0,0 +1,126 @@
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from numbers import Real
+from typing import Any, Final
+
+from losos.closures import Closure, ClosureCompiler
+from losos.environment import Environment
+from losos.expr import Expr
+from losos.runtimeerror import LososRuntimeError
+
+
+@dataclass(slots=True)
+class BatchResult:
+    # Value for every row, None (nil) for rows which failed.
+    values: list[Any] = field(default_factory=list)
+    # Runtime error of every failed row, by row index.
+    errors: dict[int, LososRuntimeError] = field(default_factory=dict)
+
+
+class BatchEvaluator:
+    """Evaluate one expression for many rows of variable bindings.
+
+    Expression is compiled once (see `ClosureCompiler`) and then run for
+    every row, with variables bound to the row's values. Runtime errors do
+    not stop the batch, they are collected per row instead of printed.
+
+    Results are the same as `Interpreter`'s for the same bindings. Integers
+    and NumPy numbers are converted to floats, as Losos has only one number
+    type, and other NumPy scalars (e.g. `numpy.bool_`) to Python values.
+    """
+
+    def __init__(self, expr: Expr) -> None:
+        self._environment: Final[Environment] = Environment()
+        self._program: Final[Closure] = ClosureCompiler(
+            environment=self._environment
+        ).compile(expr)
+
+    def evaluate(
+        self, columns: Mapping[str, Sequence[Any]], *, rows: int | None = None
+    ) -> BatchResult:
+        """Evaluate expression for every row of `columns`.
+
+        `columns` maps variable name to its values, all of the same length.
+        `rows` is needed only if there are no columns at all.
+        """
+
+        lengths: set[int] = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        if lengths:
+            (count,) = lengths
+            if rows is not None and rows != count:
+                raise ValueError(f"Expected {rows} rows, columns have {count}")
+        elif rows is None:
+            raise ValueError("Number of rows is needed if there are no columns")
+        else:
+            count = rows
+
+        result: BatchResult = BatchResult()
+        values: list[Any] = result.values
+        errors: dict[int, LososRuntimeError] = result.errors
+        append = values.append
+        program: Closure = self._program
+        bindings: dict[str, Any] = self._environment.values
+        bindings.clear()
+
+        if not columns:
+            for row in range(count):
+                try:
+                    append(program())
+                except LososRuntimeError as error:
+                    append(None)
+                    errors[row] = error
+            return result
+
+        names: list[str] = list(columns)
+        data: list[Sequence[Any]] = [_losos_values(columns[name]) for name in names]
+        for row, record in enumerate(zip(*data)):
+            bindings.update(zip(names, record))
+            try:
+                append(program())
+            except LososRuntimeError as error:
+                append(None)
+                errors[row] = error
+
+        return result
+
+
+# Types of Losos values, columns made only of them are used as they are.
+_LOSOS_TYPES: Final[frozenset[type]] = frozenset({float, str, bool, type(None)})
+
+
+def _losos_values(column: Sequence[Any]) -> Sequence[Any]:
+    conversions: dict[type, Callable[[Any], Any]] = {
+        kind: _conversion(kind)
+        for kind in set(map(type, column))
+        if kind not in _LOSOS_TYPES
+    }
+    if conversions:
+        return [
+            value if type(value) in _LOSOS_TYPES else conversions[type(value)](value)
+            for value in column
+        ]
+    return column
+
+
+def _conversion(kind: type) -> Callable[[Any], Any]:
+    """Return function converting values of type `kind` to Losos values."""
+
+    if issubclass(kind, Real):
+        # Ints and NumPy numbers (Python's bool is in `_LOSOS_TYPES`).
+        return float
+    if issubclass(kind, str):
+        return str
+    if hasattr(kind, "item"):
+        # Other NumPy scalars (`numpy.bool_` is not a number).
+        return _item
+    return _unchanged
+
+
+def _item(value: Any) -> Any:
+    return value.item()
+
+
+def _unchanged(value: Any) -> Any:
+    return value
@@ -0,0 +1,187 @@
+from array import array
+from bisect import bisect_right
+from enum import IntEnum
+import sys  # version_info
+from typing import Any, Final
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.expr import *
+from losos.tokentype import TokenType
+
+
+class OpCode(IntEnum):
+    CONSTANT = 0  # Operand: 1 byte constant index
+    CONSTANT_LONG = 1  # Operand: 3 bytes constant index (little endian)
+    NIL = 2
+    TRUE = 3
+    FALSE = 4
+    EQUAL = 5
+    NOT_EQUAL = 6
+    GREATER = 7
+    GREATER_EQUAL = 8
+    LESS = 9
+    LESS_EQUAL = 10
+    ADD = 11
+    SUBTRACT = 12
+    MULTIPLY = 13
+    DIVIDE = 14
+    NOT = 15
+    NEGATE = 16
+    RETURN = 17
+    GET_VARIABLE = 18  # Operand: 3 bytes constant index of variable name
+
+
+# Operator token of every instruction which may fail at runtime, used to
+# rebuild the token for `LososRuntimeError`.
+OPERATORS: Final[dict[OpCode, tuple[TokenType, str]]] = {
+    OpCode.GREATER: (TokenType.GREATER, ">"),
+    OpCode.GREATER_EQUAL: (TokenType.GREATER_EQUAL, ">="),
+    OpCode.LESS: (TokenType.LESS, "<"),
+    OpCode.LESS_EQUAL: (TokenType.LESS_EQUAL, "<="),
+    OpCode.ADD: (TokenType.PLUS, "+"),
+    OpCode.SUBTRACT: (TokenType.MINUS, "-"),
+    OpCode.MULTIPLY: (TokenType.STAR, "*"),
+    OpCode.DIVIDE: (TokenType.SLASH, "/"),
+    OpCode.NEGATE: (TokenType.MINUS, "-"),
+}
+
+_BINARY: Final[dict[TokenType, OpCode]] = {
+    TokenType.BANG_EQUAL: OpCode.NOT_EQUAL,
+    TokenType.EQUAL_EQUAL: OpCode.EQUAL,
+    TokenType.GREATER: OpCode.GREATER,
+    TokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+    TokenType.LESS: OpCode.LESS,
+    TokenType.LESS_EQUAL: OpCode.LESS_EQUAL,
+    TokenType.MINUS: OpCode.SUBTRACT,
+    TokenType.PLUS: OpCode.ADD,
+    TokenType.SLASH: OpCode.DIVIDE,
+    TokenType.STAR: OpCode.MULTIPLY,
+}
+
+
+class Chunk:
+    """Compiled bytecode: instructions, constant pool and line table."""
+
+    def __init__(self) -> None:
+        self.code: Final[array[int]] = array("B")
+        self.constants: Final[list[Any]] = []
+        # Run-length encoded line table: instruction at `offset` comes from
+        # `_lines[i]`, where `_line_offsets[i]` is the last offset <= `offset`.
+        self._line_offsets: Final[array[int]] = array("I")
+        self._lines: Final[array[int]] = array("I")
+        self._constant_indexes: Final[dict[tuple[type, Any], int]] = {}
+
+    def write(self, op: OpCode, line: int | None = None) -> None:
+        """Append instruction. `line` is needed only if it may fail."""
+        if line is not None and (not self._lines or self._lines[-1] != line):
+            self._line_offsets.append(len(self.code))
+            self._lines.append(line)
+        self.code.append(op)
+
+    def write_constant(self, value: Any) -> None:
+        index: int = self._constant_index(value)
+        if index < 256:
+            self.code.append(OpCode.CONSTANT)
+            self.code.append(index)
+        else:
+            self.code.append(OpCode.CONSTANT_LONG)
+            self.code.extend(index.to_bytes(3, "little"))
+
+    def write_variable(self, name: str, line: int) -> None:
+        """Append instruction reading variable `name` (which may fail)."""
+        index: int = self._constant_index(name)
+        self.write(OpCode.GET_VARIABLE, line)
+        self.code.extend(index.to_bytes(3, "little"))
+
+    def _constant_index(self, value: Any) -> int:
+        # Floats are keyed by exact representation to keep -0.0 and 0.0 apart.
+        key: tuple[type, Any] = (
+            type(value),
+            value.hex() if type(value) is float else value,
+        )
+        index: int | None = self._constant_indexes.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constants.append(value)
+            self._constant_indexes[key] = index
+        return index
+
+    def line(self, offset: int) -> int:
+        """Return source line of instruction at `offset`."""
+        return self._lines[bisect_right(self._line_offsets, offset) - 1]
+
+
+class BytecodeCompiler(ExprVisitor[None]):
+    def __init__(self) -> None:
+        self._chunk: Chunk = Chunk()
+
+    def compile(self, expr: Expr) -> Chunk:
+        self._chunk = Chunk()
+        self._compile(expr)
+        self._chunk.write(OpCode.RETURN)
+        return self._chunk
+
+    def _compile(self, expr: Expr) -> None:
+        """Emit instructions of `expr` (without recursion, so depth is
+        unlimited).
+        """
+
+        # Postorder: operator is emitted when its operands are (`True`).
+        work: list[tuple[Expr, bool]] = [(expr, False)]
+
+        while work:
+            node, visited = work.pop()
+            if isinstance(node, BinaryExpr):
+                if visited:
+                    self._chunk.write(_BINARY[node.operator.type], node.operator.line)
+                else:
+                    work.append((node, True))
+                    work.append((node.right, False))
+                    work.append((node.left, False))
+            elif isinstance(node, GroupingExpr):
+                work.append((node.expression, False))
+            elif isinstance(node, UnaryExpr):
+                if visited:
+                    self._unary(node)
+                else:
+                    work.append((node, True))
+                    work.append((node.right, False))
+            else:
+                node.accept(self)
+
+    @override
+    def visit_binary_expr(self, expr: BinaryExpr) -> None:
+        self._compile(expr)
+
+    @override
+    def visit_grouping_expr(self, expr: GroupingExpr) -> None:
+        self._compile(expr.expression)
+
+    @override
+    def visit_literal_expr(self, expr: LiteralExpr) -> None:
+        if expr.value is None:
+            self._chunk.write(OpCode.NIL)
+        elif expr.value is True:
+            self._chunk.write(OpCode.TRUE)
+        elif expr.value is False:
+            self._chunk.write(OpCode.FALSE)
+        else:
+            self._chunk.write_constant(expr.value)
+
+    @override
+    def visit_variable_expr(self, expr: VariableExpr) -> None:
+        self._chunk.write_variable(expr.name.lexeme, expr.name.line)
+
+    @override
+    def visit_unary_expr(self, expr: UnaryExpr) -> None:
+        self._compile(expr)
+
+    def _unary(self, expr: UnaryExpr) -> None:
+        if expr.operator.type == TokenType.BANG:
+            self._chunk.write(OpCode.NOT)
+        else:
+            self._chunk.write(OpCode.NEGATE, expr.operator.line)
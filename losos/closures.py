@@ -0,0 +1,313 @@
+from collections.abc import Callable
+import sys  # version_info
+from typing import Any, Final
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.environment import Environment
+from losos.expr import *
+from losos.runtimeerror import LososRuntimeError
+from losos.token import Token
+from losos.tokentype import TokenType
+
+# Compiled expression: call it to evaluate the expression.
+Closure = Callable[[], Any]
+
+# Closures nest (and call each other) as deep as the tree, up to this depth.
+_MAX_DEPTH: Final[int] = 256
+
+
+class ClosureCompiler(ExprVisitor[Closure]):
+    """Compile expression tree into nested Python closures.
+
+    Operators are resolved once, at compile time, so evaluating the result
+    skips `accept`/`visit_*` dispatch and operator checks of `Interpreter`.
+    Results (and runtime errors) are exactly the same as `Interpreter`'s.
+
+    Trees are compiled with explicit stack. Calling a closure calls its
+    operands, so nodes deeper than `_MAX_DEPTH` are compiled into a flat
+    program instead, which applies them to values on a stack, and deep
+    trees do not hit Python's recursion limit.
+    """
+
+    def __init__(self, *, environment: Environment | None = None) -> None:
+        # Compiled variables read the environment when they are evaluated,
+        # so the same closure can be run for different bindings.
+        self._environment: Final[Environment] = (
+            Environment() if environment is None else environment
+        )
+
+    def compile(self, expr: Expr) -> Closure:
+        # Operands of nodes in the program, right one on top.
+        stack: list[Any] = []
+        pop = stack.pop
+
+        def pop_left() -> Any:
+            return pop(-2)
+
+        # Program in postorder: closures of nodes too deep to nest and of
+        # their operands which are not, None for closures called by their
+        # parent instead.
+        steps: list[Closure | None] = []
+        # Compiled operands: closure (None if too deep), depth and its step.
+        compiled: list[tuple[Closure | None, int, int]] = []
+        # Nodes to compile, `True` if their operands are compiled already.
+        work: list[tuple[Expr, bool]] = [(expr, False)]
+
+        while work:
+            node, ready = work.pop()
+            closure: Closure | None
+            step: Closure
+            depth: int
+
+            if isinstance(node, GroupingExpr):
+                work.append((node.expression, False))
+                continue
+
+            if isinstance(node, BinaryExpr):
+                if not ready:
+                    work.append((node, True))
+                    work.append((node.right, False))
+                    work.append((node.left, False))
+                    continue
+                right, right_depth, right_step = compiled.pop()
+                left, left_depth, left_step = compiled.pop()
+                depth = max(left_depth, right_depth) + 1
+                make: Callable[[Closure, Closure, Token], Closure] = _BINARY[
+                    node.operator.type
+                ]
+                if left is None or right is None or depth > _MAX_DEPTH:
+                    closure = None
+                    step = make(pop_left, pop, node.operator)
+                else:
+                    steps[left_step] = steps[right_step] = None
+                    closure = step = make(left, right, node.operator)
+
+            elif isinstance(node, UnaryExpr):
+                if not ready:
+                    work.append((node, True))
+                    work.append((node.right, False))
+                    continue
+                operand, depth, operand_step = compiled.pop()
+                depth += 1
+                if operand is None or depth > _MAX_DEPTH:
+                    closure = None
+                    step = self._unary(node.operator, pop)
+                else:
+                    steps[operand_step] = None
+                    closure = step = self._unary(node.operator, operand)
+
+            else:
+                closure = step = node.accept(self)
+                depth = 1
+
+            compiled.append((closure, depth, len(steps)))
+            steps.append(step)
+
+        root: Closure | None = compiled[-1][0]
+        if root is not None:
+            return root
+
+        program: list[Closure] = [step for step in steps if step is not None]
+        push = stack.append
+
+        def run() -> Any:
+            # Left behind if the last run failed.
+            stack.clear()
+            for step in program:
+                push(step())
+            return pop()
+
+        return run
+
+    @override
+    def visit_binary_expr(self, expr: BinaryExpr) -> Closure:
+        return self.compile(expr)
+
+    @override
+    def visit_grouping_expr(self, expr: GroupingExpr) -> Closure:
+        return self.compile(expr.expression)
+
+    @override
+    def visit_literal_expr(self, expr: LiteralExpr) -> Closure:
+        value: Any = expr.value
+        return lambda: value
+
+    @override
+    def visit_variable_expr(self, expr: VariableExpr) -> Closure:
+        values: dict[str, Any] = self._environment.values
+        name: Token = expr.name
+        lexeme: str = name.lexeme
+
+        # Same as `Environment.get`, without the method call.
+        def variable() -> Any:
+            if lexeme in values:
+                return values[lexeme]
+            raise LososRuntimeError(name, "Undefined variable '" + lexeme + "'.")
+
+        return variable
+
+    @override
+    def visit_unary_expr(self, expr: UnaryExpr) -> Closure:
+        return self.compile(expr)
+
+    def _unary(self, operator: Token, right: Closure) -> Closure:
+        if operator.type == TokenType.BANG:
+
+            def bang() -> Any:
+                value: Any = right()
+                if value is None:
+                    return True
+                if type(value) is bool:
+                    return not value
+                return False
+
+            return bang
+
+        # TokenType.MINUS
+        def negate() -> Any:
+            value: Any = right()
+            if type(value) is float:
+                return -value
+            raise LososRuntimeError(operator, "Operand must be a number.")
+
+        return negate
+
+
+def _numbers_error(operator: Token) -> LososRuntimeError:
+    return LososRuntimeError(operator, "Operands must be numbers.")
+
+
+def _greater(left: Closure, right: Closure, operator: Token) -> Closure:
+    def greater() -> Any:
+        a: Any = left()
+        b: Any = right()
+        if type(a) is float and type(b) is float:
+            return a > b
+        raise _numbers_error(operator)
+
+    return greater
+
+
+def _greater_equal(left: Closure, right: Closure, operator: Token) -> Closure:
+    def greater_equal() -> Any:
+        a: Any = left()
+        b: Any = right()
+        if type(a) is float and type(b) is float:
+            return a >= b
+        raise _numbers_error(operator)
+
+    return greater_equal
+
+
+def _less(left: Closure, right: Closure, operator: Token) -> Closure:
+    def less() -> Any:
+        a: Any = left()
+        b: Any = right()
+        if type(a) is float and type(b) is float:
+            return a < b
+        raise _numbers_error(operator)
+
+    return less
+
+
+def _less_equal(left: Closure, right: Closure, operator: Token) -> Closure:
+    def less_equal() -> Any:
+        a: Any = left()
+        b: Any = right()
+        if type(a) is float and type(b) is float:
+            return a <= b
+        raise _numbers_error(operator)
+
+    return less_equal
+
+
+def _subtract(left: Closure, right: Closure, operator: Token) -> Closure:
+    def subtract() -> Any:
+        a: Any = left()
+        b: Any = right()
+        if type(a) is float and type(b) is float:
+            return a - b
+        raise _numbers_error(operator)
+
+    return subtract
+
+
+def _add(left: Closure, right: Closure, operator: Token) -> Closure:
+    def add() -> Any:
+        a: Any = left()
+        b: Any = right()
+        if type(a) is float and type(b) is float:
+            return a + b
+        if type(a) is str and type(b) is str:
+            return a + b
+        raise LososRuntimeError(
+            operator, "Operands must be two numbers or two strings."
+        )
+
+    return add
+
+
+def _divide(left: Closure, right: Closure, operator: Token) -> Closure:
+    def divide() -> Any:
+        a: Any = left()
+        b: Any = right()
+        if type(a) is float and type(b) is float:
+            # Same as `Interpreter._check_divisor`.
+            if b == 0.0:
+                raise LososRuntimeError(operator, "Division by zero.")
+            return a / b
+        raise _numbers_error(operator)
+
+    return divide
+
+
+def _multiply(left: Closure, right: Closure, operator: Token) -> Closure:
+    def multiply() -> Any:
+        a: Any = left()
+        b: Any = right()
+        if type(a) is float and type(b) is float:
+            return a * b
+        raise _numbers_error(operator)
+
+    return multiply
+
+
+# Same as `Interpreter._is_equal`.
+def _not_equal(left: Closure, right: Closure, operator: Token) -> Closure:
+    def not_equal() -> Any:
+        a: Any = left()
+        b: Any = right()
+        if a is None:
+            return b is not None
+        return not bool(a == b)
+
+    return not_equal
+
+
+def _equal(left: Closure, right: Closure, operator: Token) -> Closure:
+    def equal() -> Any:
+        a: Any = left()
+        b: Any = right()
+        if a is None:
+            return b is None
+        return bool(a == b)
+
+    return equal
+
+
+_BINARY: Final[dict[TokenType, Callable[[Closure, Closure, Token], Closure]]] = {
+    TokenType.GREATER: _greater,
+    TokenType.GREATER_EQUAL: _greater_equal,
+    TokenType.LESS: _less,
+    TokenType.LESS_EQUAL: _less_equal,
+    TokenType.MINUS: _subtract,
+    TokenType.PLUS: _add,
+    TokenType.SLASH: _divide,
+    TokenType.STAR: _multiply,
+    TokenType.BANG_EQUAL: _not_equal,
+    TokenType.EQUAL_EQUAL: _equal,
+}
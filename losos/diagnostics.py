@@ -0,0 +1,123 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from enum import Enum
+import json
+import sys  # stderr, version_info
+from typing import Any, Final, TextIO
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+class DiagnosticKind(Enum):
+    SYNTAX = "syntax"  # Reported by scanner or parser
+    RUNTIME = "runtime"  # Reported by interpreter
+
+
+@dataclass(frozen=True, slots=True)
+class Diagnostic:
+    kind: DiagnosticKind
+    line: int
+    # Where the error is, like " at 'x'" or " at end" (empty if unknown).
+    where: str
+    message: str
+
+    def format(self) -> str:
+        """Return text of the diagnostic, as printed by the book's `Lox`."""
+        if self.kind is DiagnosticKind.RUNTIME:
+            return f"{self.message}\n[line {self.line}]"
+        return f"[line {self.line}] Error{self.where}: {self.message}"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the diagnostic as JSON object."""
+        return {
+            "kind": self.kind.value,
+            "line": self.line,
+            "where": self.where,
+            "message": self.message,
+        }
+
+
+class DiagnosticSink(ABC):
+    """Destination of diagnostics reported by `Reporter`."""
+
+    @abstractmethod
+    def emit(self, diagnostic: Diagnostic) -> None:
+        pass
+
+    def suppressed(self, count: int) -> None:
+        """`count` more diagnostics were dropped (see `Reporter` cap)."""
+
+    def flush(self) -> None:
+        """Write out buffered diagnostics, if any."""
+
+
+class _BufferedSink(DiagnosticSink):
+    """Sink writing lines of text, buffered and written out in batches."""
+
+    def __init__(
+        self, stream: TextIO | None = None, *, buffer_size: int = 65536
+    ) -> None:
+        # None: `sys.stderr` at the time of flush (so it can be redirected).
+        self._stream: Final[TextIO | None] = stream
+        self._buffer_size: Final[int] = buffer_size
+        self._lines: Final[list[str]] = []
+        self._buffered: int = 0
+
+    def _write(self, line: str) -> None:
+        self._lines.append(line)
+        self._buffered += len(line)
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+    @override
+    def flush(self) -> None:
+        if not self._lines:
+            return
+        stream: TextIO = sys.stderr if self._stream is None else self._stream
+        stream.write("\n".join(self._lines) + "\n")
+        stream.flush()
+        self._lines.clear()
+        self._buffered = 0
+
+
+class TextSink(_BufferedSink):
+    """Human readable diagnostics, in the same format as the book's."""
+
+    @override
+    def emit(self, diagnostic: Diagnostic) -> None:
+        self._write(diagnostic.format())
+
+    @override
+    def suppressed(self, count: int) -> None:
+        self._write(f"[{count} more error(s) not reported]")
+
+
+class JsonLinesSink(_BufferedSink):
+    """One JSON object per diagnostic, for tools."""
+
+    @override
+    def emit(self, diagnostic: Diagnostic) -> None:
+        self._write(json.dumps(diagnostic.as_dict()))
+
+    @override
+    def suppressed(self, count: int) -> None:
+        self._write(json.dumps({"kind": "suppressed", "count": count}))
+
+
+class MemorySink(DiagnosticSink):
+    """Keep diagnostics in memory, for callers which inspect them."""
+
+    def __init__(self) -> None:
+        self.diagnostics: Final[list[Diagnostic]] = []
+        self.suppressed_count: int = 0
+
+    @override
+    def emit(self, diagnostic: Diagnostic) -> None:
+        self.diagnostics.append(diagnostic)
+
+    @override
+    def suppressed(self, count: int) -> None:
+        self.suppressed_count += count
@@ -0,0 +1,19 @@
+from typing import Any, Final
+
+from losos.runtimeerror import LososRuntimeError
+from losos.token import Token
+
+
+class Environment:
+    def __init__(self, values: dict[str, Any] | None = None) -> None:
+        # Public, so hot loops (`VM`, batch evaluation) can use it directly.
+        self.values: Final[dict[str, Any]] = {} if values is None else values
+
+    def get(self, name: Token) -> Any:
+        if name.lexeme in self.values:
+            return self.values[name.lexeme]
+
+        raise LososRuntimeError(name, "Undefined variable '" + name.lexeme + "'.")
+
+    def define(self, name: str, value: Any) -> None:
+        self.values[name] = value
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 import sys  # version_info
 from typing import Final, Generic, TypeVar, Any
 
@@ -31,51 +31,69 @@ class ExprVisitor(ABC, Generic[R]):
     def visit_unary_expr(self, expr: UnaryExpr) -> R:
         pass
 
+    @abstractmethod
+    def visit_variable_expr(self, expr: VariableExpr) -> R:
+        pass
+
 
 class Expr(ABC):
+    """Node of syntax tree.
+
+    Nodes are immutable (`Final` fields) and use `__slots__`, so they are
+    small and cheap to create: parser makes one for every operand and
+    operator.
+    """
+
+    __slots__ = ()
+
     @abstractmethod
     def accept(self, visitor: ExprVisitor[R]) -> R:
         pass
 
 
-# NOTE Assigning `field` descriptor is a workaround for mypy bug, see:
-# https://github.com/python/mypy/issues/10688#issuecomment-866039452
-
-
-@dataclass
+@dataclass(slots=True)
 class BinaryExpr(Expr):
-    left: Final[Expr] = field()
-    operator: Final[Token] = field()
-    right: Final[Expr] = field()
+    left: Final[Expr]
+    operator: Final[Token]
+    right: Final[Expr]
 
     @override
     def accept(self, visitor: ExprVisitor[R]) -> R:
         return visitor.visit_binary_expr(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class GroupingExpr(Expr):
-    expression: Final[Expr] = field()
+    expression: Final[Expr]
 
     @override
     def accept(self, visitor: ExprVisitor[R]) -> R:
         return visitor.visit_grouping_expr(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class LiteralExpr(Expr):
-    value: Final[Any] = field()
+    value: Final[Any]
 
     @override
     def accept(self, visitor: ExprVisitor[R]) -> R:
         return visitor.visit_literal_expr(self)
 
 
-@dataclass
+@dataclass(slots=True)
 class UnaryExpr(Expr):
-    operator: Final[Token] = field()
-    right: Final[Expr] = field()
+    operator: Final[Token]
+    right: Final[Expr]
 
     @override
     def accept(self, visitor: ExprVisitor[R]) -> R:
         return visitor.visit_unary_expr(self)
+
+
+@dataclass(slots=True)
+class VariableExpr(Expr):
+    name: Final[Token]
+
+    @override
+    def accept(self, visitor: ExprVisitor[R]) -> R:
+        return visitor.visit_variable_expr(self)
@@ -0,0 +1,315 @@
+from collections.abc import Callable, Iterable, Iterator
+from string import ascii_letters, digits
+import sys  # version_info
+from typing import Any, Final
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.reporter import Reporter
+from losos.scanner import Scanner
+from losos.token import Token
+from losos.tokenbuffer import TokenBuffer
+from losos.tokentype import TokenType
+
+# Character classes used by the dispatch table. Anything that is not in the
+# table is an unexpected character (this includes non-ASCII letters and
+# digits, just like `Scanner._is_alpha` and `Scanner._is_digit`).
+_ERROR: Final[int] = 0
+_SINGLE: Final[int] = 1
+_PAIR: Final[int] = 2
+_SLASH: Final[int] = 3
+_WHITESPACE: Final[int] = 4
+_NEWLINE: Final[int] = 5
+_STRING: Final[int] = 6
+_DIGIT: Final[int] = 7
+_ALPHA: Final[int] = 8
+
+_SINGLE_TYPES: Final[dict[str, TokenType]] = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "-": TokenType.MINUS,
+    "+": TokenType.PLUS,
+    ";": TokenType.SEMICOLON,
+    "*": TokenType.STAR,
+}
+
+# Tokens which become another token (with given lexeme) when followed by `=`.
+_PAIR_TYPES: Final[dict[str, tuple[TokenType, TokenType, str]]] = {
+    "!": (TokenType.BANG, TokenType.BANG_EQUAL, "!="),
+    "=": (TokenType.EQUAL, TokenType.EQUAL_EQUAL, "=="),
+    "<": (TokenType.LESS, TokenType.LESS_EQUAL, "<="),
+    ">": (TokenType.GREATER, TokenType.GREATER_EQUAL, ">="),
+}
+
+# Keywords with their lexemes, the initial content of `FastScanner._names`.
+_KEYWORDS: Final[dict[str, tuple[TokenType, str]]] = {
+    text: (type, text) for text, type in Scanner._keywords.items()
+}
+
+# Maximum number of distinct identifiers and numbers interned by a scanner,
+# so source full of unique ones does not grow its tables without bound.
+# Only common numbers repeat, unlike names, so their table is smaller.
+_NAMES_LIMIT: Final[int] = 1 << 16
+_NUMBERS_LIMIT: Final[int] = 1 << 12
+
+_DISPATCH: Final[dict[str, int]] = {
+    **dict.fromkeys(_SINGLE_TYPES, _SINGLE),
+    **dict.fromkeys(_PAIR_TYPES, _PAIR),
+    "/": _SLASH,
+    " ": _WHITESPACE,
+    "\r": _WHITESPACE,
+    "\t": _WHITESPACE,
+    "\n": _NEWLINE,
+    '"': _STRING,
+    **dict.fromkeys(digits, _DIGIT),
+    **dict.fromkeys(ascii_letters, _ALPHA),
+}
+
+_DIGITS: Final[frozenset[str]] = frozenset(digits)
+_ALPHANUMERICS: Final[frozenset[str]] = frozenset(ascii_letters + digits)
+_WHITESPACES: Final[frozenset[str]] = frozenset(" \r\t")
+
+
+class FastScanner(Scanner):
+    """Table-driven scanner.
+
+    Produces exactly the same tokens and errors as `Scanner` (which is kept
+    as the reference implementation), but looks up every character in a
+    precomputed dispatch table and consumes whole runs of digits, identifier
+    characters, whitespace, comments and strings at once instead of calling
+    `_advance` for every single character.
+
+    Lexemes are interned: all tokens with the same operator, keyword,
+    identifier or number share one string (and one float), instead of each
+    holding its own copy.
+    """
+
+    def __init__(
+        self,
+        source: str | Iterable[str],
+        *,
+        reporter: Reporter,
+        chunk_size: int = 65536,
+    ) -> None:
+        super().__init__(source, reporter=reporter, chunk_size=chunk_size)
+        # Identifiers and keywords: (type, lexeme). One lookup tells if it's
+        # a keyword and gives the shared lexeme.
+        self._names: Final[dict[str, tuple[TokenType, str]]] = dict(_KEYWORDS)
+        # Numbers: (lexeme, value).
+        self._numbers: Final[dict[str, tuple[str, float]]] = {}
+
+    @override
+    def scan_tokens(self) -> list[Token]:
+        final: bool = self._chunks is None
+        while True:
+            self._scan(final)
+            if final:
+                break
+            final = not self._fill()
+
+        self._tokens.append(Token(TokenType.EOF, "", None, self._line))
+
+        return self._tokens
+
+    @override
+    def iter_tokens(self) -> Iterator[Token]:
+        tokens: list[Token] = self._tokens
+        final: bool = self._chunks is None
+        while True:
+            self._scan(final)
+            if tokens:
+                yield from tokens
+                tokens.clear()
+            if final:
+                break
+            final = not self._fill()
+
+        yield Token(TokenType.EOF, "", None, self._line)
+
+    def scan_buffer(self) -> TokenBuffer:
+        """Like `scan_tokens`, but return compact `TokenBuffer` which refers
+        to the source instead of holding copies of lexemes.
+        """
+
+        if self._chunks is not None:
+            raise ValueError("TokenBuffer needs the whole source as a string")
+
+        buffer: TokenBuffer = TokenBuffer(self._source)
+        self._scan(True, buffer)
+        buffer.append(TokenType.EOF, self._current, self._current, None, self._line)
+
+        return buffer
+
+    def scan_fragment(
+        self, line: int, *, final: bool, start: int = 0, stop: int | None = None
+    ) -> tuple[TokenBuffer, int]:
+        """Scan source (or `source[start:stop]`) which is a part of a bigger
+        one, starting at `line` (see `incremental.py`). No EOF token is
+        added.
+
+        Unless `final`, the part must end with a newline and scanning stops
+        before a string which is not terminated inside it. Return tokens
+        and offset where scanning stopped.
+        """
+
+        if self._chunks is not None:
+            raise ValueError("TokenBuffer needs the whole source as a string")
+
+        self._line = line
+        self._start = self._current = start
+        buffer: TokenBuffer = TokenBuffer(self._source)
+        self._scan(final, buffer, stop)
+
+        return buffer, self._current
+
+    def _scan(
+        self, final: bool, buffer: TokenBuffer | None = None, stop: int | None = None
+    ) -> None:
+        """Scan the buffered source (up to `stop`) starting at `_current`.
+
+        Tokens are added to `_tokens`, or to `buffer` if it's given.
+
+        If more source may follow (`final` is False) stop after the last
+        complete line, as only strings can span lines. A string which is not
+        terminated inside the buffer is left for the next call.
+        """
+
+        source: str = self._source
+        length: int = len(source) if stop is None else stop
+        current: int = self._current
+        limit: int = length if final else source.rfind("\n", current, length) + 1
+        # Tokens are either created right away, with interned lexemes, or
+        # added to the buffer which keeps only their offsets.
+        tokens: bool = buffer is None
+        append: Callable[[Token], None] = self._tokens.append
+        add: Callable[[TokenType, int, int, Any, int], None]
+        if buffer is None:
+
+            def add(
+                type: TokenType, start: int, end: int, literal: Any, line: int
+            ) -> None:
+                append(Token(type, source[start:end], literal, line))
+
+        else:
+            add = buffer.append
+
+        dispatch = _DISPATCH.get
+        names: dict[str, tuple[TokenType, str]] = self._names
+        numbers: dict[str, tuple[str, float]] = self._numbers
+        text: str
+        alphanumerics = _ALPHANUMERICS
+        number_digits = _DIGITS
+        whitespaces = _WHITESPACES
+        identifier = TokenType.IDENTIFIER
+        number = TokenType.NUMBER
+        single_types = _SINGLE_TYPES
+        line: int = self._line
+
+        while current < limit:
+            c: str = source[current]
+            kind: int = dispatch(c, _ERROR)
+            start: int = current
+            current += 1
+
+            if kind == _WHITESPACE:
+                while current < length and source[current] in whitespaces:
+                    current += 1
+
+            elif kind == _ALPHA:
+                while current < length and source[current] in alphanumerics:
+                    current += 1
+                text = source[start:current]
+                name: tuple[TokenType, str] | None = names.get(text)
+                if name is None:
+                    name = (identifier, text)
+                    if len(names) < _NAMES_LIMIT:
+                        names[text] = name
+                if tokens:
+                    append(Token(name[0], name[1], None, line))
+                else:
+                    add(name[0], start, current, None, line)
+
+            elif kind == _SINGLE:
+                # One character strings are shared by Python itself.
+                if tokens:
+                    append(Token(single_types[c], c, None, line))
+                else:
+                    add(single_types[c], start, current, None, line)
+
+            elif kind == _NEWLINE:
+                line += 1
+
+            elif kind == _DIGIT:
+                while current < length and source[current] in number_digits:
+                    current += 1
+                if (
+                    current + 1 < length
+                    and source[current] == "."
+                    and source[current + 1] in number_digits
+                ):
+                    current += 2
+                    while current < length and source[current] in number_digits:
+                        current += 1
+                text = source[start:current]
+                literal: float
+                interned: tuple[str, float] | None = numbers.get(text)
+                if interned is not None:
+                    text, literal = interned
+                else:
+                    literal = float(text)
+                    if len(numbers) < _NUMBERS_LIMIT:
+                        numbers[text] = (text, literal)
+                if tokens:
+                    append(Token(number, text, literal, line))
+                else:
+                    add(number, start, current, literal, line)
+
+            elif kind == _PAIR:
+                pair: tuple[TokenType, TokenType, str] = _PAIR_TYPES[c]
+                if current < length and source[current] == "=":
+                    current += 1
+                    if tokens:
+                        append(Token(pair[1], pair[2], None, line))
+                    else:
+                        add(pair[1], start, current, None, line)
+                elif tokens:
+                    append(Token(pair[0], c, None, line))
+                else:
+                    add(pair[0], start, current, None, line)
+
+            elif kind == _SLASH:
+                if current < length and source[current] == "/":
+                    # A comment goes until the end of the line.
+                    current = source.find("\n", current, length)
+                    if current < 0:
+                        current = length
+                else:
+                    add(TokenType.SLASH, start, current, None, line)
+
+            elif kind == _STRING:
+                end: int = source.find('"', current, length)
+                if end < 0 and not final:
+                    # Wait for the rest of the string.
+                    current = start
+                    break
+                if end < 0:
+                    line += source.count("\n", current, length)
+                    current = length
+                    self._reporter.error(line, "Unterminated string.")
+                else:
+                    line += source.count("\n", current, end)
+                    current = end + 1
+                    add(TokenType.STRING, start, current, source[start + 1 : end], line)
+
+            else:
+                self._reporter.error(line, "Unexpected character.")
+
+        self._start = self._current = current
+        self._line = line
@@ -0,0 +1,240 @@
+from collections import OrderedDict
+import math
+import sys  # version_info
+from typing import Any, Final
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.environment import Environment
+from losos.expr import *
+from losos.iterativeinterpreter import IterativeInterpreter
+from losos.output import OutputSink
+from losos.reporter import Reporter
+from losos.token import Token
+
+# Node tags in keys.
+_BINARY: Final[int] = 0
+_GROUPING: Final[int] = 1
+_LITERAL: Final[int] = 2
+_UNARY: Final[int] = 3
+_VARIABLE: Final[int] = 4
+
+
+class HashConser:
+    """Deduplicate structurally identical subtrees, so trees become DAGs:
+    every distinct subtree is one node, shared by all its occurrences in
+    all trees interned by this instance.
+
+    Subtrees are identical if they behave the same, so tokens are compared
+    with their lines (reported by runtime errors) and literals with their
+    types (`1.0 == True` in Python) and signs of zero.
+
+    Canonical nodes are kept in LRU table of at most `maxsize` nodes. Trees
+    with evicted nodes stay valid, later occurrences just get new nodes.
+
+    Results of subtrees without variables, evaluated by
+    `MemoizingInterpreter`, are remembered in LRU table of at most
+    `memo_size` results.
+    """
+
+    def __init__(self, maxsize: int = 1 << 16, memo_size: int = 4096) -> None:
+        if maxsize < 1 or memo_size < 1:
+            raise ValueError("maxsize and memo_size must be positive")
+        self.maxsize: Final[int] = maxsize
+        self.hits: int = 0  # Subtrees replaced by existing node
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        self.memo_size: Final[int] = memo_size
+        self.memo_hits: int = 0
+        self.memo_misses: int = 0
+        self.memo_evictions: int = 0
+
+        # Key is made of ids of canonical children, which are alive as long
+        # as the key is in the table (they are referenced by its node).
+        self._nodes: Final[OrderedDict[tuple[Any, ...], Expr]] = OrderedDict()
+        # Ids of nodes in `_nodes` without variables.
+        self._constants: Final[set[int]] = set()
+        # Node id: node (so the id is not reused while in table) and result.
+        self._results: Final[OrderedDict[int, tuple[Expr, Any]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def intern(self, expr: Expr) -> Expr:
+        """Return canonical node of the tree (without recursion)."""
+
+        # Postorder, so children are already interned (on `done` stack).
+        done: list[Expr] = []
+        work: list[tuple[Expr, bool]] = [(expr, False)]
+
+        while work:
+            node, visited = work.pop()
+            if not visited:
+                work.append((node, True))
+                if type(node) is BinaryExpr:
+                    work.append((node.right, False))
+                    work.append((node.left, False))
+                elif type(node) is GroupingExpr:
+                    work.append((node.expression, False))
+                elif type(node) is UnaryExpr:
+                    work.append((node.right, False))
+                continue
+
+            key: tuple[Any, ...]
+            constant: bool
+            if type(node) is BinaryExpr:
+                right: Expr = done.pop()
+                left: Expr = done.pop()
+                operator: Token = node.operator
+                key = (_BINARY, operator.type, operator.line, id(left), id(right))
+                constant = id(left) in self._constants and id(right) in self._constants
+                if left is not node.left or right is not node.right:
+                    node = BinaryExpr(left, operator, right)
+            elif type(node) is GroupingExpr:
+                expression: Expr = done.pop()
+                key = (_GROUPING, id(expression))
+                constant = id(expression) in self._constants
+                if expression is not node.expression:
+                    node = GroupingExpr(expression)
+            elif type(node) is LiteralExpr:
+                value: Any = node.value
+                key = (_LITERAL, type(value), value)
+                if type(value) is float and value == 0:
+                    key += (math.copysign(1.0, value),)
+                constant = True
+            elif type(node) is UnaryExpr:
+                right = done.pop()
+                operator = node.operator
+                key = (_UNARY, operator.type, operator.line, id(right))
+                constant = id(right) in self._constants
+                if right is not node.right:
+                    node = UnaryExpr(operator, right)
+            elif type(node) is VariableExpr:
+                key = (_VARIABLE, node.name.lexeme, node.name.line)
+                constant = False
+            else:
+                # Other leaves (like `MappedLiteralExpr`) are not shared.
+                done.append(node)
+                continue
+
+            done.append(self._canonical(key, node, constant))
+
+        return done[-1]
+
+    def _canonical(self, key: tuple[Any, ...], node: Expr, constant: bool) -> Expr:
+        canonical: Expr | None = self._nodes.get(key)
+        if canonical is not None:
+            self._nodes.move_to_end(key)
+            self.hits += 1
+            return canonical
+
+        self.misses += 1
+        self._nodes[key] = node
+        if constant:
+            self._constants.add(id(node))
+        if len(self._nodes) > self.maxsize:
+            _, evicted = self._nodes.popitem(last=False)
+            self._constants.discard(id(evicted))
+            self.evictions += 1
+        return node
+
+    def clear(self) -> None:
+        self._nodes.clear()
+        self._constants.clear()
+        self._results.clear()
+
+
+class MemoizingInterpreter(IterativeInterpreter):
+    """`IterativeInterpreter` which evaluates subtrees without variables
+    (of trees interned by `conser`) only once, later it takes their results
+    from the memo of `conser`.
+
+    Subtrees with variables are always evaluated, as variables can change
+    between runs. Failed subtrees are not remembered, so runtime errors are
+    reported exactly like without memo.
+    """
+
+    def __init__(
+        self,
+        *,
+        reporter: Reporter,
+        environment: Environment | None = None,
+        output: OutputSink | None = None,
+        conser: HashConser,
+    ) -> None:
+        super().__init__(reporter=reporter, environment=environment, output=output)
+        self._conser: Final[HashConser] = conser
+
+    @override
+    def _evaluate(self, expr: Expr) -> Any:
+        conser: HashConser = self._conser
+        constants: set[int] = conser._constants
+        results: OrderedDict[int, tuple[Expr, Any]] = conser._results
+        values: list[Any] = []
+        push = values.append
+        pop = values.pop
+        # Like `IterativeInterpreter._evaluate`, but operators of constant
+        # subtrees are looked up in memo first and remembered when applied.
+        operators: list[BinaryExpr | UnaryExpr] = []
+        work: list[Expr | None] = [expr]
+
+        while work:
+            node: Expr | None = work.pop()
+
+            if node is None:
+                operator: BinaryExpr | UnaryExpr = operators.pop()
+                if type(operator) is BinaryExpr:
+                    right: Any = pop()
+                    values[-1] = self._binary(operator.operator, values[-1], right)
+                else:
+                    values[-1] = self._unary(operator.operator, values[-1])
+                if id(operator) in constants:
+                    results[id(operator)] = (operator, values[-1])
+                    if len(results) > conser.memo_size:
+                        results.popitem(last=False)
+                        conser.memo_evictions += 1
+                continue
+
+            while True:
+                if (type(node) is BinaryExpr or type(node) is UnaryExpr) and id(
+                    node
+                ) in constants:
+                    result: tuple[Expr, Any] | None = results.get(id(node))
+                    if result is not None and result[0] is node:
+                        results.move_to_end(id(node))
+                        conser.memo_hits += 1
+                        push(result[1])
+                        break
+                    conser.memo_misses += 1
+
+                if type(node) is BinaryExpr:
+                    operators.append(node)
+                    work.append(None)
+                    work.append(node.right)
+                    node = node.left
+
+                elif type(node) is LiteralExpr:
+                    push(node.value)
+                    break
+
+                elif type(node) is GroupingExpr:
+                    node = node.expression
+
+                elif type(node) is VariableExpr:
+                    push(self._environment.get(node.name))
+                    break
+
+                elif type(node) is UnaryExpr:
+                    operators.append(node)
+                    work.append(None)
+                    node = node.right
+
+                else:
+                    push(node.accept(self))
+                    break
+
+        return values[-1]
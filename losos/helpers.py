@@ -27,10 +27,9 @@ def char_at(string: str, index: int) -> Char:
 
 
 def to_float(s: str) -> float:
-    try:
-        return float(s)
-    except ValueError as e:
-        raise
-    except OverflowError as e:
-        # TODO And what now? Underlying limitation...
-        raise
+    """Return value of number literal (digits with optional fraction).
+
+    `float` accepts every such literal and does not overflow, too big ones
+    become inf.
+    """
+    return float(s)
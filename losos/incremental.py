@@ -0,0 +1,276 @@
+from bisect import bisect_left
+from dataclasses import replace
+from operator import attrgetter
+from typing import Final
+
+from losos.diagnostics import Diagnostic, MemorySink
+from losos.expr import Expr
+from losos.fastscanner import FastScanner
+from losos.iterativeparser import IterativeParser
+from losos.parser import Parser
+from losos.reporter import Reporter
+from losos.token import Token
+from losos.tokentype import TokenType
+
+_line: Final = attrgetter("line")
+
+
+class IncrementalDocument:
+    """Source made of semicolon-terminated expressions (see
+    `Parser.parse_statements`), kept scanned and parsed while it's edited.
+
+    `edit` re-scans only whole lines around the edit (more if a string
+    spanning lines was changed) and re-parses only statements made of
+    changed tokens, reusing the rest. Tokens, trees and diagnostics are
+    always the same as those of a full run of `FastScanner` and the parser.
+    """
+
+    def __init__(self, source: str, *, parser: type[Parser] = IterativeParser) -> None:
+        self._source: str = source
+        self._sink: Final[MemorySink] = MemorySink()
+        self._reporter: Final[Reporter] = Reporter(sink=self._sink)
+
+        # All tokens, EOF included.
+        self._tokens: Final[list[Token]] = []
+        self._scan_errors: list[Diagnostic] = []
+
+        # Statements: index of their first token, tree and parse errors.
+        self._statement_starts: list[int] = []
+        self._trees: list[Expr | None] = []
+        self._parse_errors: list[list[Diagnostic]] = []
+
+        tokens, self._scan_errors, _ = self._scan(source, 0, len(source), 1)
+        self._tokens.extend(tokens)
+        self._tokens.append(Token(TokenType.EOF, "", None, 1 + source.count("\n")))
+
+        # Offset of a string which is not terminated (-1 if there is none).
+        # Scanner produces no token for it, but it hides the rest of source.
+        self._unterminated: int = self._find_unterminated()
+
+        self._parser: Final[Parser] = parser(self._tokens, reporter=self._reporter)
+        self._statement_starts, self._trees, self._parse_errors, _ = self._parse(
+            0, 0, 0
+        )
+
+    def source(self) -> str:
+        return self._source
+
+    def tokens(self) -> list[Token]:
+        """Return tokens, like `FastScanner.scan_tokens` (do not modify)."""
+        return self._tokens
+
+    def statements(self) -> list[Expr]:
+        """Return trees of statements, like `Parser.parse_statements`."""
+        return [tree for tree in self._trees if tree is not None]
+
+    def diagnostics(self) -> list[Diagnostic]:
+        """Return syntax errors in the order they are reported by full run."""
+        diagnostics: list[Diagnostic] = list(self._scan_errors)
+        for errors in self._parse_errors:
+            diagnostics.extend(errors)
+        return diagnostics
+
+    def edit(self, offset: int, removed: int, inserted: str) -> None:
+        """Replace `removed` characters at `offset` with `inserted` text."""
+
+        old: str = self._source
+        if offset < 0 or removed < 0 or offset + removed > len(old):
+            raise ValueError("Edit is out of the source")
+
+        new: str = old[:offset] + inserted + old[offset + removed :]
+        delta: int = len(inserted) - removed
+        line_delta: int = inserted.count("\n") - old.count(
+            "\n", offset, offset + removed
+        )
+        tokens: list[Token] = self._tokens
+
+        # Tokens are found by line, as edited region always consists of
+        # whole lines. Only a string can span more lines, its token has the
+        # line where it ends.
+
+        # Re-scan whole lines. Start at the beginning of the edited line, or
+        # of the line where a string spanning it begins.
+        restart: int = old.rfind("\n", 0, offset) + 1
+        if 0 <= self._unterminated < restart:
+            restart = old.rfind("\n", 0, self._unterminated) + 1
+        restart_line: int = 1 + old.count("\n", 0, restart)
+        line, first = self._outside_string(restart_line)
+        restart = _move_lines(old, restart, line - restart_line)
+        restart_line = line
+
+        # Stop at the beginning of a line after the edit, where both old and
+        # new source are outside of any string.
+        stop: int = _next_line(new, offset + len(inserted))
+        old_stop_line: int = 0
+        last: int
+        while True:
+            new_tokens, errors, end = self._scan(new, restart, stop, restart_line)
+            if end < stop:
+                # String not terminated before `stop`, include all of it.
+                close: int = new.find('"', end + 1)
+                stop = len(new) if close < 0 else _next_line(new, close)
+                continue
+            if stop == len(new):
+                last = len(tokens) - 1  # EOF is never replaced
+                break
+            if 0 <= self._unterminated < stop - delta:
+                # Old source after the string was not scanned at all.
+                stop = len(new)
+                continue
+            old_stop_line = restart_line + old.count("\n", restart, stop - delta)
+            last = bisect_left(tokens, old_stop_line, key=_line)
+            end_line: int = tokens[last].line
+            if _start_line(tokens[last]) < old_stop_line:
+                # Old string spanning `stop` is changed too.
+                stop = delta + _move_lines(
+                    old, stop - delta, end_line - old_stop_line + 1
+                )
+                continue
+            break
+
+        # Replace tokens and scanner errors of re-scanned lines.
+        token_delta: int = len(new_tokens) - (last - first)
+        tokens[first:last] = new_tokens
+        tail: int = first + len(new_tokens)
+        if line_delta:
+            for token in tokens[tail:]:
+                token.line += line_delta
+
+        lines: list[int] = [error.line for error in self._scan_errors]
+        error_first: int = bisect_left(lines, restart_line)
+        error_last: int = len(lines)
+        if stop < len(new):
+            error_last = bisect_left(lines, old_stop_line)
+        self._scan_errors[error_first:] = errors + _shift(
+            self._scan_errors[error_last:], line_delta
+        )
+
+        self._source = new
+        if stop == len(new):
+            self._unterminated = self._find_unterminated()
+        elif self._unterminated >= 0:
+            self._unterminated += delta
+
+        # Re-parse from the statement which could see the first changed token
+        # (parser looks one token ahead), until it's in sync with old ones.
+        k: int = max(bisect_left(self._statement_starts, first) - 1, 0)
+        position: int = self._statement_starts[k] if self._statement_starts else 0
+        statement_starts, trees, parse_errors, reused = self._parse(
+            position, tail, token_delta
+        )
+        reused_starts: list[int] = self._statement_starts[reused:]
+        if token_delta:
+            reused_starts = [start + token_delta for start in reused_starts]
+        self._statement_starts[k:] = statement_starts + reused_starts
+        self._trees[k:] = trees + self._trees[reused:]
+        reused_errors: list[list[Diagnostic]] = self._parse_errors[reused:]
+        if line_delta:
+            reused_errors = [_shift(errors, line_delta) for errors in reused_errors]
+        self._parse_errors[k:] = parse_errors + reused_errors
+
+    def _scan(
+        self, source: str, start: int, stop: int, line: int
+    ) -> tuple[list[Token], list[Diagnostic], int]:
+        """Scan `source[start:stop]`, return tokens, errors and offset where
+        scanning stopped.
+        """
+
+        scanner: FastScanner = FastScanner(source[start:stop], reporter=self._reporter)
+        buffer, end = scanner.scan_fragment(line, final=stop == len(source))
+        return list(buffer), self._take_errors(), start + end
+
+    def _parse(
+        self, position: int, changed_end: int, token_delta: int
+    ) -> tuple[list[int], list[Expr | None], list[list[Diagnostic]], int]:
+        """Parse statements from token `position` on, until EOF or until a
+        statement after `changed_end` starts where an old one did (before
+        tokens were shifted by `token_delta`).
+
+        Return starts, trees and errors of parsed statements and index of
+        the first old statement which is still valid.
+        """
+
+        old_starts: list[int] = self._statement_starts
+        eof: int = len(self._tokens) - 1
+        starts: list[int] = []
+        trees: list[Expr | None] = []
+        errors: list[list[Diagnostic]] = []
+        old: int = 0
+
+        while position < eof:
+            if position >= changed_end:
+                old = bisect_left(old_starts, position - token_delta, old)
+                if old < len(old_starts) and old_starts[old] == position - token_delta:
+                    return starts, trees, errors, old
+
+            tree, end = self._parser.parse_statement(position)
+            starts.append(position)
+            trees.append(tree)
+            errors.append(self._take_errors())
+            position = end
+
+        return starts, trees, errors, len(old_starts)
+
+    def _find_unterminated(self) -> int:
+        # Only whitespace, comments, unexpected characters and the string
+        # can follow the last token, scan from the line where it begins.
+        # Scanning stops before the string if source can continue.
+        source: str = self._source
+        start: int = 0
+        line: int = 1
+        if len(self._tokens) > 1:
+            line, _ = self._outside_string(_start_line(self._tokens[-2]))
+            start = _move_lines(
+                source, source.rfind("\n") + 1, line - self._tokens[-1].line
+            )
+        scanner: FastScanner = FastScanner(
+            source[start:] + "\n", reporter=self._reporter
+        )
+        _, end = scanner.scan_fragment(line, final=False)
+        self._take_errors()
+        return start + end if start + end < len(source) else -1
+
+    def _outside_string(self, line: int) -> tuple[int, int]:
+        """Return the nearest line at or before `line` which does not begin
+        inside a string, and index of the first token after its start.
+        """
+        while True:
+            first: int = bisect_left(self._tokens, line, key=_line)
+            start_line: int = _start_line(self._tokens[first])
+            if start_line >= line:
+                return line, first
+            line = start_line
+
+    def _take_errors(self) -> list[Diagnostic]:
+        errors: list[Diagnostic] = list(self._sink.diagnostics)
+        self._sink.diagnostics.clear()
+        return errors
+
+
+def _next_line(source: str, offset: int) -> int:
+    """Return offset of the line after the one with `offset` (or the end)."""
+    end: int = source.find("\n", offset)
+    return len(source) if end < 0 else end + 1
+
+
+def _move_lines(source: str, offset: int, count: int) -> int:
+    """Return offset of the line `count` lines after (before, if negative)
+    the one starting at `offset`.
+    """
+    while count < 0:
+        offset = source.rfind("\n", 0, offset - 1) + 1
+        count += 1
+    while count > 0:
+        offset = _next_line(source, offset)
+        count -= 1
+    return offset
+
+
+def _start_line(token: Token) -> int:
+    return token.line - token.lexeme.count("\n")
+
+
+def _shift(diagnostics: list[Diagnostic], line_delta: int) -> list[Diagnostic]:
+    if not line_delta:
+        return diagnostics
+    return [replace(d, line=d.line + line_delta) for d in diagnostics]
@@ -1,26 +1,55 @@
+from collections.abc import Callable
 import sys  # version_info
-from typing import Any
+from typing import Any, Final
 
 if sys.version_info >= (3, 12):
     from typing import override
 else:
     from typing_extensions import override
 
+from losos.environment import Environment
 from losos.expr import *
+from losos.output import OutputSink, TextOutput
 from losos.reporter import Reporter
 from losos.runtimeerror import LososRuntimeError
 from losos.token import Token
 from losos.tokentype import TokenType
 
+# Text of small integral numbers, which are printed most often.
+_SMALL_INTEGERS: Final[tuple[str, ...]] = tuple(str(i) for i in range(1024))
+
 
 class Interpreter(ExprVisitor[Any]):
-    def __init__(self, *, reporter: Reporter) -> None:
+    def __init__(
+        self,
+        *,
+        reporter: Reporter,
+        environment: Environment | None = None,
+        output: OutputSink | None = None,
+    ) -> None:
         self._reporter: Reporter = reporter
+        # Variables are bound by the caller (see `Losos` and `batch.py`).
+        self._environment: Environment = (
+            Environment() if environment is None else environment
+        )
+        # Results are printed at once by default. `Losos` buffers them and
+        # flushes after every run.
+        self._output: OutputSink = (
+            TextOutput(buffer_size=0) if output is None else output
+        )
 
     def interpret(self, expression: Expr) -> None:
         try:
             value: Any = self._evaluate(expression)
-            print(self._stringify(value))
+            self._output.write(self._stringify(value))
+        except LososRuntimeError as error:
+            self._reporter.runtime_error(error)
+
+    def execute(self, program: Callable[[], Any]) -> None:
+        """Like `interpret`, but for compiled expression (see `closures.py`)."""
+        try:
+            value: Any = program()
+            self._output.write(self._stringify(value))
         except LososRuntimeError as error:
             self._reporter.runtime_error(error)
 
@@ -31,11 +60,13 @@ class Interpreter(ExprVisitor[Any]):
     @override
     def visit_unary_expr(self, expr: UnaryExpr) -> Any:
         right: Any = self._evaluate(expr.right)
+        return self._unary(expr.operator, right)
 
-        if expr.operator.type == TokenType.BANG:
+    def _unary(self, operator: Token, right: Any) -> Any:
+        if operator.type == TokenType.BANG:
             return not self._is_truthy(right)
-        elif expr.operator.type == TokenType.MINUS:
-            self._check_number_operand(expr.operator, right)
+        elif operator.type == TokenType.MINUS:
+            self._check_number_operand(operator, right)
             return -float(right)
 
         # Unreachable
@@ -51,6 +82,11 @@ class Interpreter(ExprVisitor[Any]):
             return
         raise LososRuntimeError(operator, "Operands must be numbers.")
 
+    def _check_divisor(self, operator: Token, divisor: float) -> None:
+        # Python would raise ZeroDivisionError (instead of inf or nan).
+        if divisor == 0.0:
+            raise LososRuntimeError(operator, "Division by zero.")
+
     # ``false and nil are falsey, and everything else is truthy``
     def _is_truthy(self, obj: Any) -> bool:
         if obj is None:
@@ -67,21 +103,34 @@ class Interpreter(ExprVisitor[Any]):
         return bool(a == b)
 
     def _stringify(self, obj: Any) -> str:
+        if type(obj) is float:
+            # Like `str(obj)` without ".0" at the end, but most numbers are
+            # formatted without making (and slicing) that string first.
+            if obj.is_integer():  # Not inf or nan
+                if obj and -1e16 < obj < 1e16:
+                    integer: int = int(obj)
+                    if 0 < integer < len(_SMALL_INTEGERS):
+                        return _SMALL_INTEGERS[integer]
+                    return str(integer)
+                # Zero ("-0" keeps its sign) or exponent notation ("1e+16").
+                text: str = repr(obj)
+                return text[:-2] if text.endswith(".0") else text
+            # Fraction, inf or nan, never ends with ".0".
+            return repr(obj)
+
         if obj is None:
             return "nil"
 
-        if type(obj) is float:
-            text: str = str(obj)
-            if text.endswith(".0"):
-                text = text[:-2]
-            return text
-
         return str(obj)
 
     @override
     def visit_grouping_expr(self, expr: GroupingExpr) -> Any:
         return self._evaluate(expr.expression)
 
+    @override
+    def visit_variable_expr(self, expr: VariableExpr) -> Any:
+        return self._environment.get(expr.name)
+
     def _evaluate(self, expr: Expr) -> Any:
         return expr.accept(self)
 
@@ -89,28 +138,30 @@ class Interpreter(ExprVisitor[Any]):
     def visit_binary_expr(self, expr: BinaryExpr) -> Any:
         left: Any = self._evaluate(expr.left)
         right: Any = self._evaluate(expr.right)
+        return self._binary(expr.operator, left, right)
 
-        if expr.operator.type == TokenType.GREATER:
-            self._check_number_operands(expr.operator, left, right)
+    def _binary(self, operator: Token, left: Any, right: Any) -> Any:
+        if operator.type == TokenType.GREATER:
+            self._check_number_operands(operator, left, right)
             return float(left) > float(right)
 
-        elif expr.operator.type == TokenType.GREATER_EQUAL:
-            self._check_number_operands(expr.operator, left, right)
+        elif operator.type == TokenType.GREATER_EQUAL:
+            self._check_number_operands(operator, left, right)
             return float(left) >= float(right)
 
-        elif expr.operator.type == TokenType.LESS:
-            self._check_number_operands(expr.operator, left, right)
+        elif operator.type == TokenType.LESS:
+            self._check_number_operands(operator, left, right)
             return float(left) < float(right)
 
-        elif expr.operator.type == TokenType.LESS_EQUAL:
-            self._check_number_operands(expr.operator, left, right)
+        elif operator.type == TokenType.LESS_EQUAL:
+            self._check_number_operands(operator, left, right)
             return float(left) <= float(right)
 
-        elif expr.operator.type == TokenType.MINUS:
-            self._check_number_operands(expr.operator, left, right)
+        elif operator.type == TokenType.MINUS:
+            self._check_number_operands(operator, left, right)
             return float(left) - float(right)
 
-        elif expr.operator.type == TokenType.PLUS:
+        elif operator.type == TokenType.PLUS:
             if (type(left) is float) and (type(right) is float):
                 return left + right
 
@@ -118,21 +169,22 @@ class Interpreter(ExprVisitor[Any]):
                 return left + right
 
             raise LososRuntimeError(
-                expr.operator, "Operands must be two numbers or two strings."
+                operator, "Operands must be two numbers or two strings."
             )
 
-        elif expr.operator.type == TokenType.SLASH:
-            self._check_number_operands(expr.operator, left, right)
+        elif operator.type == TokenType.SLASH:
+            self._check_number_operands(operator, left, right)
+            self._check_divisor(operator, right)
             return float(left) / float(right)
 
-        elif expr.operator.type == TokenType.STAR:
-            self._check_number_operands(expr.operator, left, right)
+        elif operator.type == TokenType.STAR:
+            self._check_number_operands(operator, left, right)
             return float(left) * float(right)
 
-        elif expr.operator.type == TokenType.BANG_EQUAL:
+        elif operator.type == TokenType.BANG_EQUAL:
             return not self._is_equal(left, right)
 
-        elif expr.operator.type == TokenType.EQUAL_EQUAL:
+        elif operator.type == TokenType.EQUAL_EQUAL:
             return self._is_equal(left, right)
 
         # Unreachable
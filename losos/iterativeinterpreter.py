@@ -0,0 +1,153 @@
+from collections.abc import Callable
+import sys  # version_info
+from typing import Any, Final
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.environment import Environment
+from losos.expr import *
+from losos.interpreter import Interpreter
+from losos.output import OutputSink
+from losos.reporter import Reporter
+from losos.runtimeerror import LososRuntimeError
+from losos.token import Token
+from losos.tokentype import TokenType
+
+
+class IterativeInterpreter(Interpreter):
+    """Interpreter which evaluates expressions with explicit stack.
+
+    Operators are applied by the same methods as in `Interpreter`, in the
+    same (post)order, so results and runtime errors are identical, but deep
+    trees do not hit Python's recursion limit.
+    """
+
+    def __init__(
+        self,
+        *,
+        reporter: Reporter,
+        environment: Environment | None = None,
+        output: OutputSink | None = None,
+    ) -> None:
+        super().__init__(reporter=reporter, environment=environment, output=output)
+        # Binary operators are resolved with one lookup, not `if` chain.
+        self._binary_operators: Final[
+            dict[TokenType, Callable[[Token, Any, Any], Any]]
+        ] = {
+            TokenType.GREATER: self._greater,
+            TokenType.GREATER_EQUAL: self._greater_equal,
+            TokenType.LESS: self._less,
+            TokenType.LESS_EQUAL: self._less_equal,
+            TokenType.MINUS: self._subtract,
+            TokenType.PLUS: self._add,
+            TokenType.SLASH: self._divide,
+            TokenType.STAR: self._multiply,
+            TokenType.BANG_EQUAL: self._not_equal,
+            TokenType.EQUAL_EQUAL: self._equal,
+        }
+
+    @override
+    def _evaluate(self, expr: Expr) -> Any:
+        values: list[Any] = []
+        push = values.append
+        pop = values.pop
+        # Operators waiting for their operands. `None` on `work` stack means
+        # that the operator on top of `operators` can be applied.
+        operators: list[BinaryExpr | UnaryExpr] = []
+        work: list[Expr | None] = [expr]
+
+        while work:
+            node: Expr | None = work.pop()
+
+            if node is None:
+                operator: BinaryExpr | UnaryExpr = operators.pop()
+                if type(operator) is BinaryExpr:
+                    right: Any = pop()
+                    values[-1] = self._binary(operator.operator, values[-1], right)
+                else:
+                    values[-1] = self._unary(operator.operator, values[-1])
+                continue
+
+            # Go down the leftmost path, postponing right operands.
+            while True:
+                if type(node) is BinaryExpr:
+                    operators.append(node)
+                    work.append(None)
+                    work.append(node.right)
+                    node = node.left
+
+                elif type(node) is LiteralExpr:
+                    push(node.value)
+                    break
+
+                elif type(node) is GroupingExpr:
+                    node = node.expression
+
+                elif type(node) is VariableExpr:
+                    push(self._environment.get(node.name))
+                    break
+
+                elif type(node) is UnaryExpr:
+                    operators.append(node)
+                    work.append(None)
+                    node = node.right
+
+                else:
+                    # Unknown (e.g. subclassed) node, let it dispatch itself.
+                    push(node.accept(self))
+                    break
+
+        return values[-1]
+
+    @override
+    def _binary(self, operator: Token, left: Any, right: Any) -> Any:
+        return self._binary_operators[operator.type](operator, left, right)
+
+    def _greater(self, operator: Token, left: Any, right: Any) -> Any:
+        self._check_number_operands(operator, left, right)
+        return float(left) > float(right)
+
+    def _greater_equal(self, operator: Token, left: Any, right: Any) -> Any:
+        self._check_number_operands(operator, left, right)
+        return float(left) >= float(right)
+
+    def _less(self, operator: Token, left: Any, right: Any) -> Any:
+        self._check_number_operands(operator, left, right)
+        return float(left) < float(right)
+
+    def _less_equal(self, operator: Token, left: Any, right: Any) -> Any:
+        self._check_number_operands(operator, left, right)
+        return float(left) <= float(right)
+
+    def _subtract(self, operator: Token, left: Any, right: Any) -> Any:
+        self._check_number_operands(operator, left, right)
+        return float(left) - float(right)
+
+    def _add(self, operator: Token, left: Any, right: Any) -> Any:
+        if (type(left) is float) and (type(right) is float):
+            return left + right
+
+        if (type(left) is str) and (type(right) is str):
+            return left + right
+
+        raise LososRuntimeError(
+            operator, "Operands must be two numbers or two strings."
+        )
+
+    def _divide(self, operator: Token, left: Any, right: Any) -> Any:
+        self._check_number_operands(operator, left, right)
+        self._check_divisor(operator, right)
+        return float(left) / float(right)
+
+    def _multiply(self, operator: Token, left: Any, right: Any) -> Any:
+        self._check_number_operands(operator, left, right)
+        return float(left) * float(right)
+
+    def _not_equal(self, operator: Token, left: Any, right: Any) -> Any:
+        return not self._is_equal(left, right)
+
+    def _equal(self, operator: Token, left: Any, right: Any) -> Any:
+        return self._is_equal(left, right)
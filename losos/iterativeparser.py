@@ -0,0 +1,124 @@
+import sys  # version_info
+from typing import cast, Final
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.expr import *
+from losos.parser import Parser
+from losos.token import Token
+from losos.tokentype import TokenType
+
+# Precedence of binary operators, from `_equality` (lowest) to `_factor`.
+_PRECEDENCE: Final[dict[TokenType, int]] = {
+    TokenType.BANG_EQUAL: 1,
+    TokenType.EQUAL_EQUAL: 1,
+    TokenType.GREATER: 2,
+    TokenType.GREATER_EQUAL: 2,
+    TokenType.LESS: 2,
+    TokenType.LESS_EQUAL: 2,
+    TokenType.MINUS: 3,
+    TokenType.PLUS: 3,
+    TokenType.SLASH: 4,
+    TokenType.STAR: 4,
+}
+
+_UNARY_OPERATORS: Final[frozenset[TokenType]] = frozenset(
+    [TokenType.BANG, TokenType.MINUS]
+)
+_LITERALS: Final[dict[TokenType, bool | None]] = {
+    TokenType.FALSE: False,
+    TokenType.TRUE: True,
+    TokenType.NIL: None,
+}
+_VALUES: Final[frozenset[TokenType]] = frozenset([TokenType.NUMBER, TokenType.STRING])
+
+# Kinds of pending operators which are not binary ones (see `_expression`).
+_GROUP: Final[int] = 0
+_UNARY: Final[int] = -1
+
+
+class IterativeParser(Parser):
+    """Precedence climbing parser with explicit stack.
+
+    Builds exactly the same trees and reports the same errors as recursive
+    descent `Parser` (which is kept as the reference implementation), but
+    nesting depth is limited only by memory, not by Python's recursion limit.
+    """
+
+    @override
+    def _expression(self) -> Expr:
+        # Operators still waiting for their right operand:
+        # (precedence, left operand, operator) for binary operators,
+        # (_UNARY, None, operator) for unary ones and (_GROUP, None, None)
+        # for opening parentheses.
+        pending: list[tuple[int, Expr | None, Token | None]] = []
+        precedence: int
+        operand: Expr
+
+        while True:
+            # Prefix part: unary operators and opening parentheses.
+            while True:
+                token: Token = self._peek()
+                if token.type in _UNARY_OPERATORS:
+                    self._advance()
+                    pending.append((_UNARY, None, token))
+                elif token.type == TokenType.LEFT_PAREN:
+                    self._advance()
+                    pending.append((_GROUP, None, None))
+                else:
+                    break
+
+            operand = self._literal()
+
+            # Postfix part: reduce everything which ends here.
+            while True:
+                while pending and pending[-1][0] == _UNARY:
+                    operand = UnaryExpr(cast(Token, pending.pop()[2]), operand)
+
+                precedence = _PRECEDENCE.get(self._peek().type, 0)
+
+                # Operators are left-associative, so reduce equal precedence
+                # too. Without operator reduce all binary operators.
+                limit: int = max(precedence, 1)
+                while pending and pending[-1][0] >= limit:
+                    _, left, operator = pending.pop()
+                    operand = BinaryExpr(
+                        cast(Expr, left), cast(Token, operator), operand
+                    )
+
+                if precedence:
+                    pending.append((precedence, operand, self._advance()))
+                    break
+
+                if not pending:
+                    return operand
+
+                # Only `_GROUP` can be left on top.
+                self._consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
+                pending.pop()
+                operand = GroupingExpr(operand)
+
+    def _literal(self) -> Expr:
+        """Like `_primary`, but groupings are handled by `_expression`."""
+
+        token: Token = self._peek()
+
+        if token.type in _LITERALS:
+            self._advance()
+            return LiteralExpr(_LITERALS[token.type])
+
+        if token.type in _VALUES:
+            self._advance()
+            # `MappedScanner` gives nodes of strings as their literals.
+            if isinstance(token.literal, LiteralExpr):
+                return token.literal
+            return LiteralExpr(token.literal)
+
+        if token.type == TokenType.IDENTIFIER:
+            self._advance()
+            return VariableExpr(token)
+
+        raise self._error(token, "Expect expression.")
@@ -1,35 +1,150 @@
-from typing import cast, Final
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial
+from typing import Any, Final, Literal, TextIO
+import os
 import sys
 
+from losos.astcache import AstCache
 from losos.astprinter import AstPrinter
+from losos.bytecode import BytecodeCompiler
+from losos.closures import ClosureCompiler
+from losos.diagnostics import Diagnostic, DiagnosticSink
+from losos.environment import Environment
 from losos.expr import Expr
+from losos.fastscanner import FastScanner
+from losos.hashcons import HashConser, MemoizingInterpreter
 from losos.helpers import eprint
 from losos.interpreter import Interpreter
+from losos.iterativeinterpreter import IterativeInterpreter
+from losos.iterativeparser import IterativeParser
+from losos.mappedscanner import MappedScanner
+from losos.mappedsource import MappedSource
+from losos.optimizer import Optimizer
+from losos.output import OutputSink, TextOutput
+from losos.parsecache import ParseCache, ParseResult
 from losos.parser import Parser
+from losos.profiling import Profile, count_nodes
 from losos.reporter import Reporter
 from losos.scanner import Scanner
 from losos.token import Token
 from losos.version import __version__
+from losos.vm import VM
 
 
 class Losos:
-    def __init__(self) -> None:
-        self._reporter: Reporter = Reporter()
-        self._interpreter: Final[Interpreter] = Interpreter(reporter=self._reporter)
+    def __init__(
+        self,
+        *,
+        scanner: type[Scanner] = FastScanner,
+        parser: type[Parser] = IterativeParser,
+        interpreter: type[Interpreter] = IterativeInterpreter,
+        backend: Literal["tree", "closure", "vm"] = "tree",
+        optimize: bool = False,
+        hash_cons: bool = False,
+        parse_cache_size: int = 128,
+        ast_cache: bool = False,
+        cache_dir: str | None = None,
+        mmap: bool = False,
+        environment: Environment | None = None,
+        diagnostics: DiagnosticSink | None = None,
+        max_errors: int | None = None,
+        output: OutputSink | None = None,
+        profile: bool = False,
+    ) -> None:
+        # `Scanner` is the reference implementation, `FastScanner` produces
+        # the same tokens (and errors) but a lot faster.
+        self._scanner_class: Final[type[Scanner]] = scanner
+        # Same for `Parser`/`IterativeParser` and `Interpreter`/
+        # `IterativeInterpreter`, the latter don't hit recursion limit.
+        self._parser_class: Final[type[Parser]] = parser
+        # "tree" walks the syntax tree with `Interpreter`, "closure" compiles
+        # it first with `ClosureCompiler`, "vm" compiles it to bytecode and
+        # runs it in `VM`.
+        self._backend: Final[str] = backend
+        # Fold constant subtrees before running (see `Optimizer`).
+        self._optimize: Final[bool] = optimize
+        self._eliminated_nodes: int = 0
+        # Share identical subtrees of parsed expressions, and remember
+        # results of constant ones when run by `IterativeInterpreter`
+        # (see `HashConser`).
+        self._hash_conser: Final[HashConser | None] = (
+            HashConser() if hash_cons else None
+        )
+        # Results of `_parse` for recently run sources (0 turns cache off).
+        self._parse_cache: Final[ParseCache | None] = (
+            ParseCache(parse_cache_size) if parse_cache_size > 0 else None
+        )
+        # Parsed scripts stored on disk by `run_file` (see `AstCache`).
+        self._ast_cache: Final[AstCache | None] = (
+            AstCache(cache_dir) if ast_cache else None
+        )
+        # `run_file` maps scripts which are not cached into memory and scans
+        # them with `MappedScanner` (instead of `scanner`), strings stay in
+        # the map until they are evaluated.
+        self._mmap: Final[bool] = mmap
+        # Variables visible to scripts, shared by all backends.
+        self._environment: Final[Environment] = (
+            Environment() if environment is None else environment
+        )
+        # Errors go to `diagnostics` (buffered stderr by default), at most
+        # `max_errors` of them per run.
+        self._reporter: Reporter = Reporter(sink=diagnostics, max_errors=max_errors)
+        # Results go to `output` (buffered stdout by default), flushed at the
+        # end of every run like diagnostics.
+        self._output: Final[OutputSink] = TextOutput() if output is None else output
+        self._vm: Final[VM] = VM(environment=self._environment)
+        self._interpreter: Final[Interpreter] = (
+            MemoizingInterpreter(
+                reporter=self._reporter,
+                environment=self._environment,
+                output=self._output,
+                conser=self._hash_conser,
+            )
+            if self._hash_conser is not None and interpreter is IterativeInterpreter
+            else interpreter(
+                reporter=self._reporter,
+                environment=self._environment,
+                output=self._output,
+            )
+        )
+        # Timers and counters of all runs (see `Profile`). Without profile
+        # nothing is instrumented, so it costs nothing.
+        self._profile: Final[Profile | None] = Profile() if profile else None
+        if self._profile is not None:
+            self._instrument(self._profile)
 
     def run_file(self, path: str) -> int:
-        # Return exit code instead of calling `sys.exit()` (see #17)
+        # Return exit code instead of calling `sys.exit()` (see #17): 65 for
+        # syntax error (or invalid UTF-8), 66 if the file can't be read, 70
+        # for runtime error.
 
-        content: str = ""
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-        except OSError as e:
-            raise  # TODO
-        except ValueError as e:  # encoding error
-            raise  # TODO
+            expression: Expr | None = None
+            if self._ast_cache is not None:
+                expression = self._load_cached(path)
 
-        self._run(content)
+            if expression is not None:
+                # Cache hit, no need to scan and parse.
+                self._execute(self._prepare(expression))
+            elif self._ast_cache is not None:
+                stat: os.stat_result = os.stat(path)
+                with open(path, "r", encoding="utf-8") as f:
+                    expression, errors = self._syntax(f)
+                if expression is not None and not errors:
+                    self._ast_cache.store(path, stat, expression)
+                    self._execute(self._prepare(expression))
+            elif self._mmap:
+                with MappedSource(path) as source:
+                    self._run(source)
+            else:
+                # File is not read at once, scanner pulls it in chunks.
+                with open(path, "r", encoding="utf-8") as f:
+                    self._run(f)
+        except (OSError, UnicodeDecodeError) as e:
+            return self._file_error(path, e)
+        finally:
+            self._output.flush()
+            self._reporter.flush()
 
         if self._reporter.had_error():
             return 65
@@ -39,6 +154,66 @@ class Losos:
 
         return 0
 
+    def check_file(self, path: str) -> int:
+        """Report all syntax errors in script made of semicolon-terminated
+        expressions, without running it. Return 65 if there were any (or the
+        script is not valid UTF-8), 66 if it can't be read, else 0.
+        """
+
+        try:
+            # Like `run_file`, the file is pulled by scanner in chunks.
+            with open(path, "r", encoding="utf-8") as f:
+                scanner: Scanner = self._scanner_class(f, reporter=self._reporter)
+                parser: Parser = self._parser_class(
+                    scanner.iter_tokens(), reporter=self._reporter
+                )
+                parser.parse_statements()
+        except (OSError, UnicodeDecodeError) as e:
+            return self._file_error(path, e)
+        finally:
+            self._reporter.flush()
+
+        return 65 if self._reporter.had_error() else 0
+
+    def _file_error(self, path: str, error: OSError | UnicodeDecodeError) -> int:
+        """Report script which can't be read, return exit code: 65 if it's
+        not valid UTF-8, else 66.
+        """
+
+        # After errors reported before reading failed.
+        self._reporter.flush()
+        if isinstance(error, UnicodeDecodeError):
+            eprint(f"losos: can't decode file '{path}': {error}")
+            return 65
+        eprint(f"losos: can't open file '{path}': {error.strerror or error}")
+        return 66
+
+    def parse(self, source: str) -> Expr | None:
+        """Scan and parse the source without running it (e.g. for `batch.py`).
+
+        Return None if there was a syntax error (it is reported as usual).
+        """
+
+        expression, errors = self._syntax(source)
+        self._reporter.flush()
+        return None if errors else expression
+
+    def eliminated_nodes(self) -> int:
+        """Return number of nodes removed by optimizer so far."""
+        return self._eliminated_nodes
+
+    def parse_cache(self) -> ParseCache | None:
+        """Return parse cache (with its hit/miss/eviction counters)."""
+        return self._parse_cache
+
+    def hash_conser(self) -> HashConser | None:
+        """Return hash-conser (with its node and memo counters)."""
+        return self._hash_conser
+
+    def profile(self) -> Profile | None:
+        """Return profile of all runs so far (None if profiling is off)."""
+        return self._profile
+
     def run_prompt(self) -> None:
         print("Losos v" + __version__)
         print("Use exit() or Ctrl-Z plus Return to exit\n")
@@ -53,22 +228,166 @@ class Losos:
                 print("EOF")
                 break
 
-            self._run(line)
+            self.run_source(line)
+
+    def run_source(self, source: str) -> None:
+        """Run snippet of source, like a line of REPL (see `server.py`)."""
+
+        try:
+            self._run(source)
+        finally:
+            self._output.flush()
+            self._reporter.flush()
 
             # ``We need to reset this flag in the interactive loop. If the user makes a mistake, it shouldn't kill their entire session.``
             self._reporter.clear()
 
-    def _run(self, source: str) -> None:
-        scanner = Scanner(source, reporter=self._reporter)
-        tokens: list[Token] = scanner.scan_tokens()
+    def _run(self, source: str | TextIO | MappedSource) -> None:
+        result: ParseResult | None = None
+        key: bytes = b""
+        if self._parse_cache is not None and isinstance(source, str):
+            key = self._parse_cache.key(source)
+            result = self._parse_cache.get(key)
+            if result is not None:
+                # Behave like uncached run: report the same syntax errors.
+                self._reporter.replay(result.errors)
+                self._eliminated_nodes += result.eliminated
+
+        if result is None:
+            result = self._parse(source)
+            if self._parse_cache is not None and isinstance(source, str):
+                self._parse_cache.put(key, result)
+
+        self._execute(result)
+
+    def _parse(self, source: str | TextIO | MappedSource) -> ParseResult:
+        """Scan, parse, optimize and compile (as configured) the source."""
 
-        parser: Parser = Parser(tokens, reporter=self._reporter)
-        expression: Expr | None = parser.parse()
+        expression, errors = self._syntax(source)
+        if expression is None or errors:
+            return ParseResult(None, errors, 0)
+        return self._prepare(expression)
 
+    def _syntax(
+        self, source: str | Iterable[str] | MappedSource
+    ) -> tuple[Expr | None, tuple[Diagnostic, ...]]:
+        """Scan and parse the source, return tree and reported errors."""
+
+        self._reporter.record()
+        tokens: list[Token] | Iterator[Token] = self._scan(source)
+        expression: Expr | None = self._parse_tokens(tokens)
+        return expression, tuple(self._reporter.recorded())
+
+    def _scan(
+        self, source: str | Iterable[str] | MappedSource
+    ) -> list[Token] | Iterator[Token]:
+        if isinstance(source, MappedSource):
+            return MappedScanner(source, reporter=self._reporter).iter_tokens()
+        scanner: Scanner = self._scanner_class(source, reporter=self._reporter)
+        if isinstance(source, str):
+            return scanner.scan_tokens()
+        return scanner.iter_tokens()
+
+    def _parse_tokens(self, tokens: list[Token] | Iterator[Token]) -> Expr | None:
+        parser: Parser = self._parser_class(tokens, reporter=self._reporter)
+        return parser.parse()
+
+    def _load_cached(self, path: str) -> Expr | None:
+        if self._ast_cache is None:
+            return None
+        return self._ast_cache.load(path)
+
+    def _prepare(self, expression: Expr) -> ParseResult:
+        """Optimize and compile parsed expression (as configured)."""
+
+        eliminated: int = 0
+        if self._optimize:
+            expression, eliminated = self._fold(expression)
+            self._eliminated_nodes += eliminated
+        if self._hash_conser is not None:
+            # After folding, which would replace shared nodes with copies.
+            expression = self._hash_conser.intern(expression)
+        # print(AstPrinter().print(expression))
+
+        return ParseResult(self._compile(expression), (), eliminated)
+
+    def _fold(self, expression: Expr) -> tuple[Expr, int]:
+        """Optimize expression, return it and number of eliminated nodes."""
+
+        optimizer: Optimizer = Optimizer()
+        if self._profile is not None:
+            self._profile.instrument(optimizer)
+        return optimizer.optimize(expression), optimizer.eliminated
+
+    def _compile(self, expression: Expr) -> Any:
+        """Compile expression for the backend (tree backend runs it as is)."""
+
+        if self._backend == "closure":
+            compiler: ClosureCompiler = ClosureCompiler(environment=self._environment)
+            if self._profile is not None:
+                self._profile.instrument(compiler)
+            return compiler.compile(expression)
+        if self._backend == "vm":
+            bytecode: BytecodeCompiler = BytecodeCompiler()
+            if self._profile is not None:
+                self._profile.instrument(bytecode)
+            return bytecode.compile(expression)
+        return expression
+
+    def _execute(self, result: ParseResult) -> None:
         # Stop if there was a syntax error.
         if self._reporter.had_error():
             return
 
-        expression = cast(Expr, expression)
-        # print(AstPrinter().print(expression))
-        self._interpreter.interpret(expression)
+        if self._backend == "closure":
+            self._interpreter.execute(result.program)
+        elif self._backend == "vm":
+            self._interpreter.execute(partial(self._vm.run, result.program))
+        else:
+            self._interpreter.interpret(result.program)
+
+    def _instrument(self, profile: Profile) -> None:
+        """Wrap methods of pipeline phases (of this instance) to time them
+        and count tokens and nodes.
+        """
+
+        profile.instrument(self._interpreter)
+
+        scan: Callable[
+            [str | Iterable[str] | MappedSource], list[Token] | Iterator[Token]
+        ] = self._scan
+        parse: Callable[[list[Token] | Iterator[Token]], Expr | None] = (
+            self._parse_tokens
+        )
+        load: Callable[[str], Expr | None] = self._load_cached
+
+        def profiled_scan(source: str | Iterable[str] | MappedSource) -> list[Token]:
+            with profile.phase("scan"):
+                # File is scanned at once, so it's not timed as parsing.
+                tokens: list[Token] = list(scan(source))
+            profile.count("tokens", len(tokens))
+            return tokens
+
+        def profiled_parse(tokens: list[Token] | Iterator[Token]) -> Expr | None:
+            with profile.phase("parse"):
+                expression: Expr | None = parse(tokens)
+            if expression is not None:
+                profile.count("nodes", count_nodes(expression))
+            return expression
+
+        def profiled_load(path: str) -> Expr | None:
+            with profile.phase("cache load"):
+                expression: Expr | None = load(path)
+            if expression is not None:
+                profile.count("ast cache hits")
+            return expression
+
+        setattr(self, "_scan", profiled_scan)
+        setattr(self, "_parse_tokens", profiled_parse)
+        setattr(self, "_load_cached", profiled_load)
+        for name, phase in (
+            ("_fold", "optimize"),
+            ("_compile", "compile"),
+            ("_execute", "execute"),
+        ):
+            setattr(self, name, profile.timed(phase, getattr(self, name)))
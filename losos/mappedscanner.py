@@ -0,0 +1,262 @@
+import codecs
+from collections.abc import Iterator
+import re
+import sys  # version_info
+from typing import Final
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.fastscanner import (
+    _ALPHA,
+    _DIGIT,
+    _DISPATCH,
+    _ERROR,
+    _KEYWORDS,
+    _NAMES_LIMIT,
+    _NEWLINE,
+    _NUMBERS_LIMIT,
+    _PAIR,
+    _PAIR_TYPES,
+    _SINGLE,
+    _SINGLE_TYPES,
+    _SLASH,
+    _STRING,
+    _WHITESPACE,
+)
+from losos.mappedsource import MappedLiteralExpr, MappedSource, MappedToken
+from losos.reporter import Reporter
+from losos.scanner import Scanner
+from losos.token import Token
+from losos.tokentype import TokenType
+
+# Character classes of bytes which are not in `FastScanner` dispatch table.
+_CARRIAGE: Final[int] = 9  # Newline, unless followed by "\n"
+_NON_ASCII: Final[int] = 10  # Part of UTF-8 encoded character
+
+# `FastScanner` dispatch table indexed by byte.
+_BYTE_DISPATCH: Final[list[int]] = [_ERROR] * 128 + [_NON_ASCII] * 128
+for _char, _kind in _DISPATCH.items():
+    _BYTE_DISPATCH[ord(_char)] = _kind
+_BYTE_DISPATCH[ord("\r")] = _CARRIAGE
+
+_SINGLE_BYTES: Final[dict[int, tuple[TokenType, str]]] = {
+    ord(char): (type, char) for char, type in _SINGLE_TYPES.items()
+}
+_PAIR_BYTES: Final[dict[int, tuple[TokenType, TokenType, str, str]]] = {
+    ord(char): (single, double, lexeme, char)
+    for char, (single, double, lexeme) in _PAIR_TYPES.items()
+}
+
+_DIGITS: Final[frozenset[int]] = frozenset(b"0123456789")
+_ALPHANUMERICS: Final[frozenset[int]] = frozenset(
+    b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+)
+_BLANKS: Final[frozenset[int]] = frozenset(b" \t")
+# Text mode ends lines at "\r" too.
+_LINE_END: Final[re.Pattern[bytes]] = re.compile(rb"[\r\n]")
+_BLOCK: Final[int] = 1 << 20
+
+
+class MappedScanner(Scanner):
+    """Scanner of `MappedSource`, which works on the bytes of the map.
+
+    Produces the same tokens and errors as `FastScanner` produces from the
+    decoded file. Everything but strings and comments is ASCII, so tokens
+    are made of bytes without decoding the source; non-ASCII characters
+    outside of them are unexpected (like in `FastScanner`). Strings are not
+    copied from the map: their tokens are `MappedToken` with
+    `MappedLiteralExpr` literal. The whole source is checked to be valid
+    UTF-8 before it's scanned, so an invalid one raises `UnicodeDecodeError`
+    without any errors reported, like reading (a small) file in text mode.
+
+    `iter_tokens` scans the map in windows of `window` bytes and releases
+    pages it has scanned.
+    """
+
+    def __init__(
+        self, source: MappedSource, *, reporter: Reporter, window: int = 1 << 16
+    ) -> None:
+        super().__init__("", reporter=reporter)
+        self._mapped: Final[MappedSource] = source
+        self._window: Final[int] = window
+        # Like `FastScanner._names` and `FastScanner._numbers`, by bytes.
+        self._names: Final[dict[bytes, tuple[TokenType, str]]] = {
+            text.encode(): name for text, name in _KEYWORDS.items()
+        }
+        self._numbers: Final[dict[bytes, tuple[str, float]]] = {}
+
+    @override
+    def scan_tokens(self) -> list[Token]:
+        self._check()
+        self._scan(len(self._mapped))
+        self._tokens.append(Token(TokenType.EOF, "", None, self._line))
+
+        return self._tokens
+
+    @override
+    def iter_tokens(self) -> Iterator[Token]:
+        tokens: list[Token] = self._tokens
+        length: int = len(self._mapped)
+        self._check()
+        while self._current < length:
+            start: int = self._current
+            self._scan(min(start + self._window, length))
+            yield from tokens
+            tokens.clear()
+            # Strings refer to the map, but they are rarely decoded again.
+            self._mapped.release(start, self._current)
+
+        yield Token(TokenType.EOF, "", None, self._line)
+
+    def _scan(self, limit: int) -> None:
+        """Scan tokens starting before `limit` offset, add them to `_tokens`."""
+
+        mapped: MappedSource = self._mapped
+        source = mapped.data
+        length: int = len(source)
+        current: int = self._current
+        append = self._tokens.append
+        dispatch: list[int] = _BYTE_DISPATCH
+        names: dict[bytes, tuple[TokenType, str]] = self._names
+        numbers: dict[bytes, tuple[str, float]] = self._numbers
+        alphanumerics = _ALPHANUMERICS
+        number_digits = _DIGITS
+        blanks = _BLANKS
+        identifier = TokenType.IDENTIFIER
+        number = TokenType.NUMBER
+        single_bytes = _SINGLE_BYTES
+        text: bytes
+        line: int = self._line
+
+        while current < limit:
+            c: int = source[current]
+            kind: int = dispatch[c]
+            start: int = current
+            current += 1
+
+            if kind == _WHITESPACE:
+                while current < length and source[current] in blanks:
+                    current += 1
+
+            elif kind == _ALPHA:
+                while current < length and source[current] in alphanumerics:
+                    current += 1
+                text = source[start:current]
+                name: tuple[TokenType, str] | None = names.get(text)
+                if name is None:
+                    name = (identifier, text.decode())
+                    if len(names) < _NAMES_LIMIT:
+                        names[text] = name
+                append(Token(name[0], name[1], None, line))
+
+            elif kind == _SINGLE:
+                single: tuple[TokenType, str] = single_bytes[c]
+                append(Token(single[0], single[1], None, line))
+
+            elif kind == _NEWLINE:
+                line += 1
+
+            elif kind == _DIGIT:
+                while current < length and source[current] in number_digits:
+                    current += 1
+                if (
+                    current + 1 < length
+                    and source[current] == 0x2E  # "."
+                    and source[current + 1] in number_digits
+                ):
+                    current += 2
+                    while current < length and source[current] in number_digits:
+                        current += 1
+                text = source[start:current]
+                interned: tuple[str, float] | None = numbers.get(text)
+                if interned is None:
+                    interned = (text.decode(), float(text))
+                    if len(numbers) < _NUMBERS_LIMIT:
+                        numbers[text] = interned
+                append(Token(number, interned[0], interned[1], line))
+
+            elif kind == _PAIR:
+                pair: tuple[TokenType, TokenType, str, str] = _PAIR_BYTES[c]
+                if current < length and source[current] == 0x3D:  # "="
+                    current += 1
+                    append(Token(pair[1], pair[2], None, line))
+                else:
+                    append(Token(pair[0], pair[3], None, line))
+
+            elif kind == _SLASH:
+                if current < length and source[current] == 0x2F:  # "/"
+                    # A comment goes until the end of the line.
+                    end: re.Match[bytes] | None = _LINE_END.search(source, current)
+                    current = length if end is None else end.start()
+                else:
+                    append(Token(TokenType.SLASH, "/", None, line))
+
+            elif kind == _STRING:
+                close: int = source.find(b'"', current)
+                if close < 0:
+                    line += self._newlines(current, length)
+                    current = length
+                    self._reporter.error(line, "Unterminated string.")
+                else:
+                    line += self._newlines(current, close)
+                    current = close + 1
+                    literal: MappedLiteralExpr = MappedLiteralExpr(
+                        mapped, start + 1, close
+                    )
+                    append(
+                        MappedToken(
+                            TokenType.STRING, mapped, start, current, literal, line
+                        )
+                    )
+
+            elif kind == _CARRIAGE:
+                if current >= length or source[current] != 0x0A:  # "\n"
+                    line += 1
+
+            elif kind == _NON_ASCII:
+                # One error for every character, like `FastScanner`.
+                while current < length and source[current] >= 0x80:
+                    current += 1
+                for _ in mapped.text(start, current):
+                    self._reporter.error(line, "Unexpected character.")
+
+            else:
+                self._reporter.error(line, "Unexpected character.")
+
+        self._start = self._current = current
+        self._line = line
+
+    def _check(self) -> None:
+        """Raise `UnicodeDecodeError` if the source is not valid UTF-8."""
+
+        decoder: codecs.IncrementalDecoder = codecs.getincrementaldecoder("utf-8")()
+        length: int = len(self._mapped)
+        # Decoded in blocks, which pages are released right away.
+        with memoryview(self._mapped.data) as view:
+            for first in range(0, length, _BLOCK):
+                last: int = min(first + _BLOCK, length)
+                # Released even if decoding fails, so the map can be closed.
+                with view[first:last] as block:
+                    decoder.decode(block)
+                self._mapped.release(first, last)
+        decoder.decode(b"", final=True)
+
+    def _newlines(self, start: int, end: int) -> int:
+        """Return number of lines ended between offsets (in text mode)."""
+
+        source = self._mapped.data
+        count: int = 0
+        # Counted in copies of blocks, as the map has no `count` method.
+        with memoryview(source) as view:
+            for first in range(start, end, _BLOCK):
+                last: int = min(first + _BLOCK, end)
+                block: bytes = bytes(view[first:last])
+                count += block.count(b"\n")
+                if b"\r" in block:
+                    count += block.count(b"\r") - block.count(b"\r\n")
+                    if block[-1] == 0x0D and last < end and source[last] == 0x0A:
+                        count -= 1  # "\r\n" split between blocks
+        return count
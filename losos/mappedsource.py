@@ -0,0 +1,129 @@
+import mmap
+import os
+import sys  # version_info
+from types import TracebackType
+from typing import Any, Final
+
+if sys.version_info >= (3, 12):
+    from typing import Self
+else:
+    from typing_extensions import Self
+
+from losos.expr import LiteralExpr
+from losos.token import Token
+from losos.tokentype import TokenType
+
+
+class MappedSource:
+    """Source file mapped into memory (read-only), so it can be scanned
+    without reading it into a string (see `MappedScanner`).
+
+    Parts of the source are decoded only when needed, as UTF-8 with
+    universal newlines, like a file opened in text mode. Pages of the map
+    can be released after reading, so they don't stay in resident memory
+    (they are read again from the file if they are needed later).
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            # Empty file can't be mapped.
+            self._map: Final[mmap.mmap | None] = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if os.fstat(f.fileno()).st_size
+                else None
+            )
+        self.data: Final[bytes | mmap.mmap] = b"" if self._map is None else self._map
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        type: type[BaseException] | None,
+        value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def text(self, start: int, end: int) -> str:
+        """Decode source between offsets (raise `UnicodeDecodeError` if it's
+        not valid UTF-8) and release its pages.
+        """
+
+        # Decoded right from the map, without copying the bytes first.
+        with memoryview(self.data) as view:
+            text: str = str(view[start:end], "utf-8")
+        self.release(start, end)
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text
+
+    def release(self, start: int, end: int) -> None:
+        """Drop whole pages of the map between offsets from memory."""
+
+        if self._map is None or not hasattr(mmap, "MADV_DONTNEED"):
+            return
+        first: int = -(-start // mmap.PAGESIZE) * mmap.PAGESIZE
+        last: int = end // mmap.PAGESIZE * mmap.PAGESIZE
+        if first < last:
+            self._map.madvise(mmap.MADV_DONTNEED, first, last - first)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+
+
+class MappedToken(Token):
+    """Token which lexeme stays in `MappedSource` until it's used (string
+    tokens, their lexemes are needed only by error messages).
+    """
+
+    __slots__ = ("_source", "_start", "_end")
+
+    def __init__(
+        self,
+        type: TokenType,
+        source: MappedSource,
+        start: int,
+        end: int,
+        literal: Any | None,
+        line: int,
+    ) -> None:
+        # `lexeme` is left unset, so it's looked up by `__getattr__`.
+        self.type = type
+        self.literal = literal
+        self.line = line
+        self._source: Final[MappedSource] = source
+        self._start: Final[int] = start
+        self._end: Final[int] = end
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "lexeme":
+            return self._source.text(self._start, self._end)
+        raise AttributeError(name)
+
+
+class MappedLiteralExpr(LiteralExpr):
+    """String literal which stays in `MappedSource` until it's evaluated,
+    so the tree does not hold copies of all strings of the script. It's
+    decoded every time its value is used.
+
+    `MappedScanner` gives it as a literal of string token, parser uses it
+    instead of creating `LiteralExpr`.
+    """
+
+    __slots__ = ("_source", "_start", "_end")
+
+    def __init__(self, source: MappedSource, start: int, end: int) -> None:
+        # `value` is left unset, so it's looked up by `__getattr__`.
+        self._source: Final[MappedSource] = source
+        self._start: Final[int] = start
+        self._end: Final[int] = end
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "value":
+            return self._source.text(self._start, self._end)
+        raise AttributeError(name)
@@ -0,0 +1,153 @@
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import dataclass
+import glob
+import io
+import os
+import sys  # stdout, stderr, version_info
+from typing import Any, Final, TextIO
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.losos import Losos
+
+# Characters which make a path argument a glob pattern.
+_GLOB_CHARACTERS: Final[frozenset[str]] = frozenset("*?[")
+
+
+@dataclass(frozen=True, slots=True)
+class ScriptResult:
+    path: str
+    exit_code: int
+    # Everything the script printed, in order: (to stderr?, text).
+    output: tuple[tuple[bool, str], ...]
+    eliminated: int  # Nodes removed by optimizer
+
+
+def expand_paths(paths: Iterable[str]) -> list[str]:
+    """Expand directories (to `.lox` files inside, recursively) and glob
+    patterns (sorted, so the order is deterministic). Other paths are kept
+    as they are, even if they don't exist.
+    """
+
+    expanded: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            expanded.extend(
+                sorted(
+                    glob.glob(
+                        os.path.join(glob.escape(path), "**", "*.lox"), recursive=True
+                    )
+                )
+            )
+        elif _GLOB_CHARACTERS.intersection(path):
+            expanded.extend(sorted(glob.glob(path, recursive=True)))
+        else:
+            expanded.append(path)
+    return expanded
+
+
+def run_files(
+    paths: list[str],
+    *,
+    jobs: int = 1,
+    options: dict[str, Any] | None = None,
+    check: bool = False,
+) -> tuple[int, int]:
+    """Run scripts, each with its own `Losos` created with `options`.
+
+    With `check` scripts are only checked for syntax errors (see
+    `Losos.check_file`).
+
+    With `jobs` > 1 scripts are run by a pool of processes. Output of every
+    script is captured and written to stdout/stderr as soon as it and all
+    scripts before it are finished, so it comes in the same order as if they
+    were run one after another.
+
+    Script which can't be read (missing file, invalid UTF-8) does not stop
+    the others, its error is printed with its output.
+
+    Return exit code (65 if any script had syntax error or invalid UTF-8,
+    else 70 if any had runtime error, else 66 if any could not be read,
+    else 0) and number of nodes removed by optimizer.
+    """
+
+    options = options or {}
+    if jobs <= 1:
+        return _collect(run_script(path, options, check) for path in paths)
+
+    # Bigger chunks for many small scripts, to save on interprocess
+    # communication, but not so big that some workers are left idle.
+    chunksize: int = max(1, min(64, len(paths) // (jobs * 4)))
+    with ProcessPoolExecutor(jobs) as executor:
+        return _collect(
+            executor.map(
+                run_script,
+                paths,
+                [options] * len(paths),
+                [check] * len(paths),
+                chunksize=chunksize,
+            )
+        )
+
+
+def run_script(path: str, options: dict[str, Any], check: bool = False) -> ScriptResult:
+    """Run (or check) one script, capturing its output."""
+
+    output: list[tuple[bool, str]] = []
+    with redirect_stdout(_Capture(output, False)), redirect_stderr(
+        _Capture(output, True)
+    ):
+        losos: Losos = Losos(**options)
+        exit_code: int = losos.check_file(path) if check else losos.run_file(path)
+
+    return ScriptResult(path, exit_code, _merge(output), losos.eliminated_nodes())
+
+
+class _Capture(io.TextIOBase):
+    def __init__(self, output: list[tuple[bool, str]], stderr: bool) -> None:
+        self._output: Final[list[tuple[bool, str]]] = output
+        self._stderr: Final[bool] = stderr
+
+    @override
+    def write(self, text: str) -> int:
+        self._output.append((self._stderr, text))
+        return len(text)
+
+
+def _merge(output: list[tuple[bool, str]]) -> tuple[tuple[bool, str], ...]:
+    """Join consecutive writes to the same stream."""
+
+    merged: list[tuple[bool, str]] = []
+    parts: list[str] = []
+    for i, (stderr, text) in enumerate(output):
+        parts.append(text)
+        if i + 1 == len(output) or output[i + 1][0] != stderr:
+            merged.append((stderr, "".join(parts)))
+            parts.clear()
+    return tuple(merged)
+
+
+def _collect(results: Iterable[ScriptResult]) -> tuple[int, int]:
+    exit_codes: set[int] = set()
+    eliminated: int = 0
+    for result in results:
+        for stderr, text in result.output:
+            stream: TextIO = sys.stderr if stderr else sys.stdout
+            stream.write(text)
+            # Keep stdout and stderr interleaved like the script wrote them.
+            stream.flush()
+        exit_codes.add(result.exit_code)
+        eliminated += result.eliminated
+
+    if 65 in exit_codes:
+        return 65, eliminated
+    if 70 in exit_codes:
+        return 70, eliminated
+    if 66 in exit_codes:
+        return 66, eliminated
+    return 0, eliminated
@@ -0,0 +1,104 @@
+import sys  # version_info
+from typing import Any, Final
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.expr import *
+from losos.interpreter import Interpreter
+from losos.reporter import Reporter
+from losos.runtimeerror import LososRuntimeError
+
+
+class Optimizer(ExprVisitor[Expr]):
+    """Fold constant subtrees and strip redundant groupings.
+
+    Every subtree made only of literals is evaluated once, here, and replaced
+    with a `LiteralExpr`. Subtrees which would fail at runtime are left in
+    place, so the error is still reported when (and where) it happens.
+    """
+
+    def __init__(self) -> None:
+        # Folding uses the interpreter itself, so semantics are the same.
+        self._interpreter: Final[Interpreter] = Interpreter(reporter=Reporter())
+        self.eliminated: int = 0  # Number of removed nodes
+
+    def optimize(self, expr: Expr) -> Expr:
+        """Return optimized tree (without recursion)."""
+
+        # Postorder, so children are already optimized (on `done` stack).
+        done: list[Expr] = []
+        work: list[tuple[Expr, bool]] = [(expr, False)]
+
+        while work:
+            node, visited = work.pop()
+
+            if isinstance(node, GroupingExpr):
+                # Tree structure already holds the grouping.
+                self.eliminated += 1
+                work.append((node.expression, False))
+
+            elif isinstance(node, BinaryExpr):
+                if not visited:
+                    work.append((node, True))
+                    work.append((node.right, False))
+                    work.append((node.left, False))
+                    continue
+                right: Expr = done.pop()
+                left: Expr = done.pop()
+                binary: BinaryExpr = BinaryExpr(left, node.operator, right)
+                if isinstance(left, LiteralExpr) and isinstance(right, LiteralExpr):
+                    done.append(self._fold(binary, 2))
+                else:
+                    done.append(binary)
+
+            elif isinstance(node, UnaryExpr):
+                if not visited:
+                    work.append((node, True))
+                    work.append((node.right, False))
+                    continue
+                operand: Expr = done.pop()
+                unary: UnaryExpr = UnaryExpr(node.operator, operand)
+                if isinstance(operand, LiteralExpr):
+                    done.append(self._fold(unary, 1))
+                else:
+                    done.append(unary)
+
+            else:
+                done.append(node.accept(self))
+
+        return done[-1]
+
+    @override
+    def visit_binary_expr(self, expr: BinaryExpr) -> Expr:
+        return self.optimize(expr)
+
+    @override
+    def visit_grouping_expr(self, expr: GroupingExpr) -> Expr:
+        return self.optimize(expr)
+
+    @override
+    def visit_literal_expr(self, expr: LiteralExpr) -> Expr:
+        return expr
+
+    @override
+    def visit_variable_expr(self, expr: VariableExpr) -> Expr:
+        # Value is known only at runtime.
+        return expr
+
+    @override
+    def visit_unary_expr(self, expr: UnaryExpr) -> Expr:
+        return self.optimize(expr)
+
+    def _fold(self, expr: Expr, children: int) -> Expr:
+        """Replace `expr` (with literal `children`) by its value, if possible."""
+        try:
+            value: Any = expr.accept(self._interpreter)
+        except LososRuntimeError as error:
+            # Leave it for runtime (division by zero included).
+            return expr
+
+        self.eliminated += children
+        return LiteralExpr(value)
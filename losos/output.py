@@ -0,0 +1,107 @@
+from abc import ABC, abstractmethod
+import struct
+import sys  # stdout, version_info
+from typing import BinaryIO, Final, TextIO
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+
+class OutputSink(ABC):
+    """Destination of results printed by `Interpreter`."""
+
+    @abstractmethod
+    def write(self, text: str) -> None:
+        """Output one result (text of the value, without newline)."""
+
+    def flush(self) -> None:
+        """Write out buffered results, if any."""
+
+
+class TextOutput(OutputSink):
+    """Results as lines of text, like the book's `print`.
+
+    Lines are buffered and written out in batches of `buffer_size`
+    characters (0 writes every line at once, like `print`).
+    """
+
+    def __init__(
+        self, stream: TextIO | None = None, *, buffer_size: int = 1 << 20
+    ) -> None:
+        # None: `sys.stdout` at the time of writing (so it can be redirected).
+        self._stream: Final[TextIO | None] = stream
+        self._buffer_size: Final[int] = buffer_size
+        self._lines: Final[list[str]] = []
+        self._buffered: int = 0
+
+    @override
+    def write(self, text: str) -> None:
+        if not self._buffer_size:
+            stream: TextIO = sys.stdout if self._stream is None else self._stream
+            stream.write(text + "\n")
+            return
+        self._lines.append(text)
+        self._buffered += len(text) + 1
+        if self._buffered >= self._buffer_size:
+            self.flush()
+
+    @override
+    def flush(self) -> None:
+        if not self._lines:
+            return
+        stream: TextIO = sys.stdout if self._stream is None else self._stream
+        self._lines.append("")  # Newline after the last line
+        stream.write("\n".join(self._lines))
+        stream.flush()
+        self._lines.clear()
+        self._buffered = 0
+
+
+class MemoryOutput(OutputSink):
+    """Keep results in memory, for callers which inspect them."""
+
+    def __init__(self) -> None:
+        self.results: Final[list[str]] = []
+
+    @override
+    def write(self, text: str) -> None:
+        self.results.append(text)
+
+
+# Length of UTF-8 encoded result, before it.
+_FRAME_HEADER: Final[struct.Struct] = struct.Struct(">I")
+
+
+class FramedOutput(OutputSink):
+    """Results as binary frames, for other programs: 4-byte big-endian
+    length followed by UTF-8 encoded text (results may contain newlines).
+
+    Frames are buffered like lines of `TextOutput`.
+    """
+
+    def __init__(
+        self, stream: BinaryIO | None = None, *, buffer_size: int = 1 << 20
+    ) -> None:
+        # None: `sys.stdout.buffer` at the time of flush.
+        self._stream: Final[BinaryIO | None] = stream
+        self._buffer_size: Final[int] = buffer_size
+        self._buffer: Final[bytearray] = bytearray()
+
+    @override
+    def write(self, text: str) -> None:
+        data: bytes = text.encode()
+        self._buffer.extend(_FRAME_HEADER.pack(len(data)))
+        self._buffer.extend(data)
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    @override
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        stream: BinaryIO = sys.stdout.buffer if self._stream is None else self._stream
+        stream.write(self._buffer)
+        stream.flush()
+        self._buffer.clear()
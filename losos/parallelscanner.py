@@ -0,0 +1,168 @@
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+import os
+import sys  # version_info
+from typing import Final
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.diagnostics import Diagnostic, MemorySink
+from losos.fastscanner import FastScanner
+from losos.reporter import Reporter
+from losos.token import Token
+from losos.tokenbuffer import TokenBuffer
+from losos.tokentype import TokenType
+
+
+class ParallelScanner(FastScanner):
+    """`FastScanner` which scans large sources in a pool of `jobs` processes.
+
+    Source is split after newlines into parts of at least `split_size`
+    characters, which are scanned at once as if they started outside of a
+    string. Then their tokens are joined in order. A part which actually
+    starts inside a string (which began in a previous part) is scanned
+    again from the start of the string. Line of every part is known before
+    scanning, as the scanner counts all newlines (in strings too), so tokens
+    and errors are exactly the same as `FastScanner` gives, in the same
+    order.
+
+    Streamed sources are read whole first. Sources shorter than two parts
+    are scanned by `FastScanner` itself. `scan_buffer` is the fastest, as
+    `Token` objects are then created only when they are accessed.
+    """
+
+    def __init__(
+        self,
+        source: str | Iterable[str],
+        *,
+        reporter: Reporter,
+        chunk_size: int = 65536,
+        jobs: int | None = None,
+        split_size: int = 1 << 22,
+    ) -> None:
+        super().__init__(source, reporter=reporter, chunk_size=chunk_size)
+        self._jobs: Final[int] = jobs or os.cpu_count() or 1
+        self._split_size: Final[int] = split_size
+
+    @override
+    def scan_tokens(self) -> list[Token]:
+        if not self._parallel():
+            return super().scan_tokens()
+        return list(self.scan_buffer())
+
+    @override
+    def iter_tokens(self) -> Iterator[Token]:
+        if not self._parallel():
+            return super().iter_tokens()
+        return iter(self.scan_buffer())
+
+    @override
+    def scan_buffer(self) -> TokenBuffer:
+        if not self._parallel():
+            return super().scan_buffer()
+
+        source: str = self._source
+        length: int = len(source)
+        split: int = self._split_size
+        bounds: list[int] = [0]
+        while True:
+            newline: int = source.find("\n", bounds[-1] + split)
+            if newline < 0 or newline + 1 >= length:
+                break
+            bounds.append(newline + 1)
+        bounds.append(length)
+        lines: list[int] = [1]
+        for start, stop in zip(bounds, bounds[1:]):
+            lines.append(lines[-1] + source.count("\n", start, stop))
+
+        buffer: TokenBuffer = TokenBuffer(source)
+        position: int = 0
+        with ProcessPoolExecutor(
+            min(self._jobs, len(bounds) - 1),
+            initializer=_start_worker,
+            initargs=(source,),
+        ) as executor:
+            # Parts are joined while the rest of them is being scanned.
+            for start, (tokens, errors, end) in zip(
+                bounds,
+                executor.map(_scan_part, bounds, bounds[1:], lines),
+            ):
+                while position < start:
+                    position = self._rescan(buffer, position, bounds, lines)
+                if position > start:
+                    continue  # Rescanned with a string before it
+                buffer.extend(tokens)
+                for error in errors:
+                    self._reporter.error(error.line, error.message)
+                position = end
+
+        buffer.append(TokenType.EOF, length, length, None, lines[-1])
+        self._start = self._current = length
+        self._line = lines[-1]
+
+        return buffer
+
+    def _parallel(self) -> bool:
+        """Return True if the source is worth scanning in parallel (read
+        whole streamed source first).
+        """
+
+        if self._jobs <= 1:
+            return False
+        if self._chunks is not None:
+            self._source += "".join(self._chunks)
+            self._chunks = None
+        return len(self._source) >= 2 * self._split_size
+
+    def _rescan(
+        self, buffer: TokenBuffer, position: int, bounds: list[int], lines: list[int]
+    ) -> int:
+        """Scan source from `position`, where a string starts, until the end
+        of the part in which it ends (or further, if another string starts
+        there and does not end in it). Return where scanning stopped.
+        """
+
+        source: str = self._source
+        close: int = source.find('"', position + 1)
+        stop: int = len(source) if close < 0 else bounds[bisect_right(bounds, close)]
+        part: int = bisect_right(bounds, position) - 1
+        line: int = lines[part] + source.count("\n", bounds[part], position)
+
+        scanner: FastScanner = FastScanner(source, reporter=self._reporter)
+        tokens, end = scanner.scan_fragment(
+            line, final=stop == len(source), start=position, stop=stop
+        )
+        buffer.extend(tokens)
+        return end
+
+
+# Whole source, given to worker processes once (inherited, if they are
+# forked).
+_worker_source: str = ""
+
+
+def _start_worker(source: str) -> None:
+    global _worker_source
+    _worker_source = source
+
+
+def _scan_part(
+    start: int, stop: int, line: int
+) -> tuple[TokenBuffer, list[Diagnostic], int]:
+    """Scan `_worker_source[start:stop]` starting at `line`, return its
+    tokens, errors and offset where scanning stopped.
+    """
+
+    sink: MemorySink = MemorySink()
+    scanner: FastScanner = FastScanner(_worker_source, reporter=Reporter(sink=sink))
+    part, end = scanner.scan_fragment(
+        line, final=stop == len(_worker_source), start=start, stop=stop
+    )
+    # Only tokens are sent back, the parent has the source.
+    tokens: TokenBuffer = TokenBuffer("")
+    tokens.extend(part)
+    return tokens, sink.diagnostics, end
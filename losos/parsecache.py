@@ -0,0 +1,56 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from hashlib import blake2b
+from typing import Any, Final
+
+from losos.diagnostics import Diagnostic
+
+
+@dataclass(frozen=True, slots=True)
+class ParseResult:
+    # Parsed (and maybe optimized and compiled) expression, None on error
+    program: Any
+    # Syntax errors as returned by `Reporter.recorded`
+    errors: tuple[Diagnostic, ...]
+    # Nodes removed by optimizer
+    eliminated: int
+
+
+class ParseCache:
+    """LRU cache of parse results, keyed by hash of the source text."""
+
+    def __init__(self, maxsize: int = 128) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.maxsize: Final[int] = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: Final[OrderedDict[bytes, ParseResult]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(source: str) -> bytes:
+        return blake2b(source.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def get(self, key: bytes) -> ParseResult | None:
+        result: ParseResult | None = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key: bytes, result: ParseResult) -> None:
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,9 +1,11 @@
-from typing import Final
+from collections.abc import Iterator, Sequence
+from typing import Any, Final
 
 from losos.expr import *
 from losos.reporter import Reporter
 from losos.token import Token
 from losos.tokentype import TokenType
+from losos.tokenwindow import TokenWindow
 
 
 # ``This is a simple sentinel class we use to unwind the parser.``
@@ -12,16 +14,80 @@ class _ParseError(Exception):
 
 
 class Parser:
-    def __init__(self, tokens: list[Token], *, reporter: Reporter) -> None:
-        self._tokens: Final[list[Token]] = tokens
+    def __init__(
+        self, tokens: Sequence[Token] | Iterator[Token], *, reporter: Reporter
+    ) -> None:
+        # Tokens may be also pulled lazily from iterator (streaming mode).
+        self._tokens: Final[Sequence[Token] | TokenWindow] = (
+            TokenWindow(tokens) if isinstance(tokens, Iterator) else tokens
+        )
         self._current: int = 0
         self._reporter: Reporter = reporter
+        # In streaming mode scanner errors may follow the parse error, so
+        # parse errors are held back until all tokens were scanned. This
+        # keeps the order of reported errors the same as in normal mode.
+        self._deferred_errors: list[tuple[Token, str]] | None = (
+            [] if isinstance(self._tokens, TokenWindow) else None
+        )
 
     def parse(self) -> Expr | None:
         try:
             return self._expression()
         except _ParseError as error:  # _ParseError is never propagated up
             return None
+        finally:
+            self._finish()
+
+    def parse_statements(self) -> list[Expr]:
+        """Parse semicolon-terminated expressions up to the end of tokens.
+
+        After a syntax error the parser skips to the next statement (see
+        `_synchronize`), so all errors are reported in one pass. Return trees
+        of statements without errors.
+        """
+
+        statements: list[Expr] = []
+        try:
+            while not self._is_at_end():
+                statement: Expr | None = self._declaration()
+                if statement is not None:
+                    statements.append(statement)
+        finally:
+            self._finish()
+
+        return statements
+
+    def parse_statement(self, index: int) -> tuple[Expr | None, int]:
+        """Parse one statement (see `parse_statements`) starting at token
+        `index`, for incremental re-parsing (see `incremental.py`). Return its
+        tree (None on error) and index of the token after it.
+        """
+
+        if self._deferred_errors is not None:
+            raise ValueError("Statement can't be parsed from token stream")
+
+        self._current = index
+        return self._declaration(), self._current
+
+    def _finish(self) -> None:
+        if isinstance(self._tokens, TokenWindow):
+            self._tokens.drain()
+        if self._deferred_errors:
+            for token, message in self._deferred_errors:
+                self._reporter.error(token, message)
+            self._deferred_errors.clear()
+
+    def _declaration(self) -> Expr | None:
+        try:
+            return self._expression_statement()
+        except _ParseError as error:
+            self._synchronize()
+            return None
+
+    def _expression_statement(self) -> Expr:
+        expr: Expr = self._expression()
+        self._consume(TokenType.SEMICOLON, "Expect ';' after expression.")
+        return expr
 
     def _expression(self) -> Expr:
         return self._equality()
@@ -90,7 +156,14 @@ class Parser:
             return LiteralExpr(None)
 
         if self._match(TokenType.NUMBER, TokenType.STRING):
-            return LiteralExpr(self._previous().literal)
+            literal: Any = self._previous().literal
+            # `MappedScanner` gives nodes of strings as their literals.
+            if isinstance(literal, LiteralExpr):
+                return literal
+            return LiteralExpr(literal)
+
+        if self._match(TokenType.IDENTIFIER):
+            return VariableExpr(self._previous())
 
         if self._match(TokenType.LEFT_PAREN):
             expr: Expr = self._expression()
@@ -131,7 +204,10 @@ class Parser:
         return self._tokens[self._current - 1]
 
     def _error(self, token: Token, message: str) -> _ParseError:
-        self._reporter.error(token, message)
+        if self._deferred_errors is None:
+            self._reporter.error(token, message)
+        else:
+            self._deferred_errors.append((token, message))
         return _ParseError()
 
     def _synchronize(self) -> None:
@@ -0,0 +1,250 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from functools import partial
+import json
+import sys  # getallocatedblocks
+import time
+from typing import Any, Final, TypeVar
+
+from losos.expr import *
+from losos.interpreter import Interpreter
+from losos.iterativeinterpreter import IterativeInterpreter
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class PhaseStats:
+    calls: int = 0
+    wall: float = 0.0  # Seconds
+    cpu: float = 0.0  # Seconds of process time
+    # Net number of memory blocks allocated (and not freed) by the phase.
+    blocks: int = 0
+
+
+@dataclass(slots=True)
+class VisitStats:
+    calls: int = 0
+    # Seconds spent in the method, including nested visits. Like `cProfile`,
+    # recursive calls are timed only once, by the outermost one.
+    time: float = 0.0
+
+
+class Profile:
+    """Where time goes in `Losos`: timers of pipeline phases (scan, parse,
+    optimize, compile, execute), counters (tokens, nodes, cache hits) and
+    calls of `visit_*` methods of instrumented visitors.
+
+    Nothing is measured unless `Losos` was created with `profile=True`,
+    then every run adds to the same `Profile`.
+    """
+
+    def __init__(self) -> None:
+        self.phases: Final[dict[str, PhaseStats]] = {}
+        self.counters: Final[dict[str, int]] = {}
+        self.visits: Final[dict[str, VisitStats]] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        stats: PhaseStats = self.phases.setdefault(name, PhaseStats())
+        blocks: int = sys.getallocatedblocks()
+        cpu: float = time.process_time()
+        wall: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.wall += time.perf_counter() - wall
+            stats.cpu += time.process_time() - cpu
+            stats.blocks += sys.getallocatedblocks() - blocks
+            stats.calls += 1
+
+    def timed(self, name: str, function: Callable[..., T]) -> Callable[..., T]:
+        """Return `function` which runs as phase `name`."""
+
+        def timed(*args: Any) -> T:
+            with self.phase(name):
+                return function(*args)
+
+        return timed
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def instrument(self, visitor: ExprVisitor[Any]) -> None:
+        """Count calls of `visit_*` methods of `visitor` (this instance only)
+        and time spent in them.
+
+        `IterativeInterpreter` doesn't call them, so it's switched to
+        recursive dispatch of `Interpreter`. Should a tree be too deep for
+        that, what was measured of it is dropped and it's evaluated again
+        iteratively, which is safe as evaluation of expressions has no side
+        effects. Then every node counts as a visit, but only the root's one
+        is timed.
+        """
+
+        prefix: str = type(visitor).__name__ + "."
+        instrumented: list[VisitStats] = []
+        for name in dir(visitor):
+            if name.startswith("visit_"):
+                stats: VisitStats = self.visits.setdefault(prefix + name, VisitStats())
+                setattr(visitor, name, _timed(getattr(visitor, name), stats))
+                instrumented.append(stats)
+
+        if isinstance(visitor, IterativeInterpreter):
+            recursive: Callable[[Expr], Any] = partial(Interpreter._evaluate, visitor)
+            iterative: Callable[[Expr], Any] = visitor._evaluate
+            nested: bool = False
+
+            def evaluate(expr: Expr) -> Any:
+                nonlocal nested
+                if nested:
+                    return recursive(expr)
+
+                saved: list[tuple[VisitStats, int, float]] = [
+                    (stats, stats.calls, stats.time) for stats in instrumented
+                ]
+                nested = True
+                try:
+                    return recursive(expr)
+                except RecursionError:
+                    for stats, calls, spent in saved:
+                        stats.calls = calls
+                        stats.time = spent
+                    self.count("uninstrumented trees")
+                    for kind, calls in _visits(expr).items():
+                        counted: VisitStats = self.visits.setdefault(
+                            prefix + kind, VisitStats()
+                        )
+                        counted.calls += calls
+                    start: float = time.perf_counter()
+                    try:
+                        return iterative(expr)
+                    finally:
+                        root: str = prefix + _VISITS.get(type(expr), "")
+                        if root in self.visits:
+                            self.visits[root].time += time.perf_counter() - start
+                finally:
+                    nested = False
+
+            setattr(visitor, "_evaluate", evaluate)
+
+    def clear(self) -> None:
+        self.phases.clear()
+        self.counters.clear()
+        self.visits.clear()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "phases": {name: asdict(stats) for name, stats in self.phases.items()},
+            "counters": dict(self.counters),
+            "visits": {
+                name: asdict(stats)
+                for name, stats in self.visits.items()
+                if stats.calls
+            },
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.as_dict())
+
+    def format_table(self) -> str:
+        lines: list[str] = [
+            f"{'phase':<12}{'calls':>8}{'wall ms':>12}{'cpu ms':>12}{'blocks':>12}"
+        ]
+        for name, phase in self.phases.items():
+            lines.append(
+                f"{name:<12}{phase.calls:>8}{phase.wall * 1000:>12.3f}"
+                f"{phase.cpu * 1000:>12.3f}{phase.blocks:>+12}"
+            )
+
+        if self.counters:
+            lines.append("")
+            lines.append(f"{'counter':<32}{'value':>12}")
+            for name, value in self.counters.items():
+                lines.append(f"{name:<32}{value:>12}")
+
+        visits: list[tuple[str, VisitStats]] = sorted(
+            ((name, stats) for name, stats in self.visits.items() if stats.calls),
+            key=lambda item: item[1].time,
+            reverse=True,
+        )
+        if visits:
+            lines.append("")
+            lines.append(f"{'visit':<44}{'calls':>12}{'cumulative ms':>16}")
+            for name, stats in visits:
+                lines.append(f"{name:<44}{stats.calls:>12}{stats.time * 1000:>16.3f}")
+
+        return "\n".join(lines)
+
+
+def count_nodes(expr: Expr) -> int:
+    """Return number of nodes in the tree (without recursion)."""
+
+    count: int = 0
+    work: list[Expr] = [expr]
+    while work:
+        node: Expr = work.pop()
+        count += 1
+        if type(node) is BinaryExpr:
+            work.append(node.left)
+            work.append(node.right)
+        elif type(node) is GroupingExpr:
+            work.append(node.expression)
+        elif type(node) is UnaryExpr:
+            work.append(node.right)
+    return count
+
+
+# Methods which `IterativeInterpreter` doesn't call for these nodes.
+_VISITS: Final[dict[type[Expr], str]] = {
+    BinaryExpr: "visit_binary_expr",
+    GroupingExpr: "visit_grouping_expr",
+    LiteralExpr: "visit_literal_expr",
+    UnaryExpr: "visit_unary_expr",
+    VariableExpr: "visit_variable_expr",
+}
+
+
+def _visits(expr: Expr) -> dict[str, int]:
+    """Return number of nodes in the tree by name of their `visit_*` method.
+    Other nodes (and their subtrees) dispatch themselves, so are skipped.
+    """
+
+    visits: dict[str, int] = {}
+    work: list[Expr] = [expr]
+    while work:
+        node: Expr = work.pop()
+        kind: str | None = _VISITS.get(type(node))
+        if kind is None:
+            continue
+        visits[kind] = visits.get(kind, 0) + 1
+        if type(node) is BinaryExpr:
+            work.append(node.left)
+            work.append(node.right)
+        elif type(node) is GroupingExpr:
+            work.append(node.expression)
+        elif type(node) is UnaryExpr:
+            work.append(node.right)
+    return visits
+
+
+def _timed(method: Callable[[Expr], Any], stats: VisitStats) -> Callable[[Expr], Any]:
+    clock: Callable[[], float] = time.perf_counter
+    active: bool = False
+
+    def timed(expr: Expr) -> Any:
+        nonlocal active
+        stats.calls += 1
+        if active:
+            return method(expr)
+
+        active = True
+        start: float = clock()
+        try:
+            return method(expr)
+        finally:
+            stats.time += clock() - start
+            active = False
+
+    return timed
@@ -1,22 +1,66 @@
-from functools import singledispatchmethod
+from collections.abc import Iterable
+from typing import Final, overload
 
-from losos.helpers import eprint
+from losos.diagnostics import Diagnostic, DiagnosticKind, DiagnosticSink, TextSink
 from losos.runtimeerror import LososRuntimeError
 from losos.token import Token
 from losos.tokentype import TokenType
 
 
 class Reporter:
-    def __init__(self) -> None:
+    def __init__(
+        self, *, sink: DiagnosticSink | None = None, max_errors: int | None = None
+    ) -> None:
         self._had_error = False
         self._had_runtime_error = False
+        # Diagnostics go there (buffered stderr by default, see `flush`).
+        self._sink: Final[DiagnosticSink] = TextSink() if sink is None else sink
+        # Diagnostics over the cap are counted, but not passed to the sink.
+        self._max_errors: Final[int | None] = max_errors
+        self._count: int = 0
+        self._suppressed: int = 0
+        # Reported errors are collected here while recording (see `record`).
+        self._recorded: list[Diagnostic] | None = None
 
     def _report(self, line: int, where: str, message: str) -> None:
-        eprint("[line ", line, "] Error", where, ": ", message, sep="")
+        self._emit(Diagnostic(DiagnosticKind.SYNTAX, line, where, message))
         self._had_error = True
 
+    def _emit(self, diagnostic: Diagnostic) -> None:
+        if self._recorded is not None and diagnostic.kind is DiagnosticKind.SYNTAX:
+            self._recorded.append(diagnostic)
+        self._count += 1
+        if self._max_errors is not None and self._count > self._max_errors:
+            self._suppressed += 1
+        else:
+            self._sink.emit(diagnostic)
+
+    def flush(self) -> None:
+        """Pass buffered diagnostics out of the sink."""
+        if self._suppressed:
+            self._sink.suppressed(self._suppressed)
+            self._suppressed = 0
+        self._sink.flush()
+
+    def record(self) -> None:
+        """Start collecting reported errors, so they can be replayed later."""
+        self._recorded = []
+
+    def recorded(self) -> list[Diagnostic]:
+        """Stop collecting reported errors and return them."""
+        recorded: list[Diagnostic] = self._recorded or []
+        self._recorded = None
+        return recorded
+
+    def replay(self, errors: Iterable[Diagnostic]) -> None:
+        """Report again errors returned by `recorded`."""
+        for error in errors:
+            self._emit(error)
+            self._had_error = True
+
     def clear(self) -> None:
         self._had_error = False
+        self._count = 0
 
     def had_error(self) -> bool:
         return self._had_error
@@ -27,27 +71,36 @@ class Reporter:
     def __bool__(self) -> bool:
         return self._had_error or self._had_runtime_error
 
-    # singledispatchmethod cos it's a way priettier than overload
-    @singledispatchmethod
-    def error(self, arg: object, message: str) -> None:
-        raise NotImplementedError(
-            "INTERNAL_ERROR: Reporter.error(): Unknown argument type(s)"
-        )
-        # From docs: original function is used if no better implementation is found.
-        # So throw internal error here, cos it just mean that bug is somewhere.
-        # Do not rely on catch all behaviour.
-
-    @error.register
-    def _(self, line: int, message: str) -> None:
-        self._report(line, "", message)
-
-    @error.register
-    def _(self, token: Token, message: str) -> None:
-        if token.type == TokenType.EOF:
-            self._report(token.line, " at end", message)
+    # Plain type check instead of `singledispatchmethod`, which is a lot
+    # slower and this is called for every error.
+    @overload
+    def error(self, arg: int, message: str) -> None: ...
+
+    @overload
+    def error(self, arg: Token, message: str) -> None: ...
+
+    def error(self, arg: int | Token, message: str) -> None:
+        if type(arg) is int:
+            self._report(arg, "", message)
+        elif isinstance(arg, Token):
+            if arg.type == TokenType.EOF:
+                self._report(arg.line, " at end", message)
+            else:
+                self._report(arg.line, " at '" + arg.lexeme + "'", message)
         else:
-            self._report(token.line, " at '" + token.lexeme + "'", message)
+            # Bug is somewhere, do not ignore it.
+            raise NotImplementedError(
+                "INTERNAL_ERROR: Reporter.error(): Unknown argument type(s)"
+            )
 
     def runtime_error(self, error: LososRuntimeError) -> None:
-        eprint(error.message, "\n[line ", error.token.line, "]", sep="")
+        token: Token = error.token
+        self._emit(
+            Diagnostic(
+                DiagnosticKind.RUNTIME,
+                token.line,
+                " at '" + token.lexeme + "'",
+                error.message,
+            )
+        )
         self._had_runtime_error = True
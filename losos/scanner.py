@@ -1,3 +1,6 @@
+from collections.abc import Iterable, Iterator
+from functools import partial
+from io import TextIOBase
 from typing import Any, Final
 
 import losos.helpers  # error
@@ -27,8 +30,24 @@ class Scanner:
         "while": TokenType.WHILE,
     }
 
-    def __init__(self, source: str, *, reporter: Reporter) -> None:
-        self._source: str = source
+    def __init__(
+        self,
+        source: str | Iterable[str],
+        *,
+        reporter: Reporter,
+        chunk_size: int = 65536,
+    ) -> None:
+        # Source is either whole text or file object / iterable of chunks,
+        # which is read lazily (see `_fill`).
+        self._chunks: Iterator[str] | None = None
+        if isinstance(source, str):
+            self._source: str = source
+        else:
+            self._source = ""
+            if isinstance(source, TextIOBase):
+                self._chunks = iter(partial(source.read, chunk_size), "")
+            else:
+                self._chunks = iter(source)
         self._tokens: list[Token] = []
         self._start: int = 0
         self._current: int = 0
@@ -44,6 +63,38 @@ class Scanner:
 
         return self._tokens
 
+    def iter_tokens(self) -> Iterator[Token]:
+        """Like `scan_tokens`, but yield tokens as soon as they are scanned."""
+
+        tokens: list[Token] = self._tokens
+        while not self._is_at_end():
+            self._start = self._current
+            self._scan_token()
+            if tokens:
+                yield from tokens
+                tokens.clear()
+
+        yield Token(TokenType.EOF, "", None, self._line)
+
+    def _fill(self) -> bool:
+        """Append next chunk of source to the buffer.
+        Return False if there is nothing more to read.
+        """
+
+        if self._chunks is None:
+            return False
+
+        for chunk in self._chunks:
+            if chunk:
+                # Drop what was already scanned, keep the current lexeme.
+                self._source = self._source[self._start :] + chunk
+                self._current -= self._start
+                self._start = 0
+                return True
+
+        self._chunks = None
+        return False
+
     def _scan_token(self) -> None:
         c: Char = self._advance()
 
@@ -192,7 +243,7 @@ class Scanner:
         return char_at(self._source, self._current)
 
     def _peek_next(self) -> Char:
-        if self._current + 1 >= len(self._source):
+        if self._current + 1 >= len(self._source) and not self._fill():
             return Char("")
 
         return char_at(self._source, self._current + 1)
@@ -207,7 +258,7 @@ class Scanner:
         return c.isdigit() and c.isascii()
 
     def _is_at_end(self) -> bool:
-        return self._current >= len(self._source)
+        return self._current >= len(self._source) and not self._fill()
 
     def _advance(self) -> Char:
         """Consume next character in the source and return it."""
@@ -0,0 +1,189 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
+import json
+import os
+from typing import Any, Final
+
+from losos.diagnostics import DiagnosticKind, MemorySink
+from losos.helpers import eprint
+from losos.losos import Losos
+from losos.output import MemoryOutput
+
+
+class Session:
+    """Own `Losos` (so own `Reporter` and `Interpreter`) of a connection,
+    which keeps what snippets print and report in memory.
+    """
+
+    def __init__(self, options: dict[str, Any]) -> None:
+        self._sink: Final[MemorySink] = MemorySink()
+        self._output: Final[MemoryOutput] = MemoryOutput()
+        self._losos: Final[Losos] = Losos(
+            **options, diagnostics=self._sink, output=self._output
+        )
+
+    def evaluate(self, source: str) -> dict[str, Any]:
+        """Run snippet, return response: what it printed, errors and exit
+        code (65 for syntax error, 70 for runtime error, like `run_file`).
+        """
+
+        # Left behind by a snippet which failed (see `Server._serve`).
+        self._output.results.clear()
+        self._sink.diagnostics.clear()
+
+        self._losos.run_source(source)
+
+        status: int = 0
+        for diagnostic in self._sink.diagnostics:
+            if diagnostic.kind is DiagnosticKind.SYNTAX:
+                status = 65
+                break
+            status = 70
+
+        response: dict[str, Any] = {
+            "output": "".join(result + "\n" for result in self._output.results),
+            "errors": [diagnostic.as_dict() for diagnostic in self._sink.diagnostics],
+            "status": status,
+        }
+        self._output.results.clear()
+        self._sink.diagnostics.clear()
+        return response
+
+
+class Server:
+    """Evaluation service. Every connection is a session, every line it
+    sends is a snippet of source, answered by a line of JSON like
+    `{"output": "3\\n", "errors": [], "status": 0}`, in order.
+
+    Expressions run in time proportional to their length (Lox has no loops
+    or calls yet), so snippets of up to `inline_limit` characters are run by
+    the session right away and longer ones by a pool of `workers`
+    processes, where they can't stall other sessions. A snippet can't change
+    its session (there are no statements yet), so pooled ones run in a new
+    session of the worker, never shared with other connections.
+    """
+
+    def __init__(
+        self,
+        *,
+        options: dict[str, Any] | None = None,
+        workers: int = 1,
+        inline_limit: int = 2048,
+        max_request: int = 1 << 24,
+    ) -> None:
+        # Passed to `Losos` of every session (and worker).
+        self._options: Final[dict[str, Any]] = dict(options or {})
+        self._workers: Final[int] = workers
+        self._inline_limit: Final[int] = inline_limit
+        # Longer lines are answered with an error and connection is closed.
+        self._max_request: Final[int] = max_request
+        self._pool: ProcessPoolExecutor | None = None
+
+    async def serve(self, address: str) -> None:
+        """Serve on `address` ("host:port" or path of Unix socket) until
+        cancelled.
+        """
+
+        self._pool = ProcessPoolExecutor(
+            self._workers, initializer=_start_worker, initargs=(self._options,)
+        )
+        host, colon, port = address.rpartition(":")
+        unix: bool = not (colon and port.isdigit())
+        try:
+            server: asyncio.Server
+            if not unix:
+                server = await asyncio.start_server(
+                    self._serve, host or None, int(port), limit=self._max_request
+                )
+            else:
+                server = await asyncio.start_unix_server(
+                    self._serve, address, limit=self._max_request
+                )
+
+            async with server:
+                for socket in server.sockets:
+                    eprint("Serving on", socket.getsockname())
+                await server.serve_forever()
+        finally:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+            if unix:
+                # Python < 3.13 leaves the socket file behind.
+                with suppress(FileNotFoundError):
+                    os.unlink(address)
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        session: Session = Session(self._options)
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    line: bytes = await reader.readline()
+                except ValueError:
+                    writer.write(
+                        _encode(
+                            {
+                                "output": "",
+                                "errors": [],
+                                "status": 64,
+                                "error": "Request is too long",
+                            }
+                        )
+                    )
+                    break
+                if not line:
+                    break
+
+                source: str = line.decode("utf-8", "replace").removesuffix("\n")
+                source = source.removesuffix("\r")
+                response: dict[str, Any]
+                try:
+                    if len(source) <= self._inline_limit:
+                        response = session.evaluate(source)
+                    else:
+                        response = await loop.run_in_executor(
+                            self._pool, _evaluate, source
+                        )
+                except Exception as e:
+                    # Only this request failed (e.g. worker process died).
+                    response = {
+                        "output": "",
+                        "errors": [],
+                        "status": 70,
+                        "error": _describe(e),
+                    }
+                writer.write(_encode(response))
+                await writer.drain()
+        except ConnectionError:
+            pass  # Client is gone
+        finally:
+            writer.close()
+            # Server may be closed (cancelling the handler) while waiting.
+            with suppress(ConnectionError, asyncio.CancelledError):
+                await writer.wait_closed()
+
+
+def _encode(response: dict[str, Any]) -> bytes:
+    return json.dumps(response).encode() + b"\n"
+
+
+def _describe(error: Exception) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+# Options of `Session`s of worker process, one per snippet it gets.
+_worker_options: dict[str, Any] | None = None
+
+
+def _start_worker(options: dict[str, Any]) -> None:
+    global _worker_options
+    _worker_options = options
+
+
+def _evaluate(source: str) -> dict[str, Any]:
+    if _worker_options is None:
+        raise RuntimeError("Worker was not started")
+    return Session(_worker_options).evaluate(source)
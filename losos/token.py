@@ -10,7 +10,7 @@ else:
 from losos.tokentype import TokenType
 
 
-@dataclass
+@dataclass(slots=True)
 class Token:
     type: TokenType
     lexeme: str
@@ -0,0 +1,106 @@
+from __future__ import annotations
+from array import array
+from collections.abc import Iterator, Sequence
+import sys  # version_info
+from typing import Any, Final, overload
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+from losos.token import Token
+from losos.tokentype import TokenType
+
+
+class TokenBuffer(Sequence[Token]):
+    """Compact storage for scanned tokens.
+
+    Instead of a list of `Token` objects it keeps parallel arrays of token
+    types, lexeme offsets into the source and line numbers, plus a side table
+    for literals. `Token` objects are created only when they are accessed,
+    so `Parser` and `Reporter` can consume the buffer like a list.
+    """
+
+    def __init__(self, source: str) -> None:
+        self._source: Final[str] = source
+        self._types: Final[array[int]] = array("B")
+        self._starts: Final[array[int]] = array("q")
+        self._ends: Final[array[int]] = array("q")
+        self._lines: Final[array[int]] = array("I")
+        self._literals: Final[dict[int, Any]] = {}
+        # Recently accessed tokens, `Parser` asks for the same ones repeatedly.
+        self._cache: Final[dict[int, Token]] = {}
+
+    def append(
+        self, type: TokenType, start: int, end: int, literal: Any | None, line: int
+    ) -> None:
+        if literal is not None:
+            self._literals[len(self._types)] = literal
+        self._types.append(type)
+        self._starts.append(start)
+        self._ends.append(end)
+        self._lines.append(line)
+
+    def extend(self, other: TokenBuffer) -> None:
+        """Append tokens of `other`, which was scanned from the same source."""
+
+        count: int = len(self._types)
+        for index, literal in other._literals.items():
+            self._literals[count + index] = literal
+        self._types.extend(other._types)
+        self._starts.extend(other._starts)
+        self._ends.extend(other._ends)
+        self._lines.extend(other._lines)
+
+    @override
+    def __len__(self) -> int:
+        return len(self._types)
+
+    @overload
+    def __getitem__(self, index: int) -> Token: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Token]: ...
+
+    @override
+    def __getitem__(self, index: int | slice) -> Token | list[Token]:
+        if isinstance(index, slice):
+            return [self._token(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self._types)
+
+        token: Token | None = self._cache.get(index)
+        if token is None:
+            token = self._token(index)
+            if len(self._cache) >= 4:
+                self._cache.clear()
+            self._cache[index] = token
+
+        return token
+
+    @override
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self._types)):
+            yield self._token(index)
+
+    def type(self, index: int) -> TokenType:
+        return TokenType(self._types[index])
+
+    def span(self, index: int) -> tuple[int, int]:
+        """Return start and end offset of token's lexeme in the source."""
+        return self._starts[index], self._ends[index]
+
+    def line(self, index: int) -> int:
+        return self._lines[index]
+
+    def _token(self, index: int) -> Token:
+        # Raises IndexError for invalid index, like list does.
+        type: TokenType = TokenType(self._types[index])
+        return Token(
+            type,
+            self._source[self._starts[index] : self._ends[index]],
+            self._literals.get(index),
+            self._lines[index],
+        )
@@ -0,0 +1,39 @@
+from collections import deque
+from collections.abc import Iterator
+from typing import Final
+
+from losos.token import Token
+
+
+class TokenWindow:
+    """Indexable view of a token iterator.
+
+    Tokens are pulled from the iterator on demand and only the last `size`
+    of them are kept, so memory use does not depend on the source length.
+    `Parser` needs just the current and the previous token.
+    """
+
+    def __init__(self, tokens: Iterator[Token], *, size: int = 2) -> None:
+        self._tokens: Final[Iterator[Token]] = tokens
+        self._window: Final[deque[Token]] = deque(maxlen=size)
+        self._offset: int = 0  # Index of the first token in the window
+
+    def __getitem__(self, index: int) -> Token:
+        position: int = index - self._offset
+        window: deque[Token] = self._window
+
+        while position >= len(window):
+            if len(window) == window.maxlen:
+                self._offset += 1
+                position -= 1
+            window.append(next(self._tokens))
+
+        if position < 0:
+            raise IndexError("Token is no longer buffered")
+
+        return window[position]
+
+    def drain(self) -> None:
+        """Consume remaining tokens (so all scanner errors get reported)."""
+        for _ in self._tokens:
+            pass
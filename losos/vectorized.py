@@ -0,0 +1,329 @@
+# Annotations use NumPy types, which may be missing.
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping, Sequence
+import sys  # version_info
+from typing import Any, Final, TypeAlias
+
+if sys.version_info >= (3, 12):
+    from typing import override
+else:
+    from typing_extensions import override
+
+try:
+    import numpy as np
+    from numpy.typing import NDArray
+except ImportError:  # NumPy is optional
+    NUMPY: bool = False
+else:
+    NUMPY = True
+
+from losos.batch import BatchEvaluator, BatchResult
+from losos.environment import Environment
+from losos.expr import *
+from losos.interpreter import Interpreter
+from losos.iterativeinterpreter import IterativeInterpreter
+from losos.reporter import Reporter
+from losos.runtimeerror import LososRuntimeError
+from losos.token import Token
+from losos.tokentype import TokenType
+
+# Value of a subexpression for all rows: float64 array (numbers), bool array
+# or a plain constant (the same for every row).
+_Value: TypeAlias = Any
+
+
+class _Unsupported(Exception):
+    """Expression can't be vectorized (it fails for every row)."""
+
+
+class VectorEvaluator:
+    """Evaluate one expression for many rows at once with NumPy.
+
+    Whole columns of numbers and booleans go through NumPy operations. Rows
+    which can't (value of other type than rest of its column, division by
+    zero) are evaluated one by one by scalar `IterativeInterpreter`, as are
+    all rows if types of the expression don't check (e.g. `"a" - x`), so
+    results and runtime errors are the same as `BatchEvaluator`'s.
+
+    Without NumPy every row is evaluated by `BatchEvaluator`.
+    """
+
+    def __init__(self, expr: Expr) -> None:
+        self._expr: Final[Expr] = expr
+        self._batch: Final[BatchEvaluator] = BatchEvaluator(expr)
+        # Number of rows evaluated by scalar fallback in last `evaluate`.
+        self.fallback_rows: int = 0
+
+    def evaluate(
+        self, columns: Mapping[str, Sequence[Any]], *, rows: int | None = None
+    ) -> BatchResult:
+        """Evaluate expression for every row of `columns` (see `BatchEvaluator`).
+
+        Columns can be NumPy arrays too.
+        """
+
+        if not NUMPY:
+            result: BatchResult = self._batch.evaluate(columns, rows=rows)
+            self.fallback_rows = len(result.values)
+            return result
+
+        count: int = _row_count(columns, rows)
+        arrays: dict[str, NDArray[Any]] = {}
+        fallback: NDArray[np.bool_] = np.zeros(count, dtype=np.bool_)
+        for name, column in columns.items():
+            array, invalid = _column(column)
+            arrays[name] = array
+            fallback |= invalid
+
+        try:
+            with np.errstate(all="ignore"):
+                evaluation: _Evaluation = _Evaluation(arrays, count)
+                value: _Value = evaluation.evaluate(self._expr)
+        except _Unsupported:
+            value = None
+            fallback[:] = True
+        else:
+            fallback |= evaluation.fallback
+
+        values: list[Any]
+        if isinstance(value, np.ndarray):
+            values = value.tolist()
+        else:
+            values = [value] * count
+
+        result = BatchResult(values)
+        indexes: list[int] = np.flatnonzero(fallback).tolist()
+        self.fallback_rows = len(indexes)
+        if indexes:
+            self._fallback(columns, indexes, result)
+        return result
+
+    def _fallback(
+        self, columns: Mapping[str, Sequence[Any]], rows: list[int], result: BatchResult
+    ) -> None:
+        environment: Environment = Environment()
+        bindings: dict[str, Any] = environment.values
+        interpreter: Interpreter = IterativeInterpreter(
+            reporter=Reporter(), environment=environment
+        )
+        expr: Expr = self._expr
+        values: list[Any] = result.values
+
+        for row in rows:
+            for name, column in columns.items():
+                bindings[name] = _scalar(column[row])
+            try:
+                values[row] = interpreter._evaluate(expr)
+            except LososRuntimeError as error:
+                values[row] = None
+                result.errors[row] = error
+
+
+class _Evaluation(ExprVisitor[_Value]):
+    """Evaluate expression over arrays, with the same semantics as
+    `Interpreter`. Rows for which it would divide by zero are marked in
+    `fallback`.
+    """
+
+    def __init__(self, arrays: dict[str, NDArray[Any]], count: int) -> None:
+        self._arrays: Final[dict[str, NDArray[Any]]] = arrays
+        # Constants are combined by the interpreter itself.
+        self._interpreter: Final[Interpreter] = Interpreter(reporter=Reporter())
+        self.fallback: NDArray[np.bool_] = np.zeros(count, dtype=np.bool_)
+
+    def evaluate(self, expr: Expr) -> _Value:
+        """Return value of the tree (evaluated without recursion)."""
+
+        # Postorder, so operands are already evaluated (on `values` stack).
+        values: list[_Value] = []
+        work: list[tuple[Expr, bool]] = [(expr, False)]
+
+        while work:
+            node, visited = work.pop()
+            if isinstance(node, BinaryExpr):
+                if visited:
+                    right: _Value = values.pop()
+                    values[-1] = self._binary(node.operator, values[-1], right)
+                else:
+                    work.append((node, True))
+                    work.append((node.right, False))
+                    work.append((node.left, False))
+            elif isinstance(node, GroupingExpr):
+                work.append((node.expression, False))
+            elif isinstance(node, UnaryExpr):
+                if visited:
+                    values[-1] = self._unary(node.operator, values[-1])
+                else:
+                    work.append((node, True))
+                    work.append((node.right, False))
+            else:
+                values.append(node.accept(self))
+
+        return values[-1]
+
+    @override
+    def visit_binary_expr(self, expr: BinaryExpr) -> _Value:
+        return self.evaluate(expr)
+
+    def _binary(self, operator: Token, left: _Value, right: _Value) -> _Value:
+        if not isinstance(left, np.ndarray) and not isinstance(right, np.ndarray):
+            return self._constant(
+                lambda: self._interpreter._binary(operator, left, right)
+            )
+
+        if operator.type in (TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL):
+            equal: _Value
+            if _is_numeric(left) and _is_numeric(right):
+                # `Interpreter._is_equal` compares bools and numbers too.
+                equal = left == right
+            else:
+                # String or nil never equals a number or a bool.
+                equal = False
+            if operator.type == TokenType.EQUAL_EQUAL:
+                return equal
+            return ~equal if isinstance(equal, np.ndarray) else not equal
+
+        if not (_is_number(left) and _is_number(right)):
+            raise _Unsupported()
+
+        if operator.type == TokenType.GREATER:
+            return np.greater(left, right)
+        if operator.type == TokenType.GREATER_EQUAL:
+            return np.greater_equal(left, right)
+        if operator.type == TokenType.LESS:
+            return np.less(left, right)
+        if operator.type == TokenType.LESS_EQUAL:
+            return np.less_equal(left, right)
+        if operator.type == TokenType.MINUS:
+            return np.subtract(left, right, dtype=np.float64)
+        if operator.type == TokenType.PLUS:
+            return np.add(left, right, dtype=np.float64)
+        if operator.type == TokenType.STAR:
+            return np.multiply(left, right, dtype=np.float64)
+
+        # TokenType.SLASH, rows dividing by zero fail in scalar fallback.
+        self.fallback |= np.equal(right, 0.0)
+        return np.divide(left, right, dtype=np.float64)
+
+    @override
+    def visit_grouping_expr(self, expr: GroupingExpr) -> _Value:
+        return self.evaluate(expr.expression)
+
+    @override
+    def visit_literal_expr(self, expr: LiteralExpr) -> _Value:
+        return expr.value
+
+    @override
+    def visit_unary_expr(self, expr: UnaryExpr) -> _Value:
+        return self.evaluate(expr)
+
+    def _unary(self, operator: Token, right: _Value) -> _Value:
+        if not isinstance(right, np.ndarray):
+            return self._constant(lambda: self._interpreter._unary(operator, right))
+
+        if operator.type == TokenType.BANG:
+            # Numbers are truthy.
+            return ~right if right.dtype == np.bool_ else False
+
+        # TokenType.MINUS
+        if right.dtype != np.float64:
+            raise _Unsupported()
+        return np.negative(right)
+
+    @override
+    def visit_variable_expr(self, expr: VariableExpr) -> _Value:
+        array: NDArray[Any] | None = self._arrays.get(expr.name.lexeme)
+        if array is None:
+            # Undefined variable.
+            raise _Unsupported()
+        return array
+
+    def _constant(self, evaluate: Callable[[], Any]) -> _Value:
+        try:
+            return evaluate()
+        except LososRuntimeError as error:
+            raise _Unsupported()
+
+
+def _is_number(value: _Value) -> bool:
+    if isinstance(value, np.ndarray):
+        return bool(value.dtype == np.float64)
+    return type(value) is float
+
+
+def _is_numeric(value: _Value) -> bool:
+    if isinstance(value, np.ndarray):
+        return True
+    return type(value) is float or type(value) is bool
+
+
+def _row_count(columns: Mapping[str, Sequence[Any]], rows: int | None) -> int:
+    lengths: set[int] = {len(column) for column in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError("All columns must have the same length")
+    if lengths:
+        (count,) = lengths
+        if rows is not None and rows != count:
+            raise ValueError(f"Expected {rows} rows, columns have {count}")
+        return count
+    if rows is None:
+        raise ValueError("Number of rows is needed if there are no columns")
+    return rows
+
+
+def _column(
+    column: Sequence[Any] | NDArray[Any],
+) -> tuple[NDArray[Any], NDArray[np.bool_]]:
+    """Convert column to float64 or bool array.
+
+    Return the array and mask of rows whose values do not fit it.
+    """
+
+    count: int = len(column)
+    if isinstance(column, np.ndarray):
+        if column.dtype == np.bool_:
+            return column, np.zeros(count, dtype=np.bool_)
+        if column.dtype.kind in "iuf":
+            return column.astype(np.float64, copy=False), np.zeros(
+                count, dtype=np.bool_
+            )
+        column = column.tolist()
+
+    types: set[type] = set(map(type, column))
+    if types <= {float, int}:
+        return np.array(column, dtype=np.float64), np.zeros(count, dtype=np.bool_)
+    if types == {bool}:
+        return np.array(column, dtype=np.bool_), np.zeros(count, dtype=np.bool_)
+
+    # Mixed column: vectorize its most common type, the rest falls back.
+    numbers: NDArray[np.bool_] = np.fromiter(
+        (type(value) is float or type(value) is int for value in column),
+        dtype=np.bool_,
+        count=count,
+    )
+    bools: NDArray[np.bool_] = np.fromiter(
+        (type(value) is bool for value in column), dtype=np.bool_, count=count
+    )
+    if numbers.sum() >= bools.sum():
+        array: NDArray[Any] = np.fromiter(
+            (
+                value if type(value) is float or type(value) is int else 0.0
+                for value in column
+            ),
+            dtype=np.float64,
+            count=count,
+        )
+        return array, ~numbers
+    array = np.fromiter(
+        (value is True for value in column), dtype=np.bool_, count=count
+    )
+    return array, ~bools
+
+
+def _scalar(value: Any) -> Any:
+    if NUMPY and isinstance(value, np.generic):
+        value = value.item()
+    if type(value) is int:
+        return float(value)
+    return value
@@ -0,0 +1,143 @@
+from typing import Any, Final
+
+from losos.bytecode import Chunk, OpCode, OPERATORS
+from losos.environment import Environment
+from losos.runtimeerror import LososRuntimeError
+from losos.token import Token
+from losos.tokentype import TokenType
+
+# Plain ints are faster to compare than `OpCode` members.
+_CONSTANT: Final[int] = OpCode.CONSTANT.value
+_CONSTANT_LONG: Final[int] = OpCode.CONSTANT_LONG.value
+_NIL: Final[int] = OpCode.NIL.value
+_TRUE: Final[int] = OpCode.TRUE.value
+_FALSE: Final[int] = OpCode.FALSE.value
+_EQUAL: Final[int] = OpCode.EQUAL.value
+_NOT_EQUAL: Final[int] = OpCode.NOT_EQUAL.value
+_GREATER: Final[int] = OpCode.GREATER.value
+_GREATER_EQUAL: Final[int] = OpCode.GREATER_EQUAL.value
+_LESS: Final[int] = OpCode.LESS.value
+_LESS_EQUAL: Final[int] = OpCode.LESS_EQUAL.value
+_ADD: Final[int] = OpCode.ADD.value
+_SUBTRACT: Final[int] = OpCode.SUBTRACT.value
+_MULTIPLY: Final[int] = OpCode.MULTIPLY.value
+_DIVIDE: Final[int] = OpCode.DIVIDE.value
+_NOT: Final[int] = OpCode.NOT.value
+_NEGATE: Final[int] = OpCode.NEGATE.value
+_RETURN: Final[int] = OpCode.RETURN.value
+_GET_VARIABLE: Final[int] = OpCode.GET_VARIABLE.value
+
+
+class VM:
+    """Stack based virtual machine running `Chunk`s.
+
+    Semantics are the same as `Interpreter`'s. Runtime errors are raised
+    as `LososRuntimeError` with line taken from chunk's line table.
+    """
+
+    def __init__(self, *, environment: Environment | None = None) -> None:
+        self._environment: Final[Environment] = (
+            Environment() if environment is None else environment
+        )
+
+    def run(self, chunk: Chunk) -> Any:
+        code = chunk.code
+        constants: list[Any] = chunk.constants
+        variables: dict[str, Any] = self._environment.values
+        stack: list[Any] = []
+        push = stack.append
+        pop = stack.pop
+        ip: int = 0
+
+        while True:
+            op: int = code[ip]
+            ip += 1
+
+            if op == _CONSTANT:
+                push(constants[code[ip]])
+                ip += 1
+
+            elif op <= _LESS_EQUAL and op >= _EQUAL:
+                b: Any = pop()
+                a: Any = stack[-1]
+                if op == _EQUAL:
+                    stack[-1] = (b is None) if a is None else bool(a == b)
+                elif op == _NOT_EQUAL:
+                    stack[-1] = (b is not None) if a is None else not bool(a == b)
+                elif type(a) is not float or type(b) is not float:
+                    raise self._error(chunk, ip - 1, "Operands must be numbers.")
+                elif op == _GREATER:
+                    stack[-1] = a > b
+                elif op == _GREATER_EQUAL:
+                    stack[-1] = a >= b
+                elif op == _LESS:
+                    stack[-1] = a < b
+                else:
+                    stack[-1] = a <= b
+
+            elif op == _ADD:
+                b = pop()
+                a = stack[-1]
+                if type(a) is float and type(b) is float:
+                    stack[-1] = a + b
+                elif type(a) is str and type(b) is str:
+                    stack[-1] = a + b
+                else:
+                    raise self._error(
+                        chunk, ip - 1, "Operands must be two numbers or two strings."
+                    )
+
+            elif op <= _DIVIDE and op >= _SUBTRACT:
+                b = pop()
+                a = stack[-1]
+                if type(a) is not float or type(b) is not float:
+                    raise self._error(chunk, ip - 1, "Operands must be numbers.")
+                if op == _SUBTRACT:
+                    stack[-1] = a - b
+                elif op == _MULTIPLY:
+                    stack[-1] = a * b
+                elif b == 0.0:
+                    # Same as `Interpreter._check_divisor`.
+                    raise self._error(chunk, ip - 1, "Division by zero.")
+                else:
+                    stack[-1] = a / b
+
+            elif op == _NEGATE:
+                a = stack[-1]
+                if type(a) is not float:
+                    raise self._error(chunk, ip - 1, "Operand must be a number.")
+                stack[-1] = -a
+
+            elif op == _GET_VARIABLE:
+                name: str = constants[int.from_bytes(code[ip : ip + 3], "little")]
+                if name not in variables:
+                    raise LososRuntimeError(
+                        Token(TokenType.IDENTIFIER, name, None, chunk.line(ip - 1)),
+                        "Undefined variable '" + name + "'.",
+                    )
+                push(variables[name])
+                ip += 3
+
+            elif op == _NOT:
+                a = stack[-1]
+                stack[-1] = (a is None) or (a is False)
+
+            elif op == _NIL:
+                push(None)
+
+            elif op == _TRUE:
+                push(True)
+
+            elif op == _FALSE:
+                push(False)
+
+            elif op == _CONSTANT_LONG:
+                push(constants[int.from_bytes(code[ip : ip + 3], "little")])
+                ip += 3
+
+            else:  # _RETURN
+                return pop()
+
+    def _error(self, chunk: Chunk, offset: int, message: str) -> LososRuntimeError:
+        type, lexeme = OPERATORS[OpCode(chunk.code[offset])]
+        return LososRuntimeError(Token(type, lexeme, None, chunk.line(offset)), message)